@@ -16,6 +16,8 @@ more deviant than the actually described model (see modelBrode1987Airburst.py).
 
 """
 
+import numpy as np
+
 
 def PPEAK(X, Y, CAPR, Z, DELTPS=None):
     # THIS IS A FORTRAN IMPLEMENTATION OF THE ANALYTIC EXPRESSION FOR
@@ -91,31 +93,29 @@ def PPEAK(X, Y, CAPR, Z, DELTPS=None):
     return DELTPS
 
 
-def PT(Y, X, SIGMA, DELTAP=None):
-    # THIS IS A FORTRAN IMPLEMENTATION OF THE ANALYTIC EXPRESSION FOR
-    # PRESSURE TIME HISTORY (BRODE AND SPEICHER, MAY 1986)
-    # THE PARAMETERS ARE:
-    # X      = SCALED GROUND RANGE   (FT/KT**(1/3))
-    # Y      = SCALED HOB            (FT/KT**(1/3))
-    # SIGMA  = SCALED TIME           (MSEC/KT**(1/3))
-    #        ** NOTE THAT SIGMA IS THE TIME AFTER BURST IN THE           **
-    #        ** ANALYTIC EXPRESSION. FOR PURPOSE OF CALCULATION          **
-    #        ** SIGMA IN THIS ROUTINE IS TIME AFTER TIME OF ARRIVAL,     **
-    #        ** WHICH IS THEN ADDED TO THE CALCULATED TIME OF ARRIVAL    **
-    # DELTAP = PRESSURE              (PSI)
+def PTSETUP(Y, X):
+    # TIME-INDEPENDENT PART OF PT BELOW, HOISTED OUT OF THE LISTING SO THAT
+    # THE PRESSURE HISTORY OF A GAUGE CAN BE EVALUATED AT MANY TIMES.
+    # THE LISTING IS FOLLOWED AS CLOSELY AS ARRAYS ALLOW: MAX/MIN ARE
+    # NP.MAXIMUM/NP.MINIMUM, AND THE BRANCHES ARE NP.WHERE.
     #
-    # IF PRESSURE IS DESIRED IN KPA THEN MULTIPLY RESULT BY 100/14.504
+    # X, Y ARE ARRAYS (OR SCALARS) OF THE SAME SHAPE, SEE PT.
+    # RETURNS THE FUNCTION PTSIGMA(SIGMA), WHERE SIGMA IS BROADCAST AGAINST
+    # X AND Y, AND IS THE TIME AFTER TIME OF ARRIVAL (MSEC/KT**(1/3)), AND
+    # THE SCALED TIME OF ARRIVAL TAU ITSELF (MSEC/KT**(1/3)).
     #
-    # NOTE THAT LIMITS ARE PLACED O VALUES SUCH AS X, Y, Z ETC...
-    # THIS IS DONE TO AVOID OVERFLOWS AND THE VALUES ARE MACHINE DEPENDENT.
+    # WHERE XE = XM (AK) OR X = XM (AJ) THE LISTING DIVIDES BY ZERO: THE
+    # RESULTING INF IS CLAMPED BY THE MIN() THAT FOLLOWS, AS ON THE MACHINE.
 
-    X = max(X, 1e-9)
-    Y = max(Y, 1e-9)
+    X, Y = np.broadcast_arrays(
+        np.maximum(np.asarray(X, dtype=float), 1e-9),
+        np.maximum(np.asarray(Y, dtype=float), 1e-9),
+    )
     CAPR = (X * X + Y * Y) ** 0.5
     R = CAPR / 1000
     Z = Y / X
 
-    Z = min(Z, 100)
+    Z = np.minimum(Z, 100)
 
     DELTPS = PPEAK(X, Y, CAPR, Z)
     XM = 170 * Y / (1.0 + 60.0 * (Y**0.25)) + 2.89 * ((Y / 100) ** 2.5)
@@ -130,24 +130,18 @@ def PT(Y, X, SIGMA, DELTAP=None):
             + (1.028 + 2.087 * R + 2.69 * (R**2)) * (R**8)
         )
     )
-
-    if X < XM:
-        TAU = U
-    else:
-        W = (
-            (1.086 - 34.605 * R + 486.3 * (R**2) + 2383 * (R**3))
-            * (R**8)
-            / (
-                3.0137e-13
-                - 1.2128e-9 * (R**2)
-                + 4.128e-6 * (R**4)
-                - 1.116e-5 * (R**6)
-                + (1.632 + 2.629 * R + 2.69 * (R**2)) * (R**8)
-            )
+    W = (
+        (1.086 - 34.605 * R + 486.3 * (R**2) + 2383 * (R**3))
+        * (R**8)
+        / (
+            3.0137e-13
+            - 1.2128e-9 * (R**2)
+            + 4.128e-6 * (R**4)
+            - 1.116e-5 * (R**6)
+            + (1.632 + 2.629 * R + 2.69 * (R**2)) * (R**8)
         )
-        TAU = U * XM / X + W * (1 - XM / X)
-
-    SIGMA = SIGMA + TAU
+    )
+    TAU = np.where(X < XM, U, U * XM / X + W * (1 - XM / X))
 
     S2 = (
         1
@@ -214,54 +208,97 @@ def PT(Y, X, SIGMA, DELTAP=None):
         * S
         - 0.1966 * (TAU**1.22) / (1 + 0.767 * (TAU**1.22))
     )
-    B = (F * ((TAU / SIGMA) ** G) + (1 - F) * ((TAU / SIGMA) ** H)) * (
-        1 - (SIGMA - TAU) / CAPD
-    )
-    if X < XM or Y > 380:
-        DELTAP = DELTPS * B
-    else:
-        XE = 3.039 * Y / (1 + 0.0067 * Y)
+
+    REGULAR = (X < XM) | (Y > 380)
+
+    XE = 3.039 * Y / (1 + 0.0067 * Y)
+    with np.errstate(divide="ignore", invalid="ignore"):
         AK = abs((X - XM) / (XE - XM))
-        AK = min(AK, 50)
-        D2 = 2.99 + 31240 * ((Y / 100) ** 9.86) / (1 + 15530 * ((Y / 100) ** 9.87))
-        D = (
-            0.23
-            + 0.583 * Y * Y / (26667 + Y * Y)
-            + 0.27 * AK
-            + (0.5 - 0.583 * Y * Y / (26667 + Y * Y)) * (AK**D2)
+    AK = np.minimum(AK, 50)
+    D2 = 2.99 + 31240 * ((Y / 100) ** 9.86) / (1 + 15530 * ((Y / 100) ** 9.87))
+    D = (
+        0.23
+        + 0.583 * Y * Y / (26667 + Y * Y)
+        + 0.27 * AK
+        + (0.5 - 0.583 * Y * Y / (26667 + Y * Y)) * (AK**D2)
+    )
+    A = (D - 1) * (1 - (AK**20) / (1 + AK**20))
+    # X - XM IS ONLY POSITIVE IN THE MACH REGION, WHERE AJ IS USED
+    XMM = np.where(REGULAR, 1, X - XM) ** 1.25
+    V1 = (
+        0.003744 * ((Y / 10) ** 5.185) / (1 + 0.004684 * ((Y / 10) ** 4.189))
+        + 0.004755 * ((Y / 10) ** 8.049) / (1 + 0.003444 * ((Y / 10) ** 7.497))
+        - 0.04852 * ((Y / 10) ** 3.423) / (1 + 0.03038 * ((Y / 10) ** 2.538))
+    )
+    V2 = 1 / (1 + 9.23 * (AK**2))
+
+    C3 = 1 + (
+        1.094
+        * (AK**0.738)
+        / (1 + 3.687 * (AK**2.63))
+        * (
+            1
+            - 83.01 * ((Y / 100) ** 6.5) / (1 + 172.3 * ((Y / 100) ** 6.04))
+            - 0.15
+        )
+    ) * (1 / (1 + 0.5089 * (AK**13)))
+    C2 = 23000 * ((Y / 100) ** 9) / (1 + 23000 * ((Y / 100) ** 9))
+    TEMP = (X / 100) ** 4
+    C1 = 1.04 - 0.02409 * TEMP / (1 + 0.02317 * TEMP)
+    C4 = (C2 + (1 - C2) * (1 - 0.09 * (AK**2.5) / (1 + 0.09 * (AK**2.5)))) * C3
+
+    def PTSIGMA(SIGMA):
+        SIGMA = SIGMA + TAU
+
+        B = (F * ((TAU / SIGMA) ** G) + (1 - F) * ((TAU / SIGMA) ** H)) * (
+            1 - (SIGMA - TAU) / CAPD
         )
-        A = (D - 1) * (1 - (AK**20) / (1 + AK**20))
-        AJ = 11860 * (SIGMA - TAU) / (Y * ((X - XM) ** 1.25))
-        AJ = min(AJ, 200)
-        V = 1 + (
-            0.003744 * ((Y / 10) ** 5.185) / (1 + 0.004684 * ((Y / 10) ** 4.189))
-            + 0.004755 * ((Y / 10) ** 8.049) / (1 + 0.003444 * ((Y / 10) ** 7.497))
-            - 0.04852 * ((Y / 10) ** 3.423) / (1 + 0.03038 * ((Y / 10) ** 2.538))
-        ) * (AJ**3) / (6.13 + (AJ**3)) * (1 / (1 + 9.23 * (AK**2)))
-
-        C3 = 1 + (
-            1.094
-            * (AK**0.738)
-            / (1 + 3.687 * (AK**2.63))
-            * (
-                1
-                - 83.01 * ((Y / 100) ** 6.5) / (1 + 172.3 * ((Y / 100) ** 6.04))
-                - 0.15
-            )
-        ) * (1 / (1 + 0.5089 * (AK**13)))
-        C2 = 23000 * ((Y / 100) ** 9) / (1 + 23000 * ((Y / 100) ** 9))
-        TEMP = (X / 100) ** 4
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            AJ = 11860 * (SIGMA - TAU) / (Y * XMM)
+        AJ = np.minimum(AJ, 200)
+        V = 1 + V1 * (AJ**3) / (6.13 + (AJ**3)) * V2
+
         C = (
-            (1.04 - 0.02409 * TEMP / (1 + 0.02317 * TEMP))
+            C1
             * (AJ**7)
             / ((1 + A) * (1 + 0.923 * (AJ**8.5)))
-            * (C2 + (1 - C2) * (1 - 0.09 * (AK**2.5) / (1 + 0.09 * (AK**2.5))))
-            * C3
+            * C4
             * (1 - (((SIGMA - TAU) / CAPD) ** 8))
         )
 
-        DELTAP = DELTPS * (1 + A) * (B * V + C)
-    return DELTAP
+        DELTAP = np.where(REGULAR, DELTPS * B, DELTPS * (1 + A) * (B * V + C))
+        return DELTAP[()]
+
+    return PTSIGMA, TAU[()]
+
+
+def PT(Y, X, SIGMA, DELTAP=None):
+    # THIS IS A FORTRAN IMPLEMENTATION OF THE ANALYTIC EXPRESSION FOR
+    # PRESSURE TIME HISTORY (BRODE AND SPEICHER, MAY 1986)
+    # THE PARAMETERS ARE:
+    # X      = SCALED GROUND RANGE   (FT/KT**(1/3))
+    # Y      = SCALED HOB            (FT/KT**(1/3))
+    # SIGMA  = SCALED TIME           (MSEC/KT**(1/3))
+    #        ** NOTE THAT SIGMA IS THE TIME AFTER BURST IN THE           **
+    #        ** ANALYTIC EXPRESSION. FOR PURPOSE OF CALCULATION          **
+    #        ** SIGMA IN THIS ROUTINE IS TIME AFTER TIME OF ARRIVAL,     **
+    #        ** WHICH IS THEN ADDED TO THE CALCULATED TIME OF ARRIVAL    **
+    # DELTAP = PRESSURE              (PSI)
+    #
+    # IF PRESSURE IS DESIRED IN KPA THEN MULTIPLY RESULT BY 100/14.504
+    #
+    # NOTE THAT LIMITS ARE PLACED O VALUES SUCH AS X, Y, Z ETC...
+    # THIS IS DONE TO AVOID OVERFLOWS AND THE VALUES ARE MACHINE DEPENDENT.
+    #
+    # X, Y AND SIGMA MAY BE ARRAYS: EITHER X, Y SCALARS (ONE GAUGE) AND AN
+    # ARRAY OF SIGMA FOR ITS WAVEFORM, OR A BATCH OF (X, Y, SIGMA) OF THE
+    # SAME SHAPE, OR ANYTHING BROADCASTABLE, E.G. X[:, None], Y[:, None] AND
+    # SIGMA[None, :] FOR THE WAVEFORMS OF A SET OF GAUGES. THE TIME
+    # INDEPENDENT TERMS ARE COMPUTED ONCE PER GAUGE, SEE PTSETUP.
+
+    PTSIGMA, _ = PTSETUP(Y, X)
+    return PTSIGMA(SIGMA)
 
 
 if __name__ == "__main__":
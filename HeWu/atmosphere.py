@@ -0,0 +1,75 @@
+"""
+Zhai Jinpeng, 翟锦鹏, 2023
+Contact: 914962409@qq.com
+
+standard atmosphere for altitude scaling of the blast models, all of which are
+fitted to sea level conditions. The piecewise fit is the one used in BLAST.EXE
+from Horizons Technology for the Defense Nuclear Agency dating to 1984, see
+modelBLAST1984.py, and is good to 32km.
+
+Sachs scaling then applies the following factors to the sea level results:
+
+    SP: pressure scaling factor, P / P_0
+    SD: distance scaling factor, (P_0 / P)^(1/3), applied on top of W^(1/3)
+    ST: time scaling factor, SD / (T / T_0)^(1/2), i.e. SD / (c / c_0)
+
+i.e. for a burst at altitude, a sea level model is evaluated at the
+ranges and burst heights divided by SD, after which pressures are multiplied by
+SP, times by ST, impulses by SP x ST and lengths by SD.
+"""
+
+import numpy as np
+
+
+def atmosphere(ALT):
+    """
+    temperature and pressure at altitude, as ratios to sea level
+
+    ALT: array of altitude, m
+
+    returns:
+    T: temperature ratio, T / T_0
+    P: pressure ratio, P / P_0
+    """
+    ALT = np.asarray(ALT, dtype=float)
+
+    troposphere = ALT < 11000
+    stratosphere = ALT <= 20000  # lower, isothermal in the standard atmosphere
+
+    # clamped, so that the troposphere is not evaluated at negative temperatures
+    Tt = 1 - np.minimum(ALT, 11000) / 2e9**0.5
+
+    T = np.select(
+        (troposphere, stratosphere),
+        (Tt, 0.7537 * (1 + 2.09e-7 * ALT)),
+        0.684 * (1 + 5.16e-6 * ALT),
+    )
+    P = np.select(
+        (troposphere, stratosphere),
+        (Tt**5.3, 1.6**0.5 * (1 + 2.09e-7 * ALT) ** (-754)),
+        1.4762 * (1 + 5.16e-6 * ALT) ** (-33.6),
+    )
+
+    return T, P
+
+
+def sachs(ALT):
+    """
+    Sachs scaling factors at altitude, see above.
+
+    ALT: array of altitude, m
+
+    returns: SP, SD, ST
+    """
+    T, P = atmosphere(ALT)
+
+    SP = P
+    SD = SP ** (-1 / 3)
+    ST = SD / T**0.5
+
+    return SP, SD, ST
+
+
+if __name__ == "__main__":
+    ALT = np.array((0, 5000, 11000, 15000, 20000, 25000, 32000))
+    print(ALT, *atmosphere(ALT), *sachs(ALT), sep="\n")
@@ -0,0 +1,234 @@
+"""
+Zhai Jinpeng, 翟锦鹏, 2023
+Contact: 914962409@qq.com
+
+cross-model comparison of the airburst blast models, for peak overpressure
+and time of arrival:
+
+    Brode1987: modelBrode1987Airburst, the reference
+    FORTRAN  : the Appendix B listing of the same report, see FORTRAN.py
+    BLAST1984: modelBLAST1984
+    AWG1980  : modelAWG1980
+    Brode1970: modelBrode1970
+
+All models are evaluated on a shared grid of scaled ground range X and scaled
+burst height Y, in ft/kT^(1/3), at each of a shared list of yields, using the
+batch evaluators. For each model, the throughput (points per second) is
+measured over the fastest of a few runs, and the relative deviation from the reference is reported both in
+full and as the maximum and median of its magnitude over regions of the grid.
+The latter only count the points within the validity domain of the model
+output, see validity.py, and the number of points counted is reported
+alongside.
+
+Regions are the regular and Mach reflection regions (on either side of Xm
+of the reference model), each subdivided into bands of reference peak
+overpressure, see _bands.
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from HeWu.uc import _uc_ft2m, _uc_psi2pa
+from HeWu.validity import mask, domains
+from HeWu.FORTRAN import PTSETUP
+from HeWu.modelBrode1987Airburst import _Xm
+from HeWu.modelBrode1987Airburst import airburstBatch as _airburstBrode1987
+from HeWu.modelBLAST1984 import airburstBatch as _airburstBLAST1984
+from HeWu.modelAWG1980 import airburstBatch as _airburstAWG1980
+from HeWu.modelBrode1970 import airburstBatch as _airburstBrode1970
+
+"""bands of reference peak overpressure, in psi"""
+_bands = (0, 10, 100, 1000, np.inf)
+
+
+def _Brode1987(GR, H, W):
+    TAAIR, PAAIR, _, _, _, _, _, _ = _airburstBrode1987(GR, H, W)
+    return PAAIR, TAAIR
+
+
+def _FORTRAN(GR, H, W):
+    """the listing only returns pressure, at time of arrival this is the peak"""
+    m = W ** (1 / 3)
+    X = GR / _uc_ft2m(1) / m
+    Y = H / _uc_ft2m(1) / m
+    PTSIGMA, TAU = PTSETUP(Y, X)
+    return _uc_psi2pa(PTSIGMA(0)), TAU * m / 1000
+
+
+def _BLAST1984(GR, H, W):
+    PAIR, _, TAAIR, _, _, _, _, _, _, _ = _airburstBLAST1984(GR, H, W)
+    return PAIR, TAAIR
+
+
+def _AWG1980(GR, H, W):
+    PAIR, _, TAAIR, _, _ = _airburstAWG1980(GR, H, W)
+    return PAIR, TAAIR
+
+
+def _Brode1970(GR, H, W):
+    PAIR, _, TAAIR, _ = _airburstBrode1970(GR, H, W)
+    return PAIR, TAAIR
+
+
+"""
+the models being compared. Each maps arrays of ground range (m), burst height
+(m) and yield (kT) to peak overpressure (Pa) and time of arrival (s), the
+latter being nan if the model does not provide it.
+"""
+models = {
+    "Brode1987": _Brode1987,
+    "FORTRAN": _FORTRAN,
+    "BLAST1984": _BLAST1984,
+    "AWG1980": _AWG1980,
+    "Brode1970": _Brode1970,
+}
+
+
+def _regions(X, Y, P_ref):
+    """
+    names and masks of the regions, see above.
+
+    X, Y: scaled ground range and burst height, ft/kT^(1/3)
+    P_ref: reference peak overpressure, Pa
+    """
+    mach = X >= _Xm(X, Y)
+    P_ref = P_ref / _uc_psi2pa(1)  # to psi
+
+    names, masks = [], []
+    for reflection, inRegion in (("regular", ~mach), ("Mach", mach)):
+        for lo, hi in zip(_bands[:-1], _bands[1:]):
+            names.append("{} {:g}-{:g} psi".format(reflection, lo, hi))
+            masks.append(inRegion & (P_ref >= lo) & (P_ref < hi))
+
+    return names, masks
+
+
+def _stats(dev, masks):
+    """max and median of |dev| over each region, ignoring nan, and the count"""
+    stats = np.full((len(masks), 2), np.nan)
+    counts = np.zeros(len(masks), dtype=int)
+    for i, inRegion in enumerate(masks):
+        d = abs(dev[inRegion])
+        d = d[np.isfinite(d)]
+        counts[i] = d.size
+        if d.size > 0:
+            stats[i] = d.max(), np.median(d)
+    return stats, counts
+
+
+def _valid(name, quantity, GR, H, W, P):
+    """validity mask of a model output, all True if it has no domain"""
+    if (name, quantity) not in domains:
+        return np.full(GR.shape, True)
+    return mask(name, quantity, GR=GR, H=H, W=W) & mask(name, quantity, P=P)
+
+
+def compare(X, Y, W, reference="Brode1987", path=None, repeat=3):
+    """
+    compare the models on a shared grid, see above.
+
+    input:
+        X: array of scaled ground range, ft/kT^(1/3)
+        Y: array of scaled burst height, ft/kT^(1/3)
+        W: array of yield, kT
+        reference: name of the model deviations are taken against
+        path: if supplied, the results are saved there using
+            numpy.savez_compressed, see below.
+        repeat: number of times each model is run, the fastest of which
+            gives the throughput, so that it does not count first call costs
+
+    returns a dict of arrays, with the grid being of shape (W, Y, X):
+        X, Y, W: the grid axes
+        regions: names of the regions
+        "<model>_P", "<model>_t": peak overpressure (Pa) and time of arrival (s)
+        "<model>_dP", "<model>_dt": relative deviation from the reference
+        "<model>_rate": throughput, in points per second
+        "<model>_stats": array of shape (regions, 4), holding max and median
+            |dP|, then max and median |dt|, over the valid points of each
+            region
+        "<model>_counts": array of shape (regions, 2), holding the number of
+            valid points the above are taken over, for dP and dt
+        "points": array of shape (regions,), holding the number of points in
+            each region
+    """
+    if reference not in models:
+        raise ValueError(
+            "unknown model {}, valid choices are {}".format(
+                reference, ", ".join(models.keys())
+            )
+        )
+
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    W = np.asarray(W, dtype=float)
+
+    Wg, Yg, Xg = np.meshgrid(W, Y, X, indexing="ij")
+
+    m = Wg ** (1 / 3)
+    GR = _uc_ft2m(Xg * m)
+    H = _uc_ft2m(Yg * m)
+
+    results = {"X": X, "Y": Y, "W": W}
+    for name, model in models.items():
+        elapsed = np.inf
+        for _ in range(repeat):
+            start = perf_counter()
+            P, t = model(GR, H, Wg)
+            elapsed = min(elapsed, perf_counter() - start)
+
+        results[name + "_P"] = P
+        results[name + "_t"] = t
+        results[name + "_rate"] = np.array(Xg.size / elapsed)
+
+    P_ref = results[reference + "_P"]
+    t_ref = results[reference + "_t"]
+
+    names, masks = _regions(Xg, Yg, P_ref)
+    results["regions"] = np.array(names)
+    results["points"] = np.array([np.sum(inRegion) for inRegion in masks])
+
+    for name in models:
+        P = results[name + "_P"]
+        dP = P / P_ref - 1
+        dt = results[name + "_t"] / t_ref - 1
+
+        results[name + "_dP"] = dP
+        results[name + "_dt"] = dt
+
+        validP = _valid(name, "P", GR, H, Wg, P)
+        validt = _valid(name, "t", GR, H, Wg, P)
+        sP, nP = _stats(dP, [inRegion & validP for inRegion in masks])
+        st, nt = _stats(dt, [inRegion & validt for inRegion in masks])
+        results[name + "_stats"] = np.hstack((sP, st))
+        results[name + "_counts"] = np.stack((nP, nt), axis=-1)
+
+    if path is not None:
+        np.savez_compressed(path, **results)
+
+    return results
+
+
+if __name__ == "__main__":
+    results = compare(
+        np.geomspace(10, 10000, 200),
+        np.linspace(0, 2000, 101),
+        (1, 10, 100, 1000, 10000),
+    )
+
+    for name in models:
+        print(
+            "{:<10}{:>12,.0f} points/s".format(name, float(results[name + "_rate"]))
+        )
+        for region, n, (dPmax, dPmed, dtmax, dtmed), (nP, nt) in zip(
+            results["regions"],
+            results["points"],
+            results[name + "_stats"],
+            results[name + "_counts"],
+        ):
+            print(
+                "  {:<24} dP {:>8.3g} max {:>8.3g} med {:>6}/{:<6}"
+                "  dt {:>8.3g} max {:>8.3g} med {:>6}/{:<6}".format(
+                    region, dPmax, dPmed, nP, n, dtmax, dtmed, nt, n
+                )
+            )
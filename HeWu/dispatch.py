@@ -0,0 +1,225 @@
+"""
+Zhai Jinpeng, 翟锦鹏, 2023
+Contact: 914962409@qq.com
+
+routes batches of blast queries to the cheapest model that is both valid at
+the point and meets the requested accuracy class.
+
+Quantities that can be queried are:
+
+    P : peak overpressure, Pa
+    t : time of arrival, s
+    Q : peak dynamic pressure, Pa
+    QH: peak horizontal dynamic pressure, Pa
+    IQ: horizontal dynamic pressure positive phase impulse, Pa-s
+
+Each quantity is only answered by the models giving that same quantity:
+Brode 1987 gives the horizontal component only, so that there is no
+reference for Q, while BLAST 1984 gives the peak dynamic pressure only.
+
+Accuracy classes, from strict to loose, are assigned to each model from the
+median deviation against Brode 1987 over the regions of compare.py:
+
+    reference  : Brode 1987 itself
+    engineering: within a few percent below 1000 psi, i.e. the FORTRAN
+                 listing and BLAST 1984
+    screening  : within a factor of 2, i.e. AWG 1980 and Brode 1970
+
+These are typical figures: individual points, especially close in to a
+surface burst and about the knee of the Mach stem, can deviate by more, e.g.
+up to 50 percent for the FORTRAN listing at 100-1000 psi.
+
+Models of a class only answer for peak overpressures below the limit of the
+class, see limits, points above being left to the stricter classes.
+
+A model is valid at a point if the point lies within the validity domain of
+the model output, see validity.py. The bounds on the inputs are checked
+before evaluation, and those on the peak overpressure after.
+The cost of each model is measured on first use, see measureCost().
+
+Points are then handed down the list of candidate models, from cheapest to
+most expensive, each model taking the points it is valid for, until none are
+left. Points for which no candidate model is valid are left as nan.
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from HeWu.uc import _uc_m2ft, _uc_ft2m, _uc_psi2pa
+from HeWu.validity import mask
+from HeWu.atmosphere import sachs
+from HeWu.FORTRAN import PT
+from HeWu.modelBrode1987Airburst import airburstBatch as _airburstBrode1987
+from HeWu.modelBLAST1984 import airburstBatch as _airburstBLAST1984
+from HeWu.modelAWG1980 import airburstBatch as _airburstAWG1980
+from HeWu.modelBrode1970 import airburstBatch as _airburstBrode1970
+
+accuracies = ("reference", "engineering", "screening")
+
+"""peak overpressure, psi, below which each accuracy class holds"""
+limits = {"reference": np.inf, "engineering": 1000, "screening": np.inf}
+
+quantities = ("P", "t", "Q", "QH", "IQ")
+
+
+def _Brode1987(GR, H, W, ALT):
+    TAAIR, PAAIR, _, _, QAAIR, _, IQEST, _ = _airburstBrode1987(GR, H, W, ALT)
+    return {"P": PAAIR, "t": TAAIR, "QH": QAAIR, "IQ": IQEST}
+
+
+def _FORTRAN(GR, H, W, ALT):
+    SP, SD, _ = sachs(ALT)
+    m = W ** (1 / 3)
+    X = _uc_m2ft(GR / SD) / m
+    Y = _uc_m2ft(H / SD) / m
+    return {"P": _uc_psi2pa(PT(Y, X, 0)) * SP}
+
+
+def _BLAST1984(GR, H, W, ALT):
+    PAIR, QAIR, TAAIR, _, _, _, _, _, _, _ = _airburstBLAST1984(GR, H, W, ALT)
+    return {"P": PAIR, "t": TAAIR, "Q": QAIR}
+
+
+def _AWG1980(GR, H, W, ALT):
+    PAIR, QAIR, TAAIR, _, QHAIR = _airburstAWG1980(GR, H, W, ALT)
+    return {"P": PAIR, "t": TAAIR, "Q": QAIR, "QH": QHAIR}
+
+
+def _Brode1970(GR, H, W, ALT):
+    PAIR, QAIR, TAAIR, QHAIR = _airburstBrode1970(GR, H, W, ALT)
+    return {"P": PAIR, "t": TAAIR, "Q": QAIR, "QH": QHAIR}
+
+
+"""
+per model: evaluator, accuracy class and the quantities it provides. The
+validity domains are looked up from validity.py.
+"""
+models = {
+    "Brode1987": (_Brode1987, "reference", ("P", "t", "QH", "IQ")),
+    "FORTRAN": (_FORTRAN, "engineering", ("P",)),
+    "BLAST1984": (_BLAST1984, "engineering", ("P", "t", "Q")),
+    "AWG1980": (_AWG1980, "screening", ("P", "t", "Q", "QH")),
+    "Brode1970": (_Brode1970, "screening", ("P", "t", "Q", "QH")),
+}
+
+names = tuple(models.keys())
+
+_cost = {}
+
+
+def measureCost(n=10000, repeat=3):
+    """
+    measures the cost of each model in seconds per point, over n points
+    spread over a scaled grid at 1 kT, as the fastest of repeat runs. The
+    result is cached for use by dispatch(), and returned as a dict.
+    """
+    X, Y = np.meshgrid(np.geomspace(10, 10000, n // 100), np.linspace(0, 2000, 100))
+    GR, H = _uc_ft2m(X), _uc_ft2m(Y)
+
+    for name, (evaluate, _, _) in models.items():
+        elapsed = np.inf
+        for _ in range(repeat):
+            start = perf_counter()
+            evaluate(GR, H, 1, 0)
+            elapsed = min(elapsed, perf_counter() - start)
+        _cost[name] = elapsed / GR.size
+
+    return dict(_cost)
+
+
+def dispatch(GR, H, W, quantity="P", accuracy="engineering", ALT=0, cost=None):
+    """
+    answers a batch of blast queries, see above.
+
+    input:
+        GR: array of ground range, meter
+        H : array of height of burst, meter
+        W : array of yield, kiloton
+        quantity: one of "P", "t", "Q", "QH" and "IQ"
+        accuracy: one of "reference", "engineering" and "screening"
+        ALT: array of burst altitude, meter, defaults to sea level
+        (or anything broadcastable into the same shape)
+        cost: dict of model name to cost per point, overriding the measured
+            cost, see measureCost().
+
+    returns:
+        value: the quantity queried, nan where no model is valid
+        used : index into names of the model that answered each point, -1
+            where no model is valid
+    """
+    if quantity not in quantities:
+        raise ValueError(
+            "unknown quantity {}, valid choices are {}".format(
+                quantity, ", ".join(quantities)
+            )
+        )
+    if accuracy not in accuracies:
+        raise ValueError(
+            "unknown accuracy class {}, valid choices are {}".format(
+                accuracy, ", ".join(accuracies)
+            )
+        )
+
+    if cost is None:
+        if not _cost:
+            measureCost()
+        cost = _cost
+
+    GR, H, W, ALT = np.broadcast_arrays(
+        np.asarray(GR, dtype=float),
+        np.asarray(H, dtype=float),
+        np.asarray(W, dtype=float),
+        np.asarray(ALT, dtype=float),
+    )
+
+    candidates = sorted(
+        (
+            name
+            for name, (_, acc, provides) in models.items()
+            if accuracies.index(acc) <= accuracies.index(accuracy)
+            and quantity in provides
+        ),
+        key=lambda name: cost[name],
+    )
+
+    value = np.full(GR.shape, np.nan)
+    used = np.full(GR.shape, -1, dtype=np.int8)
+    remaining = np.full(GR.shape, True)
+
+    for name in candidates:
+        evaluate, acc, _ = models[name]
+
+        take = remaining & mask(name, quantity, GR=GR, H=H, W=W, ALT=ALT)
+        if not np.any(take):
+            continue
+
+        out = evaluate(GR[take], H[take], W[take], ALT[take])
+
+        valid = (
+            mask(name, quantity, P=out["P"])
+            & (out["P"] < _uc_psi2pa(limits[acc]))
+            & np.isfinite(out[quantity])
+        )
+
+        take[take] = valid  # narrow down to the points actually answered
+        value[take] = out[quantity][valid]
+        used[take] = names.index(name)
+        remaining &= ~take
+
+        if not np.any(remaining):
+            break
+
+    return value, used
+
+
+if __name__ == "__main__":
+    print(measureCost())
+
+    GR = np.linspace(0, 5000, 11)
+    for accuracy in accuracies:
+        for quantity in quantities:
+            value, used = dispatch(GR, 500, 100, quantity, accuracy)
+            print(accuracy, quantity)
+            print(value)
+            print([names[i] if i >= 0 else None for i in used])
@@ -0,0 +1,232 @@
+"""
+Zhai Jinpeng, 翟锦鹏, 2023
+Contact: 914962409@qq.com
+
+fallout footprints on a map grid, per the WE.EXE fallout model
+(modelWE1984.fallout), which works in the downwind (DW) and crosswind (CW)
+frame of the burst.
+
+The map is given by the coordinates x (east) and y (north) of its cells, in
+meter, and the wind by the direction it blows toward, in degrees clockwise
+from north. Cells are taken into the frame of the burst by a rotation, using
+their range and bearing from ground zero, which are computed once per map.
+
+Upwind of ground zero, where the fit does not apply, no fallout is taken to
+be deposited, see route._localField.
+
+Features:
+
+    exceedance: probability of exceedance maps over an ensemble of winds
+    superpose : the summed one hour dose rate of many bursts
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from HeWu.modelWE1984 import falloutBurst, _doseDecay
+from HeWu.route import _localField
+
+
+def _polar(x, y):
+    """range and bearing (radian, clockwise from north) of the cells"""
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    return np.hypot(x, y), np.arctan2(x, y)
+
+
+def _envelope(burst, negligible):
+    """
+    downwind and crosswind range (m) beyond which the one hour dose rate of a
+    burst stays below negligible, found on a sample grid and rounded up to
+    the next sample. None if it is negligible everywhere.
+    """
+    d = np.concatenate(((0,), np.geomspace(1, 1e6, 241)))
+    DHP1, _, _, _, _, _ = burst(d, d, 1, 1, 1, grid=True)
+
+    above = DHP1 >= negligible
+    if not np.any(above):
+        return None
+
+    rows = np.flatnonzero(np.any(above, axis=1))
+    cols = np.flatnonzero(np.any(above, axis=0))
+    last = len(d) - 1
+
+    return d[min(rows[-1] + 1, last)], d[min(cols[-1] + 1, last)]
+
+
+def _toBurstFrame(r, theta, direction):
+    """DW and CW of cells at range r and bearing theta, for a wind direction"""
+    angle = theta - np.radians(direction)
+    return r * np.cos(angle), r * np.sin(angle)
+
+
+def exceedance(
+    Y, H, FF, x, y, W, SY, direction, weight, thresholds, TI=None, TEXP=None
+):
+    """
+    probability of exceedance maps of the fallout over an ensemble of winds,
+    e.g. from a wind rose.
+
+    input:
+        Y : yield, kT
+        H : height of burst, m
+        FF: fission fraction
+        x, y: arrays of the coordinates of the cells, east and north of ground
+            zero, meter
+        W : array of effective wind speed, knots
+        SY: array of crosswind shear
+        direction: array of direction the wind blows toward, degree
+        weight: array of weight of each wind sample
+        (of the same length, one entry per sample)
+        thresholds: array of thresholds
+        TI, TEXP: if supplied, the thresholds are on the dose of an exposure
+            from TI lasting TEXP hours, otherwise on the one hour dose rate.
+            Either both or neither are to be given.
+
+    returns:
+        P: probability that the threshold is met or exceeded, of shape
+            thresholds.shape + the shape of the cells
+
+    The cloud terms are built once per distinct (W, SY) and the rotation of
+    the grid once per distinct direction.
+    """
+    W, SY, direction, weight = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (W, SY, direction, weight))
+    )
+    thresholds = np.asarray(thresholds, dtype=float)
+
+    if W.ndim != 1:
+        raise ValueError("wind samples must be given as 1-d arrays")
+    if np.any(weight < 0) or not np.sum(weight) > 0:
+        raise ValueError("invalid weights")
+
+    if (TI is None) != (TEXP is None):
+        raise ValueError("invalid time")
+    if TI is None:
+        scale = 1
+    else:
+        if np.any(np.asarray(TI) <= 0) or np.any(np.asarray(TEXP) <= 0):
+            raise ValueError("invalid time")
+        scale = _doseDecay(TI, TEXP)
+
+    r, theta = _polar(x, y)
+
+    bursts = {}
+    P = np.zeros(thresholds.shape + r.shape)
+    axes = (...,) + (None,) * r.ndim
+
+    for d in np.unique(direction):
+        DW, CW = _toBurstFrame(r, theta, d)
+
+        for i in np.flatnonzero(direction == d):
+            key = (W[i], SY[i])
+            if key not in bursts:
+                bursts[key] = falloutBurst(Y, H, W[i], SY[i], FF)
+
+            DHP1, _ = _localField(bursts[key], DW, CW)
+            P += weight[i] * (DHP1 * scale >= thresholds[axes])
+
+    return P / np.sum(weight)
+
+
+def _contribution(x, y, X0, Y0, Y, H, W, SY, FF, direction, negligible):
+    """flat indices of the cells within the envelope of a burst, and its
+    one hour dose rate there"""
+    burst = falloutBurst(Y, H, W, SY, FF)
+
+    extent = _envelope(burst, negligible)
+    if extent is None:
+        return np.zeros(0, dtype=int), np.zeros(0)
+    DWmax, CWmax = extent
+
+    DW, CW = _toBurstFrame(*_polar(x - X0, y - Y0), direction)
+    inside = np.flatnonzero((DW >= 0) & (DW <= DWmax) & (abs(CW) <= CWmax))
+
+    DHP1, _ = _localField(burst, DW.flat[inside], CW.flat[inside])
+
+    return inside, DHP1
+
+
+def superpose(
+    x,
+    y,
+    X0,
+    Y0,
+    Y,
+    H,
+    W,
+    SY,
+    FF,
+    direction,
+    negligible=1e-3,
+    workers=None,
+    contributions=False,
+):
+    """
+    one hour dose rate of many bursts, each rotated into its own wind and
+    translated to its own ground zero, summed over a shared map grid.
+
+    input:
+        x, y: arrays of the coordinates of the cells, east and north, meter
+        X0, Y0: arrays of the coordinates of the ground zeros, meter
+        Y : array of yield, kT
+        H : array of height of burst, m
+        W : array of effective wind speed, knots
+        SY: array of crosswind shear
+        FF: array of fission fraction
+        direction: array of direction the wind blows toward, degree
+        (broadcastable into the same 1-d shape, one entry per burst)
+        negligible: one hour dose rate below which the contribution of a burst
+            is neglected. Cells beyond the range at which a burst falls below
+            this, see _envelope(), are not evaluated for that burst.
+        workers: number of threads the bursts are evaluated on, by default
+            that of concurrent.futures.ThreadPoolExecutor
+        contributions: whether to return the contribution of each burst
+
+    returns:
+        DHP1: summed one hour dose rate, of the shape of the cells
+        each: if contributions, the one hour dose rate of each burst, of shape
+            (bursts,) + the shape of the cells, else None
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    bursts = np.broadcast_arrays(
+        *(
+            np.atleast_1d(np.asarray(v, dtype=float))
+            for v in (X0, Y0, Y, H, W, SY, FF, direction)
+        )
+    )
+    if bursts[0].ndim != 1:
+        raise ValueError("bursts must be given as 1-d arrays")
+
+    DHP1 = np.zeros(x.shape)
+    each = np.zeros(bursts[0].shape + x.shape) if contributions else None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            lambda burst: _contribution(x, y, *burst, negligible), zip(*bursts)
+        )
+
+        for i, (inside, value) in enumerate(results):
+            DHP1.flat[inside] += value
+            if contributions:
+                each[i].flat[inside] = value
+
+    return DHP1, each
+
+
+if __name__ == "__main__":
+    x, y = np.meshgrid(np.linspace(-5e3, 5e3, 201), np.linspace(-5e3, 5e3, 201))
+
+    # wind rose of 8 directions, 2 speeds
+    direction = np.repeat(np.arange(0, 360, 45), 2)
+    W = np.tile((10, 20), 8)
+    weight = np.tile((0.6, 0.4), 8) * np.repeat((3, 1, 1, 1, 1, 1, 2, 2), 2)
+
+    P = exceedance(100, 0, 0.5, x, y, W, 0.3, direction, weight, (1, 10, 100))
+    for threshold, p in zip((1, 10, 100), P):
+        print(threshold, "rad/h:", p[100, 100:200:20])
+
+    DHP1, each = superpose(
+        x, y, (0, 2e3), (0, -1e3), (100, 10), 0, 15, 0.3, 0.5, 45, contributions=True
+    )
+    print(DHP1[100, 100:200:20], each[:, 100, 100:200:20], sep="\n")
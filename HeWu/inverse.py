@@ -0,0 +1,310 @@
+"""
+Zhai Jinpeng, 翟锦鹏, 2023
+Contact: 914962409@qq.com
+
+inverse problems on the models, i.e. finding the yield, range or time that
+produces a given effect, solved for whole arrays of targets at once.
+
+Yield-for-effect: the minimum yield that puts a given effect on a target at
+(GR, H) is searched for within the validity range common to the models,
+0.1 kT to 25 MT. Where even the maximum yield falls short, nan is returned
+and the target is reported as not solvable. Where the minimum yield already
+suffices, the minimum yield of 0.1 kT is returned.
+
+Front position: the ground range reached by the shock front at a given time
+after burst, i.e. the inverse of the time of arrival along the surface.
+
+Bisection only ever locates *a* crossing: for the (rare) target where the
+effect is not monotonic in yield, the crossing found is not guaranteed to be
+the lowest one.
+"""
+from math import log
+
+import numpy as np
+
+from HeWu.uc import _uc_m2ft, _uc_ft2m, _uc_m2kft, _uc_pa2psi
+from HeWu.root import bisect
+from HeWu.modelBrode1987Airburst import _DeltaP_s as _DeltaP_s_Brode1987
+from HeWu.modelBrode1987Airburst import _Xm, _tau_batch
+from HeWu.modelBrode1987Freeair import _ci_tau_to_r
+from HeWu.modelAWG1980 import _t_a_batch as _t_a_AWG1980
+from HeWu.modelBrode1970 import _t_a_batch as _t_a_Brode1970
+from HeWu.modelBrode1970 import minimum as _minimum_Brode1970
+from HeWu.modelBLAST1984 import _taair_batch
+from HeWu.modelWE1984 import thermBatch, iniRadBurst
+
+"""validity range of yield in kiloton, shared by BLAST, WE and the Brode models"""
+Wmin = 0.1
+Wmax = 25000
+
+
+def _minYield(excess, shape):
+    """
+    lowest yield in [Wmin, Wmax] at which the effect is achieved.
+
+    excess: function of log-yield, returning an array of effect - target.
+        It is assumed to increase with yield, i.e. a non-negative value
+        means the effect is achieved.
+    shape: shape of the target array
+
+    returns:
+        W: yield in kiloton, nan where not solvable
+        solvable: boolean array
+    """
+    lo = np.full(shape, log(Wmin))
+    hi = np.full(shape, log(Wmax))
+
+    elo = excess(lo)
+    ehi = excess(hi)
+
+    solvable = ehi >= 0
+    W = np.where(elo >= 0, Wmin, np.nan)
+
+    search = solvable & (elo < 0)
+    if np.any(search):
+        W = np.where(search, np.exp(bisect(excess, lo, hi)), W)
+
+    return W, solvable
+
+
+def yieldForOverpressure(P, GR, H):
+    """
+    minimum yield that puts a peak overpressure P at the target, per the
+    airburst peak overpressure fit (Eqn. 62) of the Brode 1987 model.
+
+    By cube-root scaling, changing the yield only moves the scaled target
+    along the ray from the burst point through the target: for a yield W
+    the scaled target sits at a scaled slant range of λ = R / W^(1/3) in the
+    fixed direction of (GR, H). The problem thus reduces to finding λ on a
+    ray where the peak overpressure equals P, which is carried out in terms
+    of log-yield so that all models share the same search.
+
+    input:
+        P : peak overpressure, Pa
+        GR: ground range, meter
+        H : height of burst, meter
+        (arrays, or anything broadcastable into the same shape)
+
+    returns:
+        W: minimum yield in kiloton, nan where no yield within 0.1kT-25MT
+            suffices
+        solvable: boolean array, False where even 25MT falls short
+    """
+    P, GR, H = np.broadcast_arrays(P, GR, H)
+
+    # clamp to > 1e-12 kft, so that the direction of the ray below is defined
+    # at ground zero and for surface bursts
+    x = np.maximum(_uc_m2ft(np.asarray(GR, dtype=float)) / 1000, 1e-12)  # kft
+    y = np.maximum(_uc_m2ft(np.asarray(H, dtype=float)) / 1000, 1e-12)
+
+    R = (x**2 + y**2) ** 0.5
+    cx, cy = x / R, y / R  # direction of the ray
+
+    DeltaP = _uc_pa2psi(np.asarray(P, dtype=float))
+
+    def excess(s):
+        lam = R * np.exp(-s / 3)  # scaled slant range, kft/kT^(1/3)
+        return _DeltaP_s_Brode1987(lam * cx, lam * cy) - DeltaP
+
+    return _minYield(excess, P.shape)
+
+
+def yieldForFluence(Q, H, GR, VIS):
+    """
+    minimum yield that puts a thermal fluence Q at the target, per the
+    WE.EXE thermal model (modelWE1984.therm).
+
+    input:
+        Q  : thermal fluence, cal/cm^2
+        H  : height of burst, meter
+        GR : ground range, meter
+        VIS: visibility, meter
+        (arrays, or anything broadcastable into the same shape)
+
+    returns:
+        W: minimum yield in kiloton, nan where no yield within 0.1kT-25MT
+            suffices
+        solvable: boolean array, False where even 25MT falls short
+    """
+    Q, H, GR, VIS = np.broadcast_arrays(Q, H, GR, VIS)
+
+    def excess(s):
+        return thermBatch(np.exp(s), H, GR, VIS) - Q
+
+    return _minYield(excess, Q.shape)
+
+
+def yieldForDose(D, AIR, H, GR, FF, WT):
+    """
+    minimum yield that puts a total initial radiation dose D at the target,
+    per the WE.EXE initial radiation model (modelWE1984.iniRad).
+
+    input:
+        D  : total dose, rad
+        AIR: air density ratio to sea level
+        H  : height of burst, meter
+        GR : ground range, meter
+        FF : fission fraction
+        WT : weapon type, an integer 1-13
+        (arrays, or anything broadcastable into the same shape)
+
+    returns:
+        W: minimum yield in kiloton, nan where no yield within 0.1kT-25MT
+            suffices
+        solvable: boolean array, False where even 25MT falls short
+    """
+    D, AIR, H, GR, FF, WT = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (D, AIR, H, GR, FF)), np.asarray(WT)
+    )
+    if WT.dtype.kind not in "iu":
+        raise ValueError("invalid weapon type")  # before it is stacked as float
+
+    # targets are grouped by burst, each group evaluated over an array of yield
+    bursts = [
+        (air, h, ff, int(wt), (AIR == air) & (H == h) & (FF == ff) & (WT == wt))
+        for air, h, ff, wt in np.unique(
+            np.stack((AIR, H, FF, WT), axis=-1).reshape(-1, 4), axis=0
+        )
+    ]
+
+    def excess(s):
+        TD = np.empty(D.shape)
+        for air, h, ff, wt, at in bursts:
+            burst = iniRadBurst(np.exp(s[at]), air, h, ff, wt)
+            _, _, _, _, TD[at], _, _, _ = burst(GR[at])
+        return TD - D
+
+    return _minYield(excess, D.shape)
+
+
+def _arrivalBrode1987(GR, H, W):
+    """time of arrival in s, see modelBrode1987Airburst._tau"""
+    m = W ** (1 / 3)
+    # clamp the value to > 0.001 meter, same as in airburst()
+    X = np.maximum(_uc_m2ft(GR), 1e-9 * m) / m
+    Y = np.maximum(_uc_m2ft(H), 1e-9 * m) / m
+    return _tau_batch(X, Y, _Xm(X, Y)) * m / 1000
+
+
+def _arrivalAWG1980(GR, H, W):
+    """time of arrival in s, see modelAWG1980._t_a"""
+    return _t_a_AWG1980(_uc_m2kft(GR), _uc_m2kft(H), W) / 1000
+
+
+def _arrivalBrode1970(GR, H, W):
+    """time of arrival in s, see modelBrode1970._t_a"""
+    # clamp as in airburstBatch(), the fit is nan at the burst point
+    x = np.maximum(_uc_m2kft(GR), _minimum_Brode1970)
+    y = np.maximum(_uc_m2kft(H), _minimum_Brode1970)
+    return _t_a_Brode1970(x, y, W) / 1000
+
+
+def _arrivalBLAST1984(GR, H, W):
+    """time of arrival in s, see modelBLAST1984.airburst"""
+    Y3 = W ** (1 / 3)
+    taair, v = _taair_batch(GR / Y3, H / Y3)
+    return taair * Y3 * v
+
+
+_arrivals = {
+    "Brode1987": _arrivalBrode1987,
+    "AWG1980": _arrivalAWG1980,
+    "Brode1970": _arrivalBrode1970,
+    "BLAST1984": _arrivalBLAST1984,
+}
+
+
+def _freeairRadius(t, W):
+    """
+    free-air shock radius in meter at time t (s) after burst, by inverting
+    the close-in time of arrival fit, modelBrode1987Freeair._ci_tau_to_r
+    """
+    m = W ** (1 / 3)
+    tau = t * 1000 / m  # ms/kT^(1/3)
+
+    s = bisect(
+        lambda s: _ci_tau_to_r(np.exp(s)) - tau,
+        np.full(tau.shape, log(1e-6)),
+        np.full(tau.shape, log(1e3)),
+        tol=1e-9,
+    )  # solved in log-range, s = ln(r)
+
+    return _uc_ft2m(np.exp(s) * 1000 * m)
+
+
+def front_range(t, W, H, model="Brode1987"):
+    """
+    ground range of the shock front along the surface at times after burst,
+    found by inverting the time of arrival of the chosen model.
+
+    input:
+        t: array of times after burst, s
+        W: yield, kiloton
+        H: height of burst, meter
+        (arrays, or anything broadcastable into the same shape)
+        model: one of "Brode1987", "AWG1980", "Brode1970" and "BLAST1984"
+
+    returns:
+        GR: ground range of the front in meter, nan where the front has not yet
+            reached the ground
+        R: radius of the (free-air) front in meter, see front_height()
+
+    Time of arrival increases with ground range for all models, so the front
+    is bracketed between ground zero and a range that is doubled until the
+    front is known to have not yet arrived there, then bisected.
+    """
+    if model not in _arrivals:
+        raise ValueError(
+            "unknown model {}, valid choices are {}".format(
+                model, ", ".join(_arrivals.keys())
+            )
+        )
+    arrival = _arrivals[model]
+
+    t, W, H = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (t, W, H))
+    )
+    R = _freeairRadius(t, W)
+
+    lo = np.zeros(t.shape)
+    hi = np.maximum(np.nan_to_num(R), 1)
+    for _ in range(64):
+        early = arrival(hi, H, W) < t  # front already past hi
+        if not np.any(early):
+            break
+        hi = np.where(early, 2 * hi, hi)
+
+    GR = bisect(lambda gr: arrival(gr, H, W) - t, lo, hi)
+
+    return GR, R
+
+
+def front_height(x, R, H):
+    """
+    height profile of the incident front, taken to be a sphere of radius R
+    centered at the burst point, as in free air.
+
+    input:
+        x: horizontal distance from ground zero, meter
+        R: radius of the front, meter, from front_range()
+        H: height of burst, meter
+
+    returns:
+        upper: height of the upper half of the front, meter
+        lower: height of the lower half of the front, meter, clamped to the
+            ground where the incident front has already reflected
+        both are nan where x is beyond the front.
+    """
+    x, R = np.broadcast_arrays(x, R)
+    with np.errstate(invalid="ignore"):
+        h = (R**2 - x**2) ** 0.5  # nan beyond the front
+
+    return H + h, np.maximum(H - h, 0)
+
+
+if __name__ == "__main__":
+    print(*yieldForOverpressure((34474, 137895), 1000, 500), sep="\n")
+    print(*yieldForFluence((5, 10), 500, 1000, 20000), sep="\n")
+    print(*yieldForDose((100, 500), 0.975, 500, 1000, 0.5, 1), sep="\n")
+    for model in _arrivals:
+        print(model, *front_range((0.5, 1, 2, 5), 100, 500, model), sep="\n")
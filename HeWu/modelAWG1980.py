@@ -21,9 +21,12 @@ y  y=RM/x=RF
 
 """
 
+import numpy as np
+
 from HeWu.uc import _uc_m2kft, _uc_psi2pa
 
 from HeWu.intg import intg
+from HeWu.atmosphere import sachs
 
 """minimum value the scaled ground range and burst height are clamped to, 
 in order to simulate a "zero" in kft/kT^(1/3)"""
@@ -36,7 +39,7 @@ def _t_fa(r, W):
     W: yield, kilotons
     r: slant range, kft
     """
-    r = max(r, 2**0.5 * minimum)
+    r = np.maximum(r, 2**0.5 * minimum)
     m = W ** (1 / 3)
 
     return (
@@ -64,6 +67,23 @@ def _t_a(gr, hob, W):
         return _t_fa(r, W) * hob / gr + _t_fa(r, 2 * W) * (1 - hob / gr)
 
 
+def _t_a_batch(gr, hob, W):
+    """
+    array version of _t_a, see above.
+    gr: array of ground range, kilofeet
+    hob: array of height of burst, kilofeet
+    W: yield, kiloton
+    """
+
+    gr = np.maximum(gr, minimum)
+    hob = np.maximum(hob, minimum)
+
+    r = (gr**2 + hob**2) ** 0.5
+    k = np.minimum(hob / gr, 1)  # hob / gr in the Mach region, 1 otherwise
+
+    return _t_fa(r, W) * k + _t_fa(r, 2 * W) * (1 - k)
+
+
 def _inv_t_a(tgt, g1, g2, hob, W, vlim=1e-6):
     """
     Solve for gr in _t_a(gr,hob,W) = tgt using the secant method.
@@ -118,12 +138,14 @@ def _PK(y):
     return 11.049 / y**1.3069 + 6.0481 / y**3.4793
 
 
-def _PE(x):
+def _PE(x, RA=None):
     """
     pressure along the y = RA curve in psi
     x: scaled ground range in kft/kT**(1/3)
+    RA: _RA(x), if already known
     """
-    RA = _RA(x)
+    if RA is None:
+        RA = _RA(x)
     return (
         1.7934 / x**3.4227
         + 441830 * x**8.7266 / (1 + 28242 * x**9.661)
@@ -132,11 +154,14 @@ def _PE(x):
     )
 
 
-def _PJ(y):
+def _PJ(y, RF=None):
     """
     pressure along the y = RM or x = RF line:
+    RF: _RF(y), if already known
     """
-    RI = (_RF(y) + y**2) ** 0.5
+    if RF is None:
+        RF = _RF(y)
+    RI = (RF + y**2) ** 0.5
     return 14.35 / RI**1.45 + 0.056 + 4 / RI**3.71 - 0.171 / RI**4.716
 
 
@@ -171,6 +196,48 @@ def _RF(y):
     )
 
 
+def _PL(x, y, RF):
+    """
+    pressure interpolated between the y-axis (PK) and the x = RF line (PJ), psi
+    x: scaled ground range in kft/kT**(1/3)
+    y: scaled burst height in kft/kT**(1/3)
+    RF: _RF(y)
+    """
+    FG = x / RF
+    FH = 0.09284 * FG**1.0286 + 7.696 * FG**2.513 / (1 + 7.4836 * FG**2.151)
+    return (1 - FH) * _PK(y) + FH * _PJ(y, RF)
+
+
+def _FC(y, RA):
+    """
+    weight of PE against PD, between the x-axis and the y = RA curve
+    y: scaled burst height in kft/kT**(1/3)
+    RA: _RA(x)
+    """
+    FB = y / RA
+    return FB * (0.433 + 1.011 * FB) / (1 + 0.444 * FB**5)
+
+
+def _P_II(x, y, RA, PL, FC, PE):
+    """
+    peak overpressure in region II, in psi
+    x: scaled ground range in kft/kT**(1/3)
+    y: scaled burst height in kft/kT**(1/3)
+    RA, PL, FC, PE: see above
+    """
+    RM = (
+        -0.09175 * x**-0.3896 / (1 + 31.31 * x**3.106)
+        + 0.003582
+        + 0.6907 * x**0.4597 / (1 - 0.2021 * x**0.4696)
+        + 0.005963 / x**1.106
+    )
+    FN = y * (y - RA) / (RM * (RM - RA))
+    FO = 0.7717 * FN**2.743 + 0.2283 * FN**0.7
+    FP = FO ** (1 + 0.00594 * (x**2 + y**2) ** (2.565 * 0.5))
+
+    return FO * PL + (1 - FP) * FC * PE
+
+
 def _DeltaP_s(x, y):
     """
     peak overpressure in psi
@@ -181,47 +248,56 @@ def _DeltaP_s(x, y):
     y = max(y, minimum)
 
     RF = _RF(y)
-    RA = _RA(x)
-    PD = _PD(x)
-    PK = _PK(y)
-    PE = _PE(x)
-    PJ = _PJ(y)
 
     if x < RF:  # region III
+        return _PL(x, y, RF)
 
-        FG = x / RF
-        FH = 0.09284 * FG**1.0286 + 7.696 * FG**2.513 / (1 + 7.4836 * FG**2.151)
-        PL = (1 - FH) * PK + FH * PJ
+    RA = _RA(x)
+    FC = _FC(y, RA)
+    PE = _PE(x, RA)
 
-        return PL
+    if y < RA:  # region I
+        return (1 - FC) * _PD(x) + FC * PE
+
+    else:  # region II
+        return _P_II(x, y, RA, _PL(x, y, RF), FC, PE)
 
-    elif y < RA:  # region I
 
-        FB = y / RA
-        FC = FB * (0.433 + 1.011 * FB) / (1 + 0.444 * FB**5)
+def _DeltaP_s_batch(x, y):
+    """
+    array version of _DeltaP_s, see above.
 
-        return (1 - FC) * PD + FC * PE
+    Points are first classified into the three regions, after which
+    each region only evaluates the terms it requires, on its own points.
 
-    else:  # region II
+    x: array of scaled ground range in kft/kT**(1/3)
+    y: array of scaled burst height in kft/kT**(1/3)
+    """
+    x, y = np.broadcast_arrays(np.maximum(x, minimum), np.maximum(y, minimum))
 
-        FB = y / RA
-        FC = FB * (0.433 + 1.011 * FB) / (1 + 0.444 * FB**5)
+    RF = _RF(y)
+    III = x < RF
 
-        FG = x / RF
-        FH = 0.09284 * FG**1.0286 + 7.696 * FG**2.513 / (1 + 7.4836 * FG**2.151)
-        PL = (1 - FH) * PK + FH * PJ
+    xo, yo = x[~III], y[~III]
+    RA = _RA(xo)
+    I = yo < RA
+    II = ~I
 
-        RM = (
-            -0.09175 * x**-0.3896 / (1 + 31.31 * x**3.106)
-            + 0.003582
-            + 0.6907 * x**0.4597 / (1 - 0.2021 * x**0.4696)
-            + 0.005963 / x**1.106
-        )
-        FN = y * (y - RA) / (RM * (RM - RA))
-        FO = 0.7717 * FN**2.743 + 0.2283 * FN**0.7
-        FP = FO ** (1 + 0.00594 * (x**2 + y**2) ** (2.565 * 0.5))
+    DeltaP_s = np.empty(x.shape)
+    DeltaP_s[III] = _PL(x[III], y[III], RF[III])
+
+    FC = _FC(yo, RA)
+    PE = _PE(xo, RA)
+
+    P = np.empty(xo.shape)
+    P[I] = (1 - FC[I]) * _PD(xo[I]) + FC[I] * PE[I]
 
-        return FO * PL + (1 - FP) * FC * PE
+    xi, yi, RFi = xo[II], yo[II], RF[~III][II]
+    P[II] = _P_II(xi, yi, RA[II], _PL(xi, yi, RFi), FC[II], PE[II])
+
+    DeltaP_s[~III] = P
+
+    return DeltaP_s
 
 
 def _Q_s(DeltaP_s, P_0=14.7):
@@ -256,6 +332,29 @@ def _Q_H(x, y, P_0=14.7):
         return _Q_s(_DeltaP_s(x, y), P_0)
 
 
+def _Q_H_batch(x, y, P_0=14.7, DeltaP_s=None):
+    """
+    array version of _Q_H, see above.
+    x: array of ground range, kft/kT**(1/3)
+    y: array of burst height, kft/kT**(1/3)
+    P_0: ambient pressure in psi
+    DeltaP_s: array of peak overpressure in psi, from _DeltaP_s_batch(x, y),
+        computed if not supplied.
+
+    returns:
+        Q_H: horizontal component of dynamic pressure in psi
+        DeltaP_s: peak overpressure in psi
+    """
+    x, y = np.broadcast_arrays(np.maximum(x, minimum), np.maximum(y, minimum))
+
+    if DeltaP_s is None:
+        DeltaP_s = _DeltaP_s_batch(x, y)
+
+    Q_H = _Q_s(DeltaP_s, P_0) * np.minimum(x / y, 1)
+
+    return Q_H, DeltaP_s
+
+
 def _D_up(gr, hob, W):
     """
     Dynamic pressure positive phase duration in msec
@@ -264,8 +363,8 @@ def _D_up(gr, hob, W):
     hob: burst height in kft
     W: yield in kt
     """
-    gr = max(gr, minimum)
-    hob = max(hob, minimum)
+    gr = np.maximum(gr, minimum)
+    hob = np.maximum(hob, minimum)
 
     r = (gr**2 + hob**2) ** 0.5
     m = (2 * W) ** (1 / 3)  # m'
@@ -374,5 +473,51 @@ def airburst(GR, HOB, W, prettyPrint=True):
     )
 
 
+def airburstBatch(GR, HOB, W, ALT=0):
+    """
+    array version of airburst, for screening large numbers of points. The
+    horizontal dynamic impulse, which requires quadrature for each point, is
+    left out: see airburst() for that. The outputs are laid out as in
+    airburst(), with the peak horizontal dynamic pressure appended in place
+    of the impulse.
+
+    Bursts above sea level are Sachs scaled per point, see atmosphere.py.
+
+    GR: array of ground range in meters
+    HOB: array of height of burst in meter
+    W: array of yield, kiloton
+    ALT: array of burst altitude in meter, defaults to sea level
+    (or anything broadcastable into the same shape)
+
+    returns:
+    peak overpressure, in pa
+    peak dyn. press. in pa
+    time of arrival in sec
+    dynm.press.pos.phase duration in sec
+    peak hz.dynm.press. in pa
+    """
+    GR, HOB, W, ALT = np.broadcast_arrays(
+        np.asarray(GR, dtype=float), np.asarray(HOB, dtype=float), W, ALT
+    )
+
+    SP, SD, ST = sachs(ALT)
+
+    gr = _uc_m2kft(GR / SD)  # of the equivalent burst at sea level
+    hob = _uc_m2kft(HOB / SD)
+
+    m = W ** (1 / 3)
+
+    Q_H, DeltaP_s = _Q_H_batch(gr / m, hob / m)
+
+    PAIR = _uc_psi2pa(DeltaP_s) * SP
+    QAIR = _uc_psi2pa(_Q_s(DeltaP_s)) * SP
+    QHAIR = _uc_psi2pa(Q_H) * SP
+
+    TAAIR = _t_a_batch(gr, hob, W) / 1000 * ST
+    DPQ = _D_up(gr, hob, W) / 1000 * ST
+
+    return PAIR, QAIR, TAAIR, DPQ, QHAIR
+
+
 if __name__ == "__main__":
     airburst(679, 999, 40)
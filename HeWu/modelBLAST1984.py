@@ -13,6 +13,10 @@ the 87 Brode model.
 
 from math import sqrt, log, exp, atan, pi, sin
 
+import numpy as np
+
+from HeWu.atmosphere import sachs
+
 
 def clamp(x, a, b):
 
@@ -26,14 +30,20 @@ def _dPdna(x):
     return (
         3.04e11 / x**3
         + 1.13e9 / x**2
-        + 7.9e6 / (x * sqrt(log(x / 445.42 + 3 * exp(-1 / 3 * sqrt(x / 445.42)))))
+        + 7.9e6
+        / (
+            x
+            * np.sqrt(
+                np.log(x / 445.42 + 3 * np.exp(-1 / 3 * np.sqrt(x / 445.42)))
+            )
+        )
     )
 
 
 def _n(x):
     xi = x / 101325 + 1
     t = 1e-12 * (xi) ** 6
-    z = log(xi) - 0.47 * t / (100 + t)
+    z = np.log(xi) - 0.47 * t / (100 + t)
     gs = 1.402 - 3.4e-4 * z**4 / (1 + 2.22e-5 * z**6)
 
     mus = (gs + 1) / (gs - 1)
@@ -41,10 +51,119 @@ def _n(x):
     return n, gs
 
 
+"""
+table of ln(n - 1) against ln(overpressure) spanning 0.01 Pa to 1 TPa, to
+replace direct evaluation of _n() at each node of the impulse quadrature.
+ln(n - 1) is very nearly linear in ln(overpressure) at low pressures where
+n -> 1 and n - 1 ~ 0.713 * overpressure / 101325, allowing linear
+interpolation to hold its accuracy there.
+"""
+_nLogP = np.linspace(log(1e-2), log(1e12), 14001)
+_nLogN = np.log(_n(np.exp(_nLogP))[0] - 1)
+
+
+def _n_interp(x):
+    """
+    array version of n, _n(x)[0], interpolated from the table above.
+    x: array of overpressure, Pa
+    """
+    return 1 + np.exp(np.interp(np.log(np.maximum(x, 1e-2)), _nLogP, _nLogN))
+
+
+def _midpoint(f, l, u, N=100, tol=None):
+    """
+    Integration using the mid-point rule, as done in BLAST.EXE.
+
+    f: function, mapping an array of nodes to an array of values.
+    l: lower limit
+    u: upper limit of integration
+    N: number of nodes, 100 in the original.
+    tol: tolerance, if None the N-node mid-point rule is returned as is, to
+        reproduce the original. Otherwise, see below
+
+    When a tolerance is specified, the number of nodes is tripled each pass,
+    so that all previous nodes remain the mid-points of the new subintervals
+    and the previous sum can be reused. As the error of the mid-point rule
+    goes with h^2, each pass is improved by Richardson extrapolation:
+
+    R(k) = (9 * I(k) - I(k-1)) / 8
+
+    and the iteration is stopped once two consecutive extrapolations are
+    within tolerance, as in intg:
+
+    abs(R(k) - R(k-1)) < tol * (abs(R(k)) + tol)
+    """
+    h = (u - l) / N
+    i = np.arange(N)
+    I = h * np.sum(f(l + h * (i + 0.5)))
+
+    if tol is None:
+        return I
+
+    R, R3 = None, I
+    while N < 1e6:
+        I3 = (I + h * np.sum(f(l + h * np.concatenate((i + 1 / 6, i + 5 / 6))))) / 3
+        R3 = (9 * I3 - I) / 8
+
+        if R is not None and abs(R3 - R) < tol * (abs(R3) + tol):
+            break
+
+        I, R = I3, R3
+        h /= 3
+        N *= 3
+        i = np.arange(N)
+
+    return R3
+
+
+def _ratio(t, taair, dp, f, g, h, mach=None):
+    """
+    ratio of overpressure to the peak overpressure at time t
+
+    t: array of time after burst, s/kT^(1/3)
+    taair: scaled time of arrival, s/kT^(1/3)
+    dp: scaled positive phase duration, s/kT^(1/3)
+    f, g, h: time-independent parameters, see airburst()
+    mach: None for single-peaked wave forms, otherwise the time-independent
+        parameters of the double-peaked wave form, (a, dt, vo, co)
+    """
+    b = (f * (taair / t) ** g + (1 - f) * (taair / t) ** h) * (1 - (t - taair) / dp)
+
+    if mach is None:
+        return b
+
+    a, dt, vo, co = mach
+
+    ga = np.clip((t - taair) / dt, 0.0001, 400)
+    v = 1 + vo * ga**3 / (ga**3 + 6.13)
+    c = co / (ga ** (-7) + 0.923 * ga**1.5) * (1 - ((t - taair) / dp) ** 8)
+
+    return (1 + a) * (b * v + c)
+
+
 def _ta(x):
     return x**2 * (6.7 + x) / (7.12e6 + 7.32e4 * x + 340.5 * x**2)
 
 
+def _taair_batch(SGR, SHOB):
+    """
+    scaled time of arrival for arrays of bursts, as in airburst()
+    SGR: scaled ground range, m/kT^(1/3)
+    SHOB: scaled burst height, m/kT^(1/3)
+
+    returns:
+    taair: scaled time of arrival at the Mach-adjusted range, s/kT^(1/3)
+    v: Mach stem speed-up factor, such that TAAIR = taair * Y3 * v
+    """
+    xm = SHOB**2.5 / 5822 + 2.09 * SHOB**0.75
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v = np.where(SGR <= xm, 1, 1.26 - 0.26 * (xm / SGR))
+
+    R = (SGR**2 + SHOB**2) ** 0.5 / v
+
+    return _ta(R), v
+
+
 def freeair(Y, ALT, RANGE):
 
     Y3 = Y ** (1 / 3)
@@ -53,21 +172,8 @@ def freeair(Y, ALT, RANGE):
         raise ValueError(
             "free air model is not applicable in case of a underground burst"
         )
-    if 0 <= ALT < 11000:
-        T = 1 - ALT / sqrt(2e9)
-        P = T**5.3
 
-    elif ALT <= 20000:
-        T = 0.7537 * (1 + 2.09e-7 * ALT)
-        P = sqrt(1.6) * (1 + 2.09e-7 * ALT) ** (-754)
-
-    else:
-        T = 0.684 * (1 + 5.16e-6)
-        P = 1.4762 * (1 + 5.16e-6) * (-33.6)
-
-    SP = P
-    SD = SP ** (-1 / 3)
-    ST = SD / sqrt(T)
+    SP, SD, ST = (float(v) for v in sachs(ALT))
     C = 340.5 * SD / ST
 
     R = RANGE / (SD * Y3)
@@ -100,7 +206,53 @@ def freeair(Y, ALT, RANGE):
     return PFREE, QFREE, TAFREE, withinLimit
 
 
-def airburst(GR, HOB, Y, prettyPrint=True):
+def freeairBatch(Y, ALT, RANGE):
+    """
+    array version of freeair, see above.
+
+    inputs:
+    Y: array of yield, kt
+    ALT: array of burst altitude, m
+    RANGE: array of range, m
+
+    return:
+    PFREE: peak overpressure, pa
+    QFREE: peak dynamic pressure, pa
+    TAFREE: time of arrival, s
+    withinLimit: boolean array, whether the above are within model limit
+    """
+    Y, ALT, RANGE = np.broadcast_arrays(Y, ALT, RANGE)
+
+    if np.any(ALT < 0):
+        raise ValueError(
+            "free air model is not applicable in case of a underground burst"
+        )
+
+    Y3 = Y ** (1 / 3)
+
+    SP, SD, ST = sachs(ALT)
+
+    R = RANGE / (SD * Y3)
+
+    dPfree = _dPdna(R)
+    n, _ = _n(dPfree)
+
+    PFREE = dPfree * SP
+    QFREE = 0.5 * dPfree * (n - 1) * SP
+    TAFREE = _ta(R) * ST * Y3
+
+    withinLimit = (
+        (ALT <= 32000)
+        & (Y >= 0.1)
+        & (Y <= 25000)
+        & (RANGE >= 16 * Y3 * SD)
+        & (RANGE <= 4000 * Y3 * SD)
+    )
+
+    return PFREE, QFREE, TAFREE, withinLimit
+
+
+def airburst(GR, HOB, Y, prettyPrint=True, N=100, tol=None):
     """
     Does airburst calculation ala the BLAST.EXE software, and pretty prints a
     fascimile out. No provision is given for time-dependent calculations as
@@ -110,6 +262,9 @@ def airburst(GR, HOB, Y, prettyPrint=True):
     GR: ground range, m
     HOB: burst height, m
     Y: yield, kt
+    N: number of nodes for the mid-point quadrature of impulses, 100 in BLAST.EXE
+    tol: if specified, the quadrature is refined beyond N nodes until the
+        specified relative tolerance is reached, see _midpoint()
 
     return:
     PAIR: peak overpressure, pa
@@ -133,8 +288,6 @@ def airburst(GR, HOB, Y, prettyPrint=True):
     if HOB < 0:
         raise ValueError("model is not applicable to underground bursts")
 
-    N = 100
-
     Y3 = Y ** (1 / 3)
 
     SGR = GR / Y3
@@ -268,7 +421,7 @@ def airburst(GR, HOB, Y, prettyPrint=True):
         singlePeak = True
 
     if singlePeak:
-        pass
+        mach = None
     else:
         xe = 138.3 / (1 + 45.5 / SHOB)
         e = clamp(abs((SGR - xm) / (xe - SGR)), 50, 0.02)
@@ -283,34 +436,15 @@ def airburst(GR, HOB, Y, prettyPrint=True):
         co = (1.04 - 1.04 / (1 + 3.725e7 / SGR**4)) / (
             (a + 1) * (1 + 9.872e8 / SHOB**9)
         )
+        mach = (a, dt, vo, co)
 
-    dp = dpDp
-
-    accumulator = 0
-
-    if singlePeak:
-        for i in range(N):
-            # simple newton-raphson quadrature using midpoint rule
-            t = taair + dp * (i + 0.5) / N
-            b = (f * (taair / t) ** g + (1 - f) * (taair / t) ** h) * (
-                1 - (t - taair) / dp
-            )
-
-            accumulator += b  # dpt
-    else:
-        for i in range(N):
-            t = taair + dp * (i + 0.5) / N
-            b = (f * (taair / t) ** g + (1 - f) * (taair / t) ** h) * (
-                1 - (t - taair) / dp
-            )
-            ga = clamp((t - taair) / dt, 400, 0.0001)
-
-            v = 1 + vo * ga**3 / (ga**3 + 6.13)
-            c = co / (ga ** (-7) + 0.923 * ga**1.5) * (1 - ((t - taair) / dp) ** 8)
-
-            accumulator += (1 + a) * (b * v + c)
-
-    IPTOTAL = Y3 * PAIR * accumulator * dp / N
+    IPTOTAL = (
+        Y3
+        * PAIR
+        * _midpoint(
+            lambda t: _ratio(t, taair, dpDp, f, g, h, mach), taair, taair + dpDp, N, tol
+        )
+    )
 
     SHOBo = SHOB / 0.3048
     SGRo = SGR / 0.3048
@@ -337,38 +471,11 @@ def airburst(GR, HOB, Y, prettyPrint=True):
     delta = 2.38 * exp(-7e-7 * abs(SHOBo - 750) ** 2.7 - 4e-7 * SGRo**2) + deltao
     qo = 0.5 * (1 - sigma * sin(alpha) ** 2)
 
-    dp = dpq
+    def qt(t):
+        dpt = _ratio(t, taair, dpq, f, g, h, mach) * PAIR
+        return 0.5 * dpt * (_n_interp(dpt) - 1) * (dpt / PAIR) ** delta
 
-    accumulator = 0
-
-    if singlePeak:
-        for i in range(N):
-            # simple newton-raphson quadrature using midpoint rule
-            t = taair + dp * (i + 0.5) / N
-            b = (f * (taair / t) ** g + (1 - f) * (taair / t) ** h) * (
-                1 - (t - taair) / dp
-            )
-            dpt = b * PAIR  # dpt
-            nq, _ = _n(dpt)
-            qt = 0.5 * dpt * (nq - 1) * (dpt / PAIR) ** delta
-            accumulator += qt
-
-    else:
-        for i in range(N):
-            t = taair + dp * (i + 0.5) / N
-            b = (f * (taair / t) ** g + (1 - f) * (taair / t) ** h) * (
-                1 - (t - taair) / dp
-            )
-            ga = clamp((t - taair) / dt, 400, 0.0001)
-            # ga = (t - taair) / dt
-            v = 1 + vo * ga**3 / (ga**3 + 6.13)
-            c = co / (ga ** (-7) + 0.923 * ga**1.5) * (1 - ((t - taair) / dp) ** 8)
-            dpt = (1 + a) * (b * v + c) * PAIR
-            nq, _ = _n(dpt)
-            qt = 0.5 * dpt * (nq - 1) * (dpt / PAIR) ** delta
-            accumulator += qt
-
-    IQTOTAL = Y3 * accumulator * dp / N
+    IQTOTAL = Y3 * _midpoint(qt, taair, taair + dpq, N, tol)
 
     """overpressure, dynamic pressure, time of arrival, overpressure impulse"""
     limit1 = True
@@ -490,5 +597,155 @@ def airburst(GR, HOB, Y, prettyPrint=True):
     )
 
 
+def airburstBatch(GR, HOB, Y, ALT=0):
+    """
+    array version of airburst, for screening large numbers of points. All of
+    the parameters in closed form are evaluated as array expressions, while
+    the impulses, which require quadrature over the wave form of each point,
+    are left out: see airburst() for those.
+
+    Bursts above sea level are Sachs scaled per point, see atmosphere.py.
+
+    inputs:
+    GR: array of ground range, m
+    HOB: array of burst height, m
+    Y: array of yield, kt
+    ALT: array of burst altitude, m, defaults to sea level
+    (or anything broadcastable into the same shape)
+
+    return:
+    PAIR: peak overpressure, pa
+    QAIR: peak dynamic pressure, pa
+    TAAIR: time of arrival, s
+    DPP: over pressure positive phase duration, s
+    limit1: boolean array, whether PAIR to DPP are within model limit
+    XM: mach stem formation range, m
+    HTP: height of triple point, m, nan where the triple point is undefined
+    limit2: boolean array, whether XM and HTP are within model limit
+    DPQ: dynamic pressure positive phase duration, s
+    limit3: boolean array, whether DPQ is within model limit
+    """
+    GR, HOB, Y, ALT = np.broadcast_arrays(
+        np.asarray(GR, dtype=float), np.asarray(HOB, dtype=float), Y, ALT
+    )
+
+    if np.any(HOB < 0):
+        raise ValueError("model is not applicable to underground bursts")
+
+    SP, SD, ST = sachs(ALT)
+
+    """from here on, ranges are those of the equivalent burst at sea level"""
+    GR = GR / SD
+    HOB = HOB / SD
+
+    Y3 = Y ** (1 / 3)
+
+    SGR = GR / Y3
+    SHOB = HOB / Y3
+    SR = (SGR**2 + SHOB**2) ** 0.5
+
+    alpha = np.arctan2(SHOB, SGR)
+
+    dPfree = _dPdna(SR)
+
+    T = 340 / dPfree**0.55
+    U = 1 / (7782 / dPfree**0.7 + 0.9)
+    W = 1 / (7473 / dPfree**0.5 + 6.6)
+    V = 1 / (647 / dPfree**0.8 + W)
+
+    alphaMach = np.arctan(1 / (T + U))
+    beta = np.arctan(1 / (T + V))
+
+    so = np.clip((alpha - alphaMach) / beta, -1, 1)
+
+    sigma = 0.5 * (np.sin(pi * so * 0.5) + 1)
+
+    """only evaluate either side of the blending where it carries weight"""
+    inMach = sigma != 1
+    inReg = sigma != 0
+
+    dPmach = np.zeros(sigma.shape)
+    lnSGR = np.log(SGR[inMach])
+    A = np.minimum(3.7 - 0.94 * lnSGR, 0.7)
+    B = 0.77 * lnSGR - 3.8 - 18 / SGR[inMach]
+    C = np.maximum(A, B)
+    dPmach[inMach] = _dPdna(SGR[inMach] / 2 ** (1 / 3)) / (
+        1 - C * np.sin(alpha[inMach])
+    )
+
+    dPreg = np.zeros(sigma.shape)
+    n, gs = _n(dPfree[inReg])
+    Rn = 2 + 0.5 * (gs + 1) * (n - 1)
+    f = dPfree[inReg] / 75842
+    D = f**6 * (1.2 + 0.07 * f**0.5) / (f**6 + 1)
+    dPreg[inReg] = dPfree[inReg] * ((Rn - 2) * np.sin(alpha[inReg]) ** D + 2)
+
+    PAIR = dPreg * sigma + dPmach * (1 - sigma)
+
+    nq, _ = _n(PAIR)
+    QAIR = 0.5 * PAIR * (nq - 1) * (1 - sigma * np.sin(alpha) ** 2)
+
+    xm = SHOB**2.5 / 5822 + 2.09 * SHOB**0.75
+    XM = xm * Y3
+
+    S = 1 / (5.98e-5 * SHOB**2 + 3.8e-3 * SHOB + 0.766)
+    h = 0.9 * xm - 3.6 * SHOB
+    with np.errstate(invalid="ignore"):
+        HTP = S * (h + (h**2 + (SGR - 0.9 * xm) ** 2 - xm**2 / 100) ** 0.5) * Y3
+
+    taair, v = _taair_batch(SGR, SHOB)
+    TAAIR = taair * Y3 * v
+
+    """overpressure positive phase duration"""
+    SGR = np.maximum(SGR, 1e-7)
+    SHOB = np.maximum(SHOB, 1e-7)
+
+    to = np.log(1000 * taair) / 3.77
+    dpsurf = 1e-3 * (
+        155 * np.exp(-20.8 * taair) + np.exp(-(to**2) + 4.86 * to + 0.25)
+    )
+    dpunmod = dpsurf * (
+        1
+        - (1 - 1 / (1 + 4.5e-8 * SHOB**7))
+        * (0.04 + 0.61 / (1 + taair**1.5 / 0.027))
+    )
+    DPP = dpunmod * (1.16 * np.exp(-abs(SHOB / 0.3048 - 156) / 1062)) * Y3
+
+    """dynamic pressure positive phase duration"""
+    SHOBo = SHOB / 0.3048
+    SGRo = SGR / 0.3048
+
+    SHOBx = abs(SHOBo - 200) + 200
+    SGRx = SGRo - 1000
+
+    dpo = 0.3 + 0.42 * np.exp(-SHOBx / 131)
+    dpx = np.where(
+        SGRx > 0,
+        dpo + 4.4e-5 * SGRx,
+        dpo + SGRx * (1 / 2361 - (SHOBx - 533) ** 2 / 7.88e7),
+    )
+    dpq = np.where(SHOBo >= 200, dpx, dpx * (1 + 0.2 * np.sin(pi / 200 * SHOBo)))
+    DPQ = dpq * Y3
+
+    """limits"""
+    withinYieldAndAlt = (Y <= 25e3) & (Y >= 0.1) & (ALT >= 0) & (ALT <= 32000)
+
+    LM = np.where(HOB >= 25 * Y3, 0, 20 * Y3)
+    limit1 = withinYieldAndAlt & (HOB <= 4000 * Y3) & (GR >= LM) & (GR <= 4000 * Y3)
+
+    LM = np.maximum(XM, 20 * Y3)
+    limit2 = withinYieldAndAlt & (HOB <= 800 * Y3) & (GR >= LM) & (GR <= 4000 * Y3)
+
+    LM = np.maximum(1.3 * XM, 80 * Y3)
+    limit3 = withinYieldAndAlt & (HOB <= 750 * Y3) & (GR >= LM) & (GR <= 4000 * Y3)
+
+    """back to the burst altitude"""
+    PAIR, QAIR = PAIR * SP, QAIR * SP
+    TAAIR, DPP, DPQ = TAAIR * ST, DPP * ST, DPQ * ST
+    XM, HTP = XM * SD, HTP * SD
+
+    return (PAIR, QAIR, TAAIR, DPP, limit1, XM, HTP, limit2, DPQ, limit3)
+
+
 if __name__ == "__main__":
     airburst(40, 738.3, 446.4)
@@ -25,6 +25,15 @@ for different atmospheric condition is required. The correction factors can
 be sourced from other models, too.
 """
 
+import numpy as np
+
+from HeWu.uc import _uc_m2kft, _uc_psi2pa
+from HeWu.atmosphere import sachs
+
+"""minimum value the ground range and burst height are clamped to in the batch
+evaluation, in order to simulate a "zero" in kft"""
+minimum = 1e-6
+
 
 def _t_fa(r, W):
     """
@@ -56,6 +65,19 @@ def _t_a(x, y, W):
         return _t_fa(r, W) * y / x + _t_fa(r, 2 * W) * (1 - y / x)
 
 
+def _t_a_batch(x, y, W):
+    """
+    array version of _t_a, see above.
+    x: array of ground range, kilofeet
+    y: array of height of burst, kilofeet
+    W: yield, kiloton
+    """
+    r = (x**2 + y**2) ** 0.5
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(x < y, 1, y / x)  # y / x in the Mach region, 1 otherwise
+    return _t_fa(r, W) * k + _t_fa(r, 2 * W) * (1 - k)
+
+
 def _DeltaP_fs(t_a, W):
     """
     free-air-burst peak overpressure in psi
@@ -73,16 +95,19 @@ def _DeltaP_fs(t_a, W):
     )
 
 
-def _DeltaP_s(x, y, W):
+def _DeltaP_s(x, y, W, t_a=None):
     """
     Peak overpressure in psi
-    t_a: time of arrival in milliseconds
     x: ground range in kilofeet
     y: height of burst in kilofeet
     W: yield in kiloton
+    t_a: time of arrival in milliseconds, computed if not supplied.
+
+    Other than the arrival time, this is all array arithmetic, and works
+    as-is on arrays of x, y and t_a.
     """
-    # print(t_a)
-    t_a = _t_a(x, y, W)
+    if t_a is None:
+        t_a = _t_a(x, y, W)
 
     r = (x**2 + y**2) ** 0.5
 
@@ -134,22 +159,87 @@ def _Q_s(DeltaP_s, P_0=14.7):
     return DeltaP_s**2 / (2 * gamma * P_0 + (gamma - 1) * DeltaP_s)
 
 
-def _Q_H(x, y, W, P_0=14.7):
+def _Q_H(x, y, W, P_0=14.7, DeltaP_s=None):
     """
     Horizontal component of dynamic pressure
     x: ground range, kft
     y: burst height, kft
-    DeltaP_s: overpressure in psi
     P_0: ambient pressure in psi
+    DeltaP_s: overpressure in psi, computed if not supplied.
     """
+    if DeltaP_s is None:
+        DeltaP_s = _DeltaP_s(x, y, W)
+
     if x < y:
         """in regular reflection region, flow is constrained to horizontal
         velocity only"""
-        return _Q_s(_DeltaP_s(x, y, W), P_0) * x / y
+        return _Q_s(DeltaP_s, P_0) * x / y
     else:
         """in mach reflection region, flow is turned parallel to surface and
         the horizontal component is the total"""
-        return _Q_s(_DeltaP_s(x, y, W), P_0)
+        return _Q_s(DeltaP_s, P_0)
+
+
+def _airburst_batch(x, y, W, P_0=14.7):
+    """
+    combined array evaluation of the air burst model, computing the arrival
+    time, and from it the peak overpressure, only once per point.
+
+    x: array of ground range, kft
+    y: array of burst height, kft
+    W: array of yield, kiloton
+    P_0: ambient pressure in psi
+
+    returns:
+        t_a: time of arrival in milliseconds
+        DeltaP_s: peak overpressure in psi
+        Q_s: peak dynamic pressure in psi
+        Q_H: peak dynamic pressure horizontal component in psi
+    """
+    t_a = _t_a_batch(x, y, W)
+    DeltaP_s = _DeltaP_s(x, y, W, t_a)
+    Q_s = _Q_s(DeltaP_s, P_0)
+    Q_H = Q_s * np.minimum(x / y, 1)
+
+    return t_a, DeltaP_s, Q_s, Q_H
+
+
+def airburstBatch(GR, HOB, W, ALT=0):
+    """
+    air burst calculation for arrays of points, see _airburst_batch.
+
+    Bursts above sea level are Sachs scaled per point, see atmosphere.py.
+
+    GR: array of ground range in meters
+    HOB: array of height of burst in meter
+    W: array of yield, kiloton
+    ALT: array of burst altitude in meter, defaults to sea level
+    (or anything broadcastable into the same shape)
+
+    returns, laid out as modelAWG1980.airburstBatch less the duration:
+    peak overpressure in pa
+    peak dyn. press. in pa
+    time of arrival in sec
+    peak hz.dynm.press. in pa
+    """
+    GR, HOB, W, ALT = np.broadcast_arrays(
+        np.asarray(GR, dtype=float), np.asarray(HOB, dtype=float), W, ALT
+    )
+
+    SP, SD, ST = sachs(ALT)
+
+    # of the equivalent burst at sea level
+    x = np.maximum(_uc_m2kft(GR / SD), minimum)
+    y = np.maximum(_uc_m2kft(HOB / SD), minimum)
+
+    t_a, DeltaP_s, Q_s, Q_H = _airburst_batch(x, y, W)
+
+    return (
+        _uc_psi2pa(DeltaP_s) * SP,
+        _uc_psi2pa(Q_s) * SP,
+        t_a / 1000 * ST,
+        _uc_psi2pa(Q_H) * SP,
+    )
 
 
 if __name__ == "__main__":
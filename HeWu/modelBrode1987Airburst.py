@@ -16,9 +16,13 @@ equations in III when in the free-air region.
 # In general, capital X, Y are in ft/kT^(1/3), while lower case x, y are in kft/kT^(1/3)
 """
 from math import log10, exp
+
+import numpy as np
+
 from HeWu.uc import _uc_m2ft, _uc_psi2pa, _uc_ft2m
 
 from HeWu.intg import intg
+from HeWu.atmosphere import sachs
 
 
 def _DeltaP_s(x, y):
@@ -106,6 +110,45 @@ def _Xm(X, Y):
     return Xm
 
 
+def _u(r):
+    """
+    scaled time of arrival of the incident shock, as in Eq. (41), in ms/kT^(1/3)
+
+    r: scaled range in kilofeet per cube-root kiloton
+    """
+
+    return (
+        (0.543 - 21.8 * r + 386 * r**2 + 2383 * r**3)
+        * r**8
+        / (
+            2.99e-14
+            - 1.91e-10 * r**2
+            + 1.032e-6 * r**4
+            - 4.43e-6 * r**6
+            + (1.028 + 2.087 * r + 2.69 * r**2) * r**8
+        )
+    )
+
+
+def _w(r):
+    """
+    counterpart of _u for the Mach stem, in ms/kT^(1/3)
+
+    r: scaled range in kilofeet per cube-root kiloton
+    """
+    return (
+        (1.086 - 34.605 * r + 486.3 * r**2 + 2383 * r**3)
+        * r**8
+        / (
+            3.0137e-13
+            - 1.2128e-9 * r**2
+            + 4.128e-6 * r**4
+            - 1.116e-5 * r**6
+            + (1.632 + 2.629 * r + 2.69 * r**2) * r**8
+        )
+    )
+
+
 def _tau(X, Y, Xm):
     """
     scaled time of arrival for GR and H, in ms/kT^(1/3), based on Eq. (41)
@@ -116,39 +159,6 @@ def _tau(X, Y, Xm):
 
     """
 
-    def _u(r):
-        """
-        r: scaled range in kilofeet per cube-root kiloton
-        """
-
-        return (
-            (0.543 - 21.8 * r + 386 * r**2 + 2383 * r**3)
-            * r**8
-            / (
-                2.99e-14
-                - 1.91e-10 * r**2
-                + 1.032e-6 * r**4
-                - 4.43e-6 * r**6
-                + (1.028 + 2.087 * r + 2.69 * r**2) * r**8
-            )
-        )
-
-    def _w(r):
-        """
-        r: scaled range in kilofeet per cube-root kiloton
-        """
-        return (
-            (1.086 - 34.605 * r + 486.3 * r**2 + 2383 * r**3)
-            * r**8
-            / (
-                3.0137e-13
-                - 1.2128e-9 * r**2
-                + 4.128e-6 * r**4
-                - 1.116e-5 * r**6
-                + (1.632 + 2.629 * r + 2.69 * r**2) * r**8
-            )
-        )
-
     rm = (Xm**2 + Y**2) ** 0.5 / 1000
     r = (X**2 + Y**2) ** 0.5 / 1000
     if X <= Xm:
@@ -159,6 +169,22 @@ def _tau(X, Y, Xm):
     return tau
 
 
+def _tau_batch(X, Y, Xm):
+    """
+    array version of _tau, see above.
+
+    input:
+        X: array of scaled ground range in ft/kT^(1/3)
+        Y: array of scaled burst height in ft/kT^(1/3)
+        Xm: array of scaled range of Mach stem onset in ft/kT^(1/3)
+    """
+
+    rm = (Xm**2 + Y**2) ** 0.5 / 1000
+    r = (X**2 + Y**2) ** 0.5 / 1000
+
+    return np.where(X <= Xm, _u(r), _u(rm) + _w(r) - _w(rm))
+
+
 def _D(X, Y, tau, Xm):
     """
     scaled overpressure duration of positive phase in milliseconds
@@ -240,6 +266,27 @@ def _D_u(x, y, D, Xm, DeltaP_s, tau):
         return C * D
 
 
+def _D_u_batch(x, y, D, Xm, DeltaP_s):
+    """
+    array version of _D_u, see above.
+    """
+    _pi = DeltaP_s / 1000
+    D_u_pos = (
+        317 / (1 + 85 * _pi + 7500 * _pi**2)
+        + 6110 * _pi / (1 + 420 * _pi**2)
+        + 2113 * _pi / (1 + 11 * _pi)
+    )
+
+    C = (
+        89.6 * y**5.2 / (1 + 20.5 * y**5.4)
+        + 4.51 / (1 + 130.7 * y**8.6)
+        + 2.466 * y**0.5 / (1 + 99 * y**2.5)
+        - 12.8 * (x**2 + y**2) ** 1.25 / (1 + 3.63 * (x**2 + y**2) ** 1.25)
+    )
+
+    return np.where(x * 1000 < Xm, D_u_pos, C * D)
+
+
 def _DeltaP(X, Y, sigma, DeltaP_s, Xm, tau, integrate=True):
     """
     Overpressure over time in psi.
@@ -453,6 +500,147 @@ def _DeltaP(X, Y, sigma, DeltaP_s, Xm, tau, integrate=True):
         return DeltaP_s * atSigma(sigma)
 
 
+def _DeltaP_batch(X, Y, Xm, tau):
+    """
+    array version of _DeltaP, see above. The time-independent factors are
+    computed once for all points, and a partial function is returned that
+    evaluates the ratio DeltaP / DeltaP_s for arrays of scaled time.
+
+    input:
+        X: array of scaled ground range in ft/kT^(1/3)
+        Y: array of scaled burst height in ft/kT^(1/3)
+        Xm: array of scaled range of Mach stem onset in ft/kT^(1/3)
+        tau: array of scaled time of arrival in ms/kT^(1/3)
+
+    return:
+        atSigma: function of scaled time sigma (ms/kT^(1/3)) returning the ratio
+            DeltaP / DeltaP_s. sigma should be within the positive phase of
+            each point, i.e. tau <= sigma <= tau + sd.
+        sd: array of scaled overpressure positive phase duration, ms/kT^(1/3)
+    """
+
+    z = Y / X
+
+    Xe = 3.039 * Y / (1 + 0.0067 * Y)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        K = abs((X - Xm) / (Xe - Xm))
+
+    d2 = 2.99 + 31240 * (Y / 100) ** 9.86 / (1 + 15530 * (Y / 100) ** 9.87)
+    d = (
+        0.23
+        + 0.583 * Y**2 / (26667 + Y**2)
+        + 0.27 * K
+        + (0.5 - 0.583 * Y**2 / (26667 + Y**2)) * K**d2
+    )
+
+    a = (d - 1) * (1 - K**20 / (1 + K**20))
+
+    r = (X**2 + Y**2) ** 0.5 / 1000
+
+    sd = _D(X, Y, tau, Xm)
+
+    s = (
+        1
+        - 1100 * (Y / 100) ** 7 / (1 + 1100 * (Y / 100) ** 7)
+        - 2.441e-14
+        * Y**2
+        / (1 + 9000 * (Y / 100) ** 7)
+        * 1e10
+        / (0.441 + (X / 100) ** 10)
+    )
+
+    f2 = (
+        (
+            0.445
+            - 5.44 * r**1.02 / (1 + 1e5 * r**5.84)
+            + 7.571 * z**7.15 / (1 + 5.135 * z**12.9)
+            - 8.07 * z**7.31 / (1 + 5.583 * z**12.23)
+        )
+        * 0.4530  # 0.4530 in paper, 0.435 in FORTAN
+        * (Y / 10) ** 1.26
+        / (1 + 0.03096 * (Y / 10) ** 3.12)
+        * (1 - 0.000019 * tau**8 / (1 + 0.000019 * tau**8))
+    )
+
+    f = (
+        (
+            0.01477 * tau**0.75 / (1 + 0.005836 * tau)
+            + 7.402e-5 * tau**2.5 / (1 + 1.429e-8 * tau**4.75)
+            - 0.216
+        )
+        * s
+        + 0.7076
+        - 3.077e-5 * tau**3 / (1 + 4.367e-5 * tau**3)
+        + f2
+        - (0.452 - 9.94e-7 * X**4.13 / (1 + 2.1868e-6 * X**4.13))
+        * (1 - 1.5397e-4 * Y**4.3 / (1 + 1.5397e-4 * Y**4.3))
+    )
+    g = 10 + (77.58 - 64.99 * tau**0.125 / (1 + 0.04348 * tau**0.5)) * s
+
+    h = (
+        3.003
+        + 0.05601 * tau / (1 + 1.473e-9 * tau**5)
+        + (
+            0.01769 * tau / (1 + 3.207e-10 * tau**4.25)
+            - 0.03209 * tau**1.25 / (1 + 9.914e-8 * tau**4)
+            - 1.6
+        )
+        * s
+        - 0.1966 * tau**1.22 / (1 + 0.767 * tau**1.22)
+    )
+
+    c2 = 23000 * (Y / 100) ** 9 / (1 + 23000 * (Y / 100) ** 9)
+    c3 = 1 + (
+        1.094
+        * K**0.738
+        / (1 + 3.687 * K**2.63)
+        * (1 - 83.01 * (Y / 100) ** 6.5 / (1 + 172.3 * (Y / 100) ** 6.04))
+        - 0.15
+    ) / (1 + 0.5089 * K**13)
+
+    v0 = (
+        0.003744 * (Y / 10) ** 5.185 / (1 + 0.004684 * (Y / 10) ** 4.189)
+        + 0.004755 * (Y / 10) ** 8.049 / (1 + 0.003444 * (Y / 10) ** 7.497)
+        - 0.04852 * (Y / 10) ** 3.423 / (1 + 0.03038 * (Y / 10) ** 2.538)
+    ) / (1 + 9.23 * K**2)
+
+    """
+    the time-independent part of c, and of the time scale of the second peak
+    """
+    c0 = (
+        (1.04 - 0.02409 * (X / 100) ** 4 / (1 + 0.02317 * (X / 100) ** 4))
+        / (1 + a)
+        * (c2 + (1 - c2) * (1 - 0.09 * K**2.5 / (1 + 0.09 * K**2.5)))
+        * c3
+    )
+    mach = (X >= Xm) & (Y <= 380)
+    jd = Y * np.maximum(X - Xm, 0) ** 1.25 / 11860
+
+    def atSigma(sigma):
+        """partial function, implicitly inheriting the non-time-dependent factors
+        sigma: array of scaled time in question
+
+        returns the ratio: DeltaP @ scaled time sigma / DeltaP_s
+        """
+
+        b = (f * (tau / sigma) ** g + (1 - f) * (tau / sigma) ** h) * (
+            1 - (sigma - tau) / sd
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            j = np.minimum(
+                np.nan_to_num((sigma - tau) / jd, nan=0, posinf=200), 200
+            )
+
+        v = v0 * j**3 / (6.13 + j**3) + 1
+        c = c0 * j**7 / (1 + 0.923 * j**8.5) * (1 - ((sigma - tau) / sd) ** 8)
+
+        return np.where(mach, (1 + a) * (b * v + c), b)
+
+    return atSigma, sd
+
+
 def _Q(X, Y, sigma, DeltaP_s, Xm, tau, integrate=True):
     """
     Overpressure or dynamic pressure **horizontal component** over time in psi.
@@ -676,6 +864,23 @@ def _Q(X, Y, sigma, DeltaP_s, Xm, tau, integrate=True):
         return atSigma(sigma)
 
 
+def _Q_1(x, y, xq):
+    """
+    helper function for _Q_s
+    """
+    r = (x**2 + y**2) ** 0.5
+    M = xq / x
+
+    A = -236.1 + 17.72 * M**0.593 / (1 + 10.4 * M**3.124)
+    B = 12.27 - 21.69 * M**2.24 / (1 + 6.976 * M**0.484)
+    C = 20.26 + 14.7 * M**2 / (1 + 0.08747 * M**3.05)
+    D = -1.137 - 0.5606 * M**0.895 / (1 + 3.046 * M**7.48)
+    E = 1.731 + 10.84 * M**1.12 / (1 + 12.26 * M**0.0014)
+    F = 2.84 + 0.855 * M**0.9 / (1 + 1.05 * M**2.84)
+
+    return A * r**D / (1 + B * r**E) + C / r**F
+
+
 def _Q_s(x, y, r):
     """
     Peak (horizontal) dynamic pressure in psi
@@ -685,22 +890,6 @@ def _Q_s(x, y, r):
         r: scaled distance in kft/kT^(1/3)
     """
 
-    def _Q_1(x, y, xq):
-        """
-        helper function for _Q_s
-        """
-        r = (x**2 + y**2) ** 0.5
-        M = xq / x
-
-        A = -236.1 + 17.72 * M**0.593 / (1 + 10.4 * M**3.124)
-        B = 12.27 - 21.69 * M**2.24 / (1 + 6.976 * M**0.484)
-        C = 20.26 + 14.7 * M**2 / (1 + 0.08747 * M**3.05)
-        D = -1.137 - 0.5606 * M**0.895 / (1 + 3.046 * M**7.48)
-        E = 1.731 + 10.84 * M**1.12 / (1 + 12.26 * M**0.0014)
-        F = 2.84 + 0.855 * M**0.9 / (1 + 1.05 * M**2.84)
-
-        return A * r**D / (1 + B * r**E) + C / r**F
-
     xq = (
         63.5 * y**7.26 / (1 + 67.11 * y**4.746) + 0.6953 * y**0.808
     )  # approximate interface between regular and Mach reflection in kft/kt^(1/3)
@@ -725,6 +914,43 @@ def _Q_s(x, y, r):
         )
 
 
+def _Q_s_batch(x, y):
+    """
+    array version of _Q_s, see above. Either side of the regular-Mach
+    interface is only evaluated where it applies, as _Q_1 overflows far
+    inside x < xq.
+    """
+    x, y = np.broadcast_arrays(x, y)
+    xq = 63.5 * y**7.26 / (1 + 67.11 * y**4.746) + 0.6953 * y**0.808
+
+    Q_s = np.empty(x.shape)
+
+    below = x < xq
+    Q_s[~below] = _Q_1(x[~below], y[~below], xq[~below])
+
+    x, y, xq = x[below], y[below], xq[below]
+
+    Qm = _Q_1(xq, y, xq)
+
+    G = 50 - 1843 * y**2.153 / (1 + 3.95 * y**5.08)
+    H = 0.294 + 71.56 * y**8.7 / (1 + 115.3 * y**6.186)
+    I = abs(-3.324 + 987.5 * y**4.77 / (1 + 211.8 * y**5.166))
+    J = 1.955 + 169.7 * y**9.317 / (1 + 97.36 * y**6.513)
+    K = 8.123e-6 + 0.001613 * y**6.428 / (1 + 60.26 * y**7.358)
+    L = np.log10(xq / x)
+
+    # the rational terms in L are rearranged so that either limit of L
+    # overflows gracefully, instead of into inf / inf
+    with np.errstate(over="ignore", divide="ignore"):
+        Q_s[below] = Qm * np.exp(
+            G / (L**-I + 649)
+            - 4.01 / (L**-J + H)
+            + 7.67e-6 * (1 / (K + L**3.22) - 1 / K)
+        )
+
+    return Q_s
+
+
 def _sI_u_pos(x, y):
     """
     simple fit for scaled integral of dynamic pressure, psi-ms/kT^(1/3), with
@@ -750,6 +976,23 @@ def _sI_u_pos(x, y):
         )
 
 
+def _sI_u_pos_batch(x, y):
+    """
+    array version of _sI_u_pos, see above, with nan in place of None.
+    """
+    psi = y + 0.09
+
+    E = 183 * (y**2 + 0.00182) / (y**2 + 0.00222)
+    F = 0.00058 * np.exp(9.5 * y) + 0.0117 * np.exp(-22 * y)
+    G = 2.3 + 29 * y / (1 + 1760 * y**5) + 25 * y**4 / (1 + 3.76 * y**6)
+
+    return np.where(
+        x > 170 * psi / (1 + 337 * psi**0.25) + 0.914 * psi**2.5,
+        E * x / (F + x**3.61) + G / (1 + 0.22 * x**2),
+        np.nan,
+    )
+
+
 def _sI_p_pos(X, Y, DeltaP_s, Xm):
     """
     scaled positive phase impulse in psi-ms per cube root kiloton, using a simple
@@ -770,6 +1013,19 @@ def _sI_p_pos(X, Y, DeltaP_s, Xm):
         return 183 * DeltaP_s**0.5 / (1 + 0.00385 * DeltaP_s**0.5)
 
 
+def _sI_p_pos_batch(X, Y, DeltaP_s, Xm):
+    """
+    array version of _sI_p_pos, see above, nan where the peak overpressure fit
+    has gone negative, far outside its range.
+    """
+    with np.errstate(invalid="ignore"):
+        return (
+            np.where(X <= Xm, 145, 183)
+            * DeltaP_s**0.5
+            / (1 + 0.00385 * DeltaP_s**0.5)
+        )
+
+
 def airburst(GR_m, H_m, W, t=None, prettyPrint=True):
     """
     Calculate various air-burst parameters, using the Brode 1987 model and adapting
@@ -934,6 +1190,126 @@ def airburst(GR_m, H_m, W, t=None, prettyPrint=True):
     )
 
 
+def airburstBatch(GR_m, H_m, W, ALT=0):
+    """
+    array version of airburst, for screening large numbers of points. The
+    parameters in closed form are evaluated as array expressions, while the
+    integrated impulses and partial-time values are left out: see airburst()
+    for those.
+
+    Bursts above sea level are Sachs scaled per point, see atmosphere.py.
+
+    input:
+        GR_m: array of ground range, meter
+        H_m : array of height of burst, meter
+        W   : array of yield, kiloton
+        ALT : array of burst altitude, meter, defaults to sea level
+        (or anything broadcastable into the same shape)
+
+    output:
+        TAAIR: time of arrival, second
+        PAAIR: maximum overpressure, Pa
+        DPP  : overpressure positive phase duration, second
+        IPEST: estimation of overpressure total positive impulse, Pa-s
+        QAAIR: maximum dynamic pressure horizontal component, Pa
+        DPQ  : dynamic pressure positive (outward flow) phase duration, s
+        IQEST: estimation of dynamic pressure horizontal component total
+            impulse, Pa-s, nan where no estimation is available
+        XM   : range at which Mach reflection starts, m
+    """
+    GR_m, H_m, W, ALT = np.broadcast_arrays(
+        np.asarray(GR_m, dtype=float), np.asarray(H_m, dtype=float), W, ALT
+    )
+
+    SP, SD, ST = sachs(ALT)
+
+    m = W ** (1 / 3)
+
+    # clamp the value to > 0.001 meter, same as in airburst()
+    GR = np.maximum(_uc_m2ft(GR_m / SD), 1e-9 * m)
+    H = np.maximum(_uc_m2ft(H_m / SD), 1e-9 * m)
+
+    X = GR / m
+    Y = H / m
+
+    Xm = _Xm(X, Y)
+    tau = _tau_batch(X, Y, Xm)
+
+    x = X / 1000
+    y = Y / 1000
+
+    DeltaP_s = _DeltaP_s(x, y)
+    Q_s = _Q_s_batch(x, y)
+
+    D = _D(X, Y, tau, Xm)
+    D_u = _D_u_batch(x, y, D, Xm, DeltaP_s)
+
+    XM = _uc_ft2m(Xm * m) * SD
+    TAAIR = tau * m / 1000 * ST
+
+    DPP = D * m / 1000 * ST
+    DPQ = D_u * m / 1000 * ST
+
+    IPEST = _uc_psi2pa(_sI_p_pos_batch(X, Y, DeltaP_s, Xm) * m / 1000) * SP * ST
+    IQEST = _uc_psi2pa(_sI_u_pos_batch(x, y) * m / 1000) * SP * ST
+
+    PAAIR = _uc_psi2pa(DeltaP_s) * SP
+    QAAIR = _uc_psi2pa(Q_s) * SP
+
+    return TAAIR, PAAIR, DPP, IPEST, QAAIR, DPQ, IQEST, XM
+
+
+def airburstFrames(GR_m, H_m, W, t, ALT=0):
+    """
+    Snapshots of the overpressure field at a sequence of times, using the
+    Brode 1987 model.
+
+    The arrival time, peak overpressure, duration and the time-independent
+    coefficients of the overpressure history (Eqn. 63) are computed once for
+    all points, after which each snapshot only costs the evaluation of the
+    time-dependent terms. Snapshots are yielded one by one, so that only a
+    single frame is held in memory at a time.
+
+    input:
+        GR_m: array of ground range, meter
+        H_m : array of height of burst, meter
+        (e.g. a grid from numpy.meshgrid, or anything broadcastable)
+        W   : yield, kiloton
+        t   : iterable of times after burst, second
+        ALT : burst altitude, meter, a scalar or an array broadcastable with
+            the points, defaults to sea level. See atmosphere.py.
+
+    yields:
+        overpressure in Pa over the points at each time, 0 where the blast
+        wave has not yet arrived or the positive phase is already over.
+    """
+
+    SP, SD, ST = sachs(ALT)
+
+    m = W ** (1 / 3)
+
+    # clamp the value to > 0.001 meter, same as in airburst()
+    GR = np.maximum(_uc_m2ft(np.asarray(GR_m, dtype=float) / SD), 1e-9 * m)
+    H = np.maximum(_uc_m2ft(np.asarray(H_m, dtype=float) / SD), 1e-9 * m)
+    GR, H = np.broadcast_arrays(GR, H)
+
+    X = GR / m
+    Y = H / m
+
+    Xm = _Xm(X, Y)
+    tau = _tau_batch(X, Y, Xm)
+
+    DeltaP_s = _uc_psi2pa(_DeltaP_s(X / 1000, Y / 1000)) * SP
+    atSigma, sd = _DeltaP_batch(X, Y, Xm, tau)
+
+    for ti in t:
+        sigma = ti * 1000 / (m * ST)
+        positive = (sigma >= tau) & (sigma <= tau + sd)
+        yield np.where(
+            positive, DeltaP_s * atSigma(np.clip(sigma, tau, tau + sd)), 0
+        )
+
+
 if __name__ == "__main__":
     """
     by default, runs a test
@@ -19,7 +19,11 @@ X to Y means "fitting X to Y" or "fitting X against Y"
 """
 
 from math import exp
+
+import numpy as np
+
 from HeWu.uc import _uc_psi2pa, _uc_m2ft
+from HeWu.atmosphere import sachs
 
 
 def _DeltaP_s_to_r(r):
@@ -554,7 +558,7 @@ def _theta_and_t_m(DeltaP_s):
 
     t_m = 19 / _pi
 
-    return max(theta_m, theta_s), t_m
+    return np.maximum(theta_m, theta_s), t_m
 
 
 def _D_p_neg(m):
@@ -692,6 +696,59 @@ def freeair(R, Y, t=None, prettyPrint=True):
     return (DeltaP_s, DeltaP_t, Q_t, T, D_p_pos, I_p_pos, D_u_pos, I_u_pos, theta_m)
 
 
+def freeairBatch(R, Y, ALT=0):
+    """
+    array version of freeair, covering the peak values, arrival, durations and
+    impulses. The time histories are left out: see freeair() for those.
+
+    Bursts above sea level are Sachs scaled per point, see atmosphere.py. The
+    maximum temperature is given as computed for sea level.
+
+    input:
+        R  : array of range, meter
+        Y  : array of yield, kiloton
+        ALT: array of burst altitude, meter, defaults to sea level
+        (or anything broadcastable into the same shape)
+
+    returns:
+        DeltaP_s: peak overpressure, Pa
+        Q_s     : peak dynamic pressure, Pa
+        T       : time of arrival, second
+        D_p_pos : overpressure positive phase duration, second
+        I_p_pos : overpressure positive phase impulse, Pa-s
+        D_u_pos : dynamic pressure positive phase duration, second
+        I_u_pos : dynamic pressure positive phase impulse, Pa-s
+        theta_m : maximum temperature, deg C
+    """
+    R, Y, ALT = np.broadcast_arrays(np.asarray(R, dtype=float), Y, ALT)
+
+    SP, SD, ST = sachs(ALT)
+
+    m = Y ** (1 / 3)
+    r = _uc_m2ft(R / SD) / m / 1000
+    DeltaP_s = _DeltaP_s_to_r(r)
+    Q_s = _Q_s_over_Delta_P_s(DeltaP_s) * DeltaP_s
+    tau = _ci_tau_to_r(r)
+
+    D_p_pos = _s_D_p_pos_to_DeltaP_s(DeltaP_s) * m  # in ms
+    I_p_pos = _s_I_p_pos(DeltaP_s) * m  # in psi-ms
+    D_u_pos = _s_D_u_pos(DeltaP_s) * m  # in ms
+    I_u_pos = _s_I_u_pos_to_r(r) * m  # in psi-ms
+
+    theta_m, _ = _theta_and_t_m(DeltaP_s)
+
+    return (
+        _uc_psi2pa(DeltaP_s) * SP,
+        _uc_psi2pa(Q_s) * SP,
+        tau * m / 1000 * ST,
+        D_p_pos / 1000 * ST,
+        _uc_psi2pa(I_p_pos / 1000) * SP * ST,
+        D_u_pos / 1000 * ST,
+        _uc_psi2pa(I_u_pos / 1000) * SP * ST,
+        theta_m * 1e3,
+    )
+
+
 if __name__ == "__main__":
     from HeWu.test import runFAtest
 
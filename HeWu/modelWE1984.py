@@ -9,7 +9,10 @@ dating to 1984.
 """
 
 
-from math import sqrt, log, log10, exp, pi, sin
+from math import sqrt, log, log10, exp, pi, sin, isnan
+from functools import lru_cache
+
+import numpy as np
 
 
 def clamp(x, a, b):
@@ -39,52 +42,66 @@ def gamma(u):
     return 0.994 - 0.446 * (u - 1) + 0.455 * (u - 1) ** 2
 
 
-cDn = {
-    1: (253, 71, 138),
-    2: (98, 49, 225),
-    3: (253, 71, 138),
-    4: (394, 31, 261),
-    5: (347, 52, 147),
-    6: (177, 67, 152),
-    7: (394, 31, 261),
-    8: (450, 24, 323),
-    9: (753, -13, 492),
-    10: (272, 13, 933),
-    11: (394, 31, 261),
-    12: (300, -13, 492),
-    13: (1431, -2, 63),
-}
-
-cDg = {
-    1: (357, 32, -188),
-    2: (605, 0, 793),
-    3: (433, 27, 68.8),
-    4: (542, 14, 439),
-    5: (542, 14, 439),
-    6: (433, 27, 68.8),
-    7: (542, 14, 439),
-    8: (490, 18, 297),
-    9: (542, 14, 439),
-    11: (542, 14, 439),
-    12: (604, 7, 633),
-    13: (722, 8, 651),
-}
-
-cCg = {
-    1: (59, 9, 8, 5, 98, 108),
-    2: (61, 9, 34, 13, 108, 142),
-    3: (59, 9, 8, 5, 98, 108),
-    4: (59, 9, 8, 5, 98, 108),
-    5: (50, 11, -25, 1, 90, 92),
-    6: (61, 9, 34, 13, 108, 142),
-    7: (42, 12, -4, 2, 100, 93),
-    8: (44, 11, -43, 0, 86, 87),
-    9: (44, 11, -43, 0, 86, 87),
-    10: (61, 9, 34, 13, 108, 142),
-    11: (44, 11, -43, 0, 86, 87),
-    12: (42, 12, -4, 2, 100, 93),
-    13: (-87, 12, 0, 0, 62, 54),
-}
+"""
+coefficient tables, indexed by weapon type WT 1-13. Row 0 is unused, and so is
+row 10 of cDg as the Dg fit of weapon type 10 is special cased in iniRadBurst.
+"""
+cDn = np.array(
+    (
+        (np.nan,) * 3,
+        (253, 71, 138),
+        (98, 49, 225),
+        (253, 71, 138),
+        (394, 31, 261),
+        (347, 52, 147),
+        (177, 67, 152),
+        (394, 31, 261),
+        (450, 24, 323),
+        (753, -13, 492),
+        (272, 13, 933),
+        (394, 31, 261),
+        (300, -13, 492),
+        (1431, -2, 63),
+    )
+)
+
+cDg = np.array(
+    (
+        (np.nan,) * 3,
+        (357, 32, -188),
+        (605, 0, 793),
+        (433, 27, 68.8),
+        (542, 14, 439),
+        (542, 14, 439),
+        (433, 27, 68.8),
+        (542, 14, 439),
+        (490, 18, 297),
+        (542, 14, 439),
+        (np.nan,) * 3,
+        (542, 14, 439),
+        (604, 7, 633),
+        (722, 8, 651),
+    )
+)
+
+cCg = np.array(
+    (
+        (np.nan,) * 6,
+        (59, 9, 8, 5, 98, 108),
+        (61, 9, 34, 13, 108, 142),
+        (59, 9, 8, 5, 98, 108),
+        (59, 9, 8, 5, 98, 108),
+        (50, 11, -25, 1, 90, 92),
+        (61, 9, 34, 13, 108, 142),
+        (42, 12, -4, 2, 100, 93),
+        (44, 11, -43, 0, 86, 87),
+        (44, 11, -43, 0, 86, 87),
+        (61, 9, 34, 13, 108, 142),
+        (44, 11, -43, 0, 86, 87),
+        (42, 12, -4, 2, 100, 93),
+        (-87, 12, 0, 0, 62, 54),
+    )
+)
 """ last one is 54 in the original implementation. but 84 in accompanying documentation"""
 
 
@@ -93,13 +110,33 @@ def iniRad(Y, AIR, H, GR, FF, WT):
     rad = exp(-(H**1.04) / 13800)
     AIR = (AIR + rad) / 2
     """
+    return iniRadBurst(Y, AIR, H, FF, WT)(GR)
+
+
+def iniRadBurst(Y, AIR, H, FF, WT):
+    """
+    per-burst context for iniRad: everything that depends only on the burst
+    (Y, AIR, H, FF, WT) is computed once, and the returned function atGR
+    evaluates the doses for an array of ground ranges GR in one pass:
+
+        atGR(GR) -> (N, SG, NSGLim, FFG, TD, DS, NtG, OTHLim)
+
+    with the same meaning as the return of iniRad, in arrays shaped like GR.
+
+    WT may also be an array of weapon types, e.g. np.arange(1, 14) for all of
+    them, in which case the results are of shape WT.shape + GR.shape.
+
+    Y may also be an array broadcastable against GR, e.g. for solving for the
+    yield, see inverse.yieldForDose.
+    """
 
     if H < 0:
         raise ValueError(
             "underground burst is not yet considered for initial radiation model"
         )
 
-    if isinstance(WT, int) and 13 >= WT >= 1:
+    WT = np.asarray(WT)
+    if WT.dtype.kind in "iu" and np.all((WT >= 1) & (WT <= 13)):
         pass
     else:
         raise ValueError("invalid weapon type")
@@ -107,164 +144,167 @@ def iniRad(Y, AIR, H, GR, FF, WT):
     if FF < 0 or FF > 1:
         raise ValueError("impossible fission fragment")
 
-    SR = sqrt(GR**2 + H**2)
-    SRo = AIR * SR
     Ho = AIR * H
     s = clamp((Ho - 277) / 50, 1, -1)
     sigma = 0.5 * (1 + sin(s * pi * 0.5))
 
     """Dn"""
 
-    ap, bp, cp = cDn[WT]
+    ap, bp, cp = np.moveaxis(cDn[WT], -1, 0)
 
-    a = 1e6 * ap
-    b = -(500 + bp) / 1e5
-    c = 1 + cp / 1000
-    Dn = a / (SRo) ** c * exp(b * SRo)
+    an = 1e6 * ap
+    bn = -(500 + bp) / 1e5
+    cn = 1 + cp / 1000
 
     """Dg"""
 
-    if WT == 10:
-        a = 13.5
-        b = -0.344
-        c = -1.537
-        d = 0.5173
-
-    else:
-        ap, bp, cp = cDg[WT]
-        a = 10 ** (ap / 100)
-        b = -(193 + bp) / 1e4
-        c = cp / 1000
-        d = 0.8
+    ap, bp, cp = np.moveaxis(cDg[WT], -1, 0)
 
-    Dg = a / (SRo) ** c * exp(b * SRo**d)
+    isWT10 = WT == 10
+    ag = np.where(isWT10, 13.5, 10 ** (ap / 100))
+    bg = np.where(isWT10, -0.344, -(193 + bp) / 1e4)
+    cg = np.where(isWT10, -1.537, cp / 1000)
+    dg = np.where(isWT10, 0.5173, 0.8)
 
     """Dff"""
 
     p = AIR * (0.264 - AIR / 12.6) + 0.815
-    SRx = sign(SR - 140) * abs(SR - 140) ** p + 140
-    Dff = 1.42e7 / SRx**0.9516 * exp(-(SRx**0.774) / 32.7)
 
     """Cg"""
 
-    ap, app, bp, bpp, cp, cpp = cCg[WT]
+    ap, app, bp, bpp, cp, cpp = np.moveaxis(cCg[WT], -1, 0)
 
     Hx = min(1000, Ho)
 
-    if WT == 13:
-        Cgmax = 1.1
-        ao = 0.002
-        b = -2.12 + exp(Hx**0.903 / 204) + 0.977 * (1 - sigma)
-
-    else:
-        Cgmax = 1
-        ao = 0.0035
-        b = bp / 100 + exp(Hx**0.88 / (bpp + 192)) + (1 - sigma) * pi / 6
+    isWT13 = WT == 13
+    Cgmax = np.where(isWT13, 1.1, 1)
+    ao = np.where(isWT13, 0.002, 0.0035)
+    b = np.where(
+        isWT13,
+        -2.12 + exp(Hx**0.903 / 204) + 0.977 * (1 - sigma),
+        bp / 100 + np.exp(Hx**0.88 / (bpp + 192)) + (1 - sigma) * pi / 6,
+    )
 
     x = 0.9 - ap / 1000
     t1 = ao * Ho**x
     t2 = ao * 277**x + 0.00011 * Ho ** (1 + app / 100)
-    a = min(Cgmax, 0.31 + (1 - sigma) * t1 + sigma * t2)
-    c = cp + sigma / cpp * max(0, Hx - 277) ** 1.4
-
-    Cg = a + exp(b + c * (1 - exp(4e-5 * SRo)))
+    Cga = np.minimum(Cgmax, 0.31 + (1 - sigma) * t1 + sigma * t2)
+    Cgb = b
+    Cgc = cp + sigma / cpp * max(0, Hx - 277) ** 1.4
 
     """Cf """
 
     """ issue: is log e or log 10 ?
     log10 is numerically closer"""
-    SH = min(H / Y ** (1 / 3), 250)
-    sf = sin(1.16 * log(Y, 10) - 1.39)
-    z = (log(Y, 10) - 1.4) / 3.5
+    Y = np.asarray(Y, dtype=float)
+    logY = np.log(Y) / log(10)  # as log(Y, 10)
+
+    SH = np.minimum(H / Y ** (1 / 3), 250)
+    sf = np.sin(1.16 * logY - 1.39)
+    z = (logY - 1.4) / 3.5
 
-    Cf = (
-        0.5 * (z + sqrt(z**2 + 0.044)) * AIR * (1 - SH / 125)
-        + 0.038 * log(Y, 10)
+    # Cf = 10 ** (Cf0 + (GR / 1000 - Cf1) * Cf2)
+    Cf0 = (
+        0.5 * (z + np.sqrt(z**2 + 0.044)) * AIR * (1 - SH / 125)
+        + 0.038 * logY
         - 0.22
-        + (GR / 1000 - 0.65 * log(Y, 10) - 0.4)
-        * 0.075
-        * (sf + 2 * abs(sf) * (AIR - 0.9))
     )
+    Cf1 = 0.65 * logY + 0.4
+    Cf2 = 0.075 * (sf + 2 * abs(sf) * (AIR - 0.9))
 
-    Cf = 10**Cf
-
-    """ He Hydrodynamic enhancement factor"""
+    """ He Hydrodynamic enhancement factor, only applied for Y >= 1"""
 
-    if Y < 1:
-        He = 1
-    else:
-        a = 0.1455 * AIR - 0.0077
-        b = 2.55 - 0.35 * AIR
-
-        AH = 10 ** (a * log10(Y) ** b)
-
-        c = 0.05875 * AIR + 0.004
-        d = 0.04 * AIR - 0.03 * sign(AIR - 0.6) * abs(AIR - 0.6) ** 1.3
-
-        BY = 1 - (1 + c * log10(Y) ** 2.6) * exp(-d * log10(Y) ** 2.6)
+    a = 0.1455 * AIR - 0.0077
+    b = 2.55 - 0.35 * AIR
+    c = 0.05875 * AIR + 0.004
+    d = 0.04 * AIR - 0.03 * sign(AIR - 0.6) * abs(AIR - 0.6) ** 1.3
 
-        He = min(AH * exp(BY * SR / 1000), exp(SR * (-0.26 + 2.563 * AIR) / 1000))
+    with np.errstate(invalid="ignore"):  # nan below 1 kT, where unused
+        AH = 10 ** (a * np.log10(Y) ** b)
+        BY = 1 - (1 + c * np.log10(Y) ** 2.6) * np.exp(-d * np.log10(Y) ** 2.6)
 
     """Cn"""
 
     t1 = 0.205 + 2.2e-3 * Ho**0.839
     """ issue: where does ^2 operate on ? resolved, (/637)^2"""
     t2 = 0.4514 + Ho**1.636 / 637**2
-    a = min(1, (1 - sigma) * t1 + sigma * t2)
+    Cna = min(1, (1 - sigma) * t1 + sigma * t2)
     t3 = 0.388 + 0.116 * Ho**0.27
     t4 = 0.9176 + Ho**3.726 / 1.78e10
-    b = (1 - sigma) * t3 + sigma * t4
+    Cnb = (1 - sigma) * t3 + sigma * t4
     """ issue: 0.0728 or 0.728? resovled: 0.0728"""
-    c = 8e-4 + 0.0728 / (Ho**1.23 + 23.6)
-    d = 0.9
+    Cnc = 8e-4 + 0.0728 / (Ho**1.23 + 23.6)
+    Cnd = 0.9
     if Ho > 1:
-        d += log(Ho) / 25
+        Cnd += log(Ho) / 25
 
-    Cn = a + b * exp(-c * SRo**d)
+    """limits"""
 
-    """end"""
-    N = Dn * Cn * Y * AIR**2
-    SG = Dg * Cg * Y * AIR**2
-    FFG = Dff * Cf * He * Y * FF
-    TD = N + SG + FFG
-    NtG = N / (SG + FFG)
+    x1 = sqrt(max(0, 1e4 - H**2))
+    x2 = np.sqrt(np.maximum(0, (150 * np.maximum(1, Y ** (1 / 3))) ** 2 - H**2))
+    y = sqrt(1e8 - H**2)
 
-    if WT == 10:
-        fn = exp(SR / 800) / 250
-    elif WT == 13:
-        fn = exp(-SR / 234.7) / 20 + exp(-SR / 4329) / 25
-    else:
-        fn = 0.015
+    inLim = (
+        (0.01 <= Y)
+        & (Y <= 25000)
+        & (0.6 <= AIR <= 1)
+        & (1.5 / AIR <= H <= 10000 / AIR)
+    )
 
-    DS = FFG + SG + fn * N
+    def atGR(GR):
+        GR = np.asarray(GR, dtype=float)
 
-    """limits"""
+        def perWT(a):
+            """trailing axes for GR on the terms that vary with WT"""
+            return np.reshape(a, WT.shape + (1,) * GR.ndim)
 
-    x1 = sqrt(max(0, 1e4 - H**2))
-    x2 = sqrt(max(0, (150 * max(1, Y ** (1 / 3))) ** 2 - H**2))
-    y = sqrt(1e8 - H**2)
+        SR = (GR**2 + H**2) ** 0.5
+        SRo = AIR * SR
 
-    NSGLim = True
-    OTHLim = True
+        Dn = perWT(an) / SRo ** perWT(cn) * np.exp(perWT(bn) * SRo)
+        Dg = perWT(ag) / SRo ** perWT(cg) * np.exp(perWT(bg) * SRo ** perWT(dg))
 
-    if Y < 0.01 or Y > 25000:
-        NSGLim = False
-        OTHLim = False
+        SRx = np.sign(SR - 140) * abs(SR - 140) ** p + 140
+        Dff = 1.42e7 / SRx**0.9516 * np.exp(-(SRx**0.774) / 32.7)
 
-    if AIR < 0.6 or AIR > 1:
-        NSGLim = False
-        OTHLim = False
+        Cg = perWT(Cga) + np.exp(perWT(Cgb) + perWT(Cgc) * (1 - np.exp(4e-5 * SRo)))
+        Cf = 10 ** (Cf0 + (GR / 1000 - Cf1) * Cf2)
 
-    if H < 1.5 / AIR or H > 10000 / AIR:
-        NSGLim = False
-        OTHLim = False
+        He = np.where(
+            Y < 1,
+            1,
+            np.minimum(
+                AH * np.exp(BY * SR / 1000),
+                np.exp(SR * (-0.26 + 2.563 * AIR) / 1000),
+            ),
+        )
 
-    if GR < x1 / AIR or GR > y / AIR:
-        NSGLim = False
-    if GR < x2 / AIR or GR > y / AIR:
-        OTHLim = False
+        Cn = Cna + Cnb * np.exp(-Cnc * SRo**Cnd)
+
+        N = Dn * Cn * Y * AIR**2
+        SG = Dg * Cg * Y * AIR**2
+        FFG = Dff * Cf * He * Y * FF + np.zeros_like(N)  # to the shape of N
+        TD = N + SG + FFG
+        NtG = N / (SG + FFG)
+
+        fn = np.select(
+            (perWT(WT) == 10, perWT(WT) == 13),
+            (
+                np.exp(SR / 800) / 250,
+                np.exp(-SR / 234.7) / 20 + np.exp(-SR / 4329) / 25,
+            ),
+            0.015,
+        )
 
-    return (N, SG, NSGLim, FFG, TD, DS, NtG, OTHLim)
+        DS = FFG + SG + fn * N
+
+        inRange = np.broadcast_to(inLim, N.shape)
+        NSGLim = inRange & (GR >= x1 / AIR) & (GR <= y / AIR)
+        OTHLim = inRange & (GR >= x2 / AIR) & (GR <= y / AIR)
+
+        return tuple(v[()] for v in (N, SG, NSGLim, FFG, TD, DS, NtG, OTHLim))
+
+    return atGR
 
 
 def therm(Y, H, GR, VIS):
@@ -296,6 +336,46 @@ def therm(Y, H, GR, VIS):
     return 8e6 * F * Y / SR**2
 
 
+def thermBatch(Y, H, GR, VIS):
+    """
+    array version of therm, with Y, H, GR and VIS broadcast against each other.
+    The terms that only depend on yield, height and visibility are evaluated
+    on the broadcast shape of those, e.g. a fluence cube of shape
+    (visibility, height, range) is had from
+
+        thermBatch(Y, H[None, :, None], GR[None, None, :], VIS[:, None, None])
+
+    with A1 ... B2 evaluated per visibility and A3, B3 per height.
+    """
+    Y, H, GR, VIS = (np.asarray(v, dtype=float) for v in (Y, H, GR, VIS))
+
+    if np.any(H < 0):
+        raise ValueError(
+            "underground and surface burst are not yet considered for thermal models"
+        )
+
+    """per (Y, VIS)"""
+    HT = 4 * Y ** (1 / 3)
+    A1 = 0.32 * (1 - np.exp(-12 * Y ** (-VIS / 17e3)))
+    B1 = -np.log10(Y) ** 2 / 275 + 0.0186 * np.log10(Y) - 0.025
+    A2 = ((30 * Y**-0.26) ** 4 + 1350) ** (-1 / 4)
+    B2 = -(1.457 / VIS + 9.3e-6)
+
+    """per (Y, H, VIS)"""
+    A3 = H ** (3 / 2) / 5e7 + 97 / (281 + Y**0.5)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        B3 = np.where(H == 0, -1.112 / VIS, 0.139 / H * (np.exp(-8 * H / VIS) - 1))
+    w = np.minimum(H / HT, 1)  # weight of FA, 1 above HT
+
+    SR = (H**2 + GR**2) ** 0.5
+
+    FS = A1 * np.exp(B1 * SR) + A2 * np.exp(B2 * SR) + 0.006
+    FA = A3 * np.exp(B3 * SR)
+    F = FA * w + FS * (1 - w)
+
+    return (8e6 * F * Y / SR**2)[()]
+
+
 Mn = {
     1: "dry soil",
     2: "wet soil",
@@ -305,7 +385,140 @@ Mn = {
 }
 
 
-def crater(Y, H, M1, T1, M2, T2, M3, GR, HIGHRAD=False):
+"""crater fit coefficients per material: J, P, Q, R"""
+cJPQR = {
+    1: (4, 9.7, 0.103, -0.00143),
+    2: (1, 12.54, 0.029, -0.00078),
+    3: (5, 9.34, 0.131, -0.00231),
+    4: (2, 10.45, 0.089, -0.00134),
+    5: (8, 8.72, 0.1634, -1 / 370),
+}
+
+
+"""
+relative tolerance on the lower end, S2 = -3, of the dry soil fit above 20kT.
+S2 comes from an array power, which numpy does not always round correctly,
+and -3 is a common choice of scaled burst height.
+"""
+S2tol = 1e-14
+
+
+def _SV_batch(S2, H, M, small):
+    """
+    scaled apparent crater volume over arrays of scaled burst height S2, for
+    material M, with the coefficients at 1kT (small) or 20kT and above.
+    nan where cratering is insignificant.
+    """
+    J, P, Q, R = cJPQR[M]
+    SV = np.full(S2.shape, np.nan)
+
+    deep = S2 >= 5
+    s = S2[deep]
+    if M == 2:
+        SV[deep] = np.exp(P + Q * s + R * s**2) - 503**2 * np.exp(-s / 30)
+    else:
+        SV[deep] = np.exp(P + Q * s + R * s**2)
+
+    if M == 1 and not small:
+        lower = (-3 * (1 + S2tol) <= S2) & (S2 < 0)  # see S2tol
+        s = S2[lower]
+        SV[lower] = 354 * 10 ** (
+            0.506 * (np.exp(2.6 * s + 0.486 * s**2) - 1) + 2 * s / 9
+        )
+
+        upper = (0 <= S2) & (S2 < 5)
+        s = S2[upper]
+        SV[upper] = 354 * np.exp(
+            (1 - np.exp(-3.967 * s**1.139)) * (4.283 - 0.0515 * (5 - s) ** 2.068)
+        )
+        # below that, S2 < -3, cratering is insignificant and left as nan
+    else:
+        shallow = S2 < 5
+        s, above = S2[shallow], H[shallow] > 0
+        if small:
+            coeffs = zip((0.258, 0.01, 0.1, 1.9), (-1.05, -0.105, 0.0573, -0.5))
+            L = 16989
+        else:
+            coeffs = zip((0.53, 0.028, -1 / 46, 1.74), (-2, -0.3044, 0.0707, -0.9059))
+            L = 5663
+        F, G, D, K = (np.where(above, a, b) for a, b in coeffs)
+
+        SV[shallow] = L / J * 10 ** (K * (np.exp(F * s + G * s**2) - 1) + D * s)
+
+    return SV
+
+
+def _V_batch(Y, H, M, HIGHRAD=False):
+    """
+    apparent crater volume in a uniform material M, over arrays of yield Y and
+    burst height H (negative for depth of burst), which is not checked
+    against the height above which cratering is insignificant.
+
+    returns:
+        V : volume, m^3, nan where cratering is insignificant
+        S2: scaled burst height, the fit being good for S2 < 40
+    """
+    Y, H = np.broadcast_arrays(np.asarray(Y, dtype=float), np.asarray(H, dtype=float))
+
+    S1 = -H / Y ** (1 / 3)
+    with np.errstate(over="ignore"):
+        alpha1 = np.select(
+            (S1 < 0.15, S1 < 5),
+            (1 / 3, 0.2946 + np.exp(-S1 * log10(583)) / sqrt(305)),
+            1 / 3.4,
+        )
+        if M == 1:
+            alpha20 = np.select(
+                (S1 < 0, S1 < 5),
+                (1 / 3.1, 1 / (3.4 - 0.3 * np.exp(-2.2 * S1))),
+                1 / 3.4,
+            )
+        else:
+            alpha20 = np.full(S1.shape, 1 / 3.4)
+
+    if HIGHRAD:
+        g = 0
+    else:
+        g = 1 - np.clip(np.log(Y) / log(20), 0, 1)
+
+    alpha = np.where(Y > 20, alpha20, alpha20 + g * (alpha1 - alpha20))
+
+    S2 = -H / Y**alpha
+
+    SV20 = _SV_batch(S2, H, M, False)
+    SV1 = _SV_batch(S2, H, M, True)
+    # above 20kT, g is 0. Both branches are evaluated, nan where insignificant
+    with np.errstate(divide="ignore", invalid="ignore"):
+        V = np.where(Y > 20, SV20, SV20 * (SV1 / SV20) ** g) * Y ** (3 * alpha)
+
+    return V[()], S2[()]
+
+
+@lru_cache(maxsize=4096)
+def _V(Y, H, M, HIGHRAD=False):
+    """scalar _V_batch, cached per (Y, H, M, HIGHRAD)"""
+    V, S2 = _V_batch(Y, H, M, HIGHRAD)
+    if isnan(V):
+        raise ValueError("cratering is insignificant")
+    return V, S2
+
+
+def _hat_batch(VU, VL, T):
+    """
+    apparent crater volume of an upper layer of thickness T, with crater volume
+    VU in its material, over a lower layer with crater volume VL, and the
+    fraction r of the volume that is excavated from the lower layer.
+    nan where either volume is negative, i.e. beyond the depth of the fit.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Vi = (VU * VL) ** 0.5
+        for _ in range(5):
+            Vi = (VL - VU) * np.exp(-5.4 * T / Vi ** (1 / 3)) + VU
+        r = 1 - np.exp(-5.4 * T / Vi ** (1 / 3))
+    return Vi, r
+
+
+def _checkLayers(M1, T1, M2, T2, M3):
     if isinstance(M1, int) and 0 < M1 < 6:
         pass
     else:
@@ -319,119 +532,54 @@ def crater(Y, H, M1, T1, M2, T2, M3, GR, HIGHRAD=False):
     else:
         raise ValueError("invalid material code for layer 3")
 
-    if T1 < 0:
+    if np.any(np.asarray(T1) < 0):
         raise ValueError("invalid thickness for layer 1")
-    if T2 < 0:
+    if np.any(np.asarray(T2) < 0):
         raise ValueError("invalid thickness for layer 2")
 
-    if H > 3 * Y ** (1 / 3):
-        raise ValueError("cratering is insignificant")
 
-    isWithinLimit = True
+def crater(Y, H, M1, T1, M2, T2, M3, GR, HIGHRAD=False):
+    VA, CR, CD, isWithinLimit, ejecta = craterBurst(
+        Y, H, M1, T1, M2, T2, M3, HIGHRAD
+    )
 
-    S1 = -H / Y ** (1 / 3)
-    if -3 <= S1 < 0.15:
-        alpha1 = 1 / 3
-    elif 0.15 <= S1 < 5:
-        alpha1 = 0.2946 + exp(-S1 * log10(583)) / sqrt(305)
-    elif S1 >= 5:
-        alpha1 = 1 / 3.4
-
-    def V(M):
-        if M == 1:
-            if -3 <= S1 < 0:
-                alpha20 = 1 / 3.1
-            elif 0 <= S1 < 5:
-                alpha20 = 1 / (3.4 - 0.3 * exp(-2.2 * S1))
-            elif S1 >= 5:
-                alpha20 = 1 / 3.4
-        else:
-            alpha20 = 1 / 3.4
+    if GR is not None:
+        EJ, reliable = ejecta(GR)
+    else:
+        EJ = None
+        reliable = False
 
-        if Y > 20:
-            alpha = alpha20
-        else:
-            if HIGHRAD:
-                g = 0
-            else:
-                g = 1 - clamp(log(Y, 20), 0, 1)
+    return VA, CR, CD, isWithinLimit, EJ, reliable
 
-            alpha = alpha20 + g * (alpha1 - alpha20)
 
-        S2 = -H / Y**alpha
+def craterBurst(Y, H, M1, T1, M2, T2, M3, HIGHRAD=False):
+    """
+    crater of one burst, see crater(), keeping the crater volume in each layer
+    (VM1, VM2, VM3) and the fraction excavated from each (r1, r2, r3) for the
+    ejecta, which can then be had over any array of ground range:
 
-        if M == 1:
-            J = 4
-            P, Q, R = 9.7, 0.103, -0.00143
-        elif M == 2:
-            J = 1
-            P, Q, R = 12.54, 0.029, -0.00078
-        elif M == 3:
-            J = 5
-            P, Q, R = 9.34, 0.131, -0.00231
-        elif M == 4:
-            J = 2
-            P, Q, R = 10.45, 0.089, -0.00134
-        elif M == 5:
-            J = 8
-            P, Q, R = 8.72, 0.1634, -1 / 370
-
-        def SV(y):
-
-            if S2 >= 5:
-                if M == 2:
-                    S = 503**2 * exp(-S2 / 30)
-                else:
-                    S = 0
-                if S2 >= 40:
-                    isWithinLimit = False
-
-                SV = exp(P + Q * S2 + R * S2**2) - S
-            else:
-                if M == 1 and y >= 20:
-                    if -3 <= S2 < 0:
-                        SV = 354 * 10 ** (
-                            0.506 * (exp(2.6 * S2 + 0.486 * S2**2) - 1) + 2 * S2 / 9
-                        )
-
-                    elif 0 <= S2 < 5:
-                        SV = 354 * exp(
-                            (1 - exp(-3.967 * S2**1.139))
-                            * (4.283 - 0.0515 * (5 - S2) ** 2.068)
-                        )
-                    elif S2 < -3:
-                        raise ValueError("cratering is insignificant")
-                else:
-                    if y <= 1 and H <= 0:
-                        F, G, D, K, L = -1.05, -0.105, 0.0573, -0.5, 16989
-                    elif y <= 1 and H > 0:
-                        F, G, D, K, L = 0.258, 0.01, 0.1, 1.9, 16989
-                    elif y >= 20 and H <= 0:
-                        F, G, D, K, L = -2, -0.3044, 0.0707, -0.9059, 5663
-                    elif y >= 20 and H > 0:
-                        F, G, D, K, L = 0.53, 0.028, -1 / 46, 1.74, 5663
-
-                    SV = L / J * 10 ** (K * (exp(F * S2 + G * S2**2) - 1) + D * S2)
-
-            return SV
-
-        if Y > 20:
-            return SV(Y) * Y ** (3 * alpha)
-        # or Y < 1
-        else:
-            return SV(20) * (SV(1) / SV(20)) ** g * Y ** (3 * alpha)
+        VA, CR, CD, isWithinLimit, ejecta = craterBurst(...)
+        EJ, reliable = ejecta(GR)
 
-    VM1, VM2, VM3 = V(M1), V(M2), V(M3)
+    e.g. with GR = np.hypot(*np.meshgrid(x, y)) over a grid around ground
+    zero.
+    """
+    _checkLayers(M1, T1, M2, T2, M3)
 
-    def hat(VU, VL, T):
-        Vi = sqrt(VU * VL)
-        for _ in range(5):
-            Vi = (VL - VU) * exp(-5.4 * T / Vi ** (1 / 3)) + VU
-        r = 1 - exp(-5.4 * T / Vi ** (1 / 3))
-        return Vi, r
+    if H > 3 * Y ** (1 / 3):
+        raise ValueError("cratering is insignificant")
+
+    isWithinLimit = True
+
+    (VM1, S21), (VM2, S22), (VM3, S23) = (_V(Y, H, M, HIGHRAD) for M in (M1, M2, M3))
+
+    if max(S21, S22, S23) >= 40:
+        isWithinLimit = False
 
-    VA, ra = hat(VM2, VM3, T2)
-    VA, rb = hat(VM1, VA, T1)
+    VA, ra = _hat_batch(VM2, VM3, T2)
+    VA, rb = _hat_batch(VM1, VA, T1)
+    if isnan(VA):
+        raise ValueError("cratering is insignificant")
 
     r3 = ra * rb
     r2 = rb - r3
@@ -440,22 +588,14 @@ def crater(Y, H, M1, T1, M2, T2, M3, GR, HIGHRAD=False):
     CR = 1.2 * VA ** (1 / 3)
     CD = 0.5 * VA ** (1 / 3)
 
-    if GR is not None:
-
-        if GR > 10000 or GR < 1.8 * CR:
-            reliable = False
+    # stacking of ejecta
+    EJ0 = 0
+    for M, V, r in zip((M1, M2, M3), (VM1, VM2, VM3), (r1, r2, r3)):
+        if M == 1 or M == 2:
+            k = 0.9
         else:
-            reliable = True
-        EJ = 0
-        for M, V, r in zip((M1, M2, M3), (VM1, VM2, VM3), (r1, r2, r3)):
-            if M == 1 or M == 2:
-                k = 0.9
-            else:
-                k = 1.17
-            EJ += r * k * V**1.62 * GR**-3.86  # stacking of ejecta
-    else:
-        EJ = None
-        reliable = False
+            k = 1.17
+        EJ0 += r * k * V**1.62
 
     if Y < 0.1 or Y > 25000:
         isWithinLimit = False
@@ -466,22 +606,174 @@ def crater(Y, H, M1, T1, M2, T2, M3, GR, HIGHRAD=False):
     if T2 > 1000:
         isWithinLimit = False
 
-    return VA, CR, CD, isWithinLimit, EJ, reliable
+    def ejecta(GR):
+        """ejecta thickness EJ, m, and whether GR is within the fit"""
+        GR = np.asarray(GR, dtype=float)
+        with np.errstate(divide="ignore"):
+            EJ = EJ0 * GR**-3.86
+        reliable = (GR <= 10000) & (GR >= 1.8 * CR)
+        return EJ[()], reliable[()]
+
+    return VA, CR, CD, isWithinLimit, ejecta
+
+
+def _crater_batch(Y, H, T1, T2, VM1, VM2, VM3, S2):
+    """
+    VA, CR, CD and isWithinLimit of craterBatch, from the crater volume in
+    the material of each layer and the largest scaled burst height S2
+    """
+    VA, _ = _hat_batch(VM2, VM3, T2)
+    VA, _ = _hat_batch(VM1, VA, T1)
+    VA = np.where(H > 3 * Y ** (1 / 3), np.nan, VA)  # cratering is insignificant
+
+    CR = 1.2 * VA ** (1 / 3)
+    CD = 0.5 * VA ** (1 / 3)
+
+    isWithinLimit = (
+        (S2 < 40)
+        & (0.1 <= Y)
+        & (Y <= 25000)
+        & (H >= -40 * Y ** (1 / 3))
+        & (T1 <= 1000)
+        & (T2 <= 1000)
+    )
+
+    return VA[()], CR[()], CD[()], isWithinLimit[()]
+
+
+def craterBatch(Y, H, M1, T1, M2, T2, M3, HIGHRAD=False):
+    """
+    array version of crater, over yield Y, burst height H and layer thickness
+    T1, T2 broadcast against each other, for one stack of materials M1, M2, M3.
+    The crater volume of each distinct material is evaluated once over the
+    whole array.
+
+    returns VA, CR, CD, isWithinLimit as in crater(), with VA, CR and CD nan
+    where cratering is insignificant.
+    """
+    _checkLayers(M1, T1, M2, T2, M3)
+
+    Y, H, T1, T2 = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (Y, H, T1, T2))
+    )
+
+    VS = {M: _V_batch(Y, H, M, HIGHRAD) for M in set((M1, M2, M3))}
+    (VM1, S21), (VM2, S22), (VM3, S23) = (VS[M] for M in (M1, M2, M3))
+
+    return _crater_batch(
+        Y, H, T1, T2, VM1, VM2, VM3, np.maximum(np.maximum(S21, S22), S23)
+    )
+
+
+def craterRaster(Y, H, M1, T1, M2, T2, M3, HIGHRAD=False):
+    """
+    crater over a raster of layered geology, i.e. craterBatch with the material
+    codes M1, M2, M3 also given per cell, broadcast against the rest.
+
+    The crater volume depends on the material of one layer at a time, so it
+    is evaluated once per material rather than per cell or per combination
+    of materials: for a single burst (Y and H scalar) into a table looked up
+    per cell, otherwise over the cells having that material in any layer.
+
+    returns VA, CR, CD, isWithinLimit rasters, see craterBatch.
+    """
+    Y, H, T1, T2 = (np.asarray(v, dtype=float) for v in (Y, H, T1, T2))
+    M1, M2, M3 = (np.asarray(M) for M in (M1, M2, M3))
+
+    for i, M in enumerate((M1, M2, M3), start=1):
+        if M.dtype.kind in "iu" and np.all((M > 0) & (M < 6)):
+            pass
+        else:
+            raise ValueError("invalid material code for layer {}".format(i))
+
+    if np.any(T1 < 0):
+        raise ValueError("invalid thickness for layer 1")
+    if np.any(T2 < 0):
+        raise ValueError("invalid thickness for layer 2")
+
+    single = Y.ndim == 0 and H.ndim == 0  # one burst over the raster
+
+    Y, H, T1, T2, M1, M2, M3 = np.broadcast_arrays(Y, H, T1, T2, M1, M2, M3)
+
+    layers = np.stack((M1, M2, M3))
+    VM = np.empty(layers.shape)
+    S2 = np.empty(layers.shape)
+
+    if single:
+        # tables indexed by material code, looked up per cell
+        VS = np.full((2, 6), np.nan)
+        for M in np.unique(layers):
+            VS[:, M] = _V_batch(Y.flat[0], H.flat[0], int(M), HIGHRAD)
+
+        VM, S2 = VS[0][layers], VS[1][layers]
+
+    else:
+        for M in np.unique(layers):
+            inLayer = layers == M
+            cells = np.any(inLayer, axis=0)
+            V, S = _V_batch(Y[cells], H[cells], int(M), HIGHRAD)
+            for k in range(3):
+                VM[k][inLayer[k]] = V[inLayer[k][cells]]
+                S2[k][inLayer[k]] = S[inLayer[k][cells]]
+
+    return _crater_batch(Y, H, T1, T2, *VM, np.max(S2, axis=0))
 
 
 def fallout(Y, H, DW, CW, W, SY, FF, T, TI, TEXP):
+    return falloutBurst(Y, H, W, SY, FF)(DW, CW, T, TI, TEXP)
+
+
+def _phi_batch(z):
+    """phi() over arrays"""
+    return np.exp(-(z**2) / 2) / sqrt(2 * pi)
+
+
+def _rateDecay(T):
+    """dose rate at time T (h) per unit one hour dose rate, i.e. t^-1.2 decay"""
+    return T ** (-1.2)
+
+
+def _doseDecay(TI, TEXP):
+    """dose over an exposure from TI lasting TEXP (h), per unit one hour dose rate"""
+    return 5 * (TI**-0.2 - (TI + TEXP) ** -0.2)
+
+
+def _timeWithinLimit(T, TI, TEXP):
+    return (
+        (0.1 <= T)
+        & (T <= 5000)
+        & (0.1 <= TI)
+        & (TI <= 5000)
+        & (0 <= TEXP)
+        & (TEXP <= 5000 - TI)
+    )
+
+
+def falloutBurst(Y, H, W, SY, FF):
+    """
+    per-burst context for fallout: the cloud and wind terms, which depend only
+    on the burst and the wind (Y, H, W, SY, FF), are computed once, and the
+    returned function atDWCW evaluates the fallout over arrays of downwind and
+    crosswind range, as well as of the times, broadcast against each other:
+
+        atDWCW(DW, CW, T, TI, TEXP) -> (DHP1, DT, T0, MBD, FD, withinLimit)
+
+    with the same meaning as the return of fallout().
+
+    Only the crosswind transport function F1 depends on the crosswind range,
+    so the rest is evaluated on the shape of DW alone, and F1 applied as a
+    broadcast Gaussian on top. With grid=True, DW and CW are taken as the
+    axes of a grid of shape DW.shape + CW.shape, e.g. for a footprint map,
+    costing one evaluation per downwind row plus one exp() per cell.
+    """
     if H < 0:
         raise ValueError("invalid burst height")
-    if DW < 0 or CW < 0:
-        raise ValueError("invalid wind ground range")
     if W < 0:
         raise ValueError("invalid wind speed")
     if SY < 0:
         raise ValueError("invalid crosswind shear")
     if FF < 0 or FF > 1:
         raise ValueError("impossible fission fraction")
-    if T <= 0 or TI <= 0 or TEXP <= 0:
-        raise ValueError("invalid time")
 
     Hhat = H / 0.3048
 
@@ -521,52 +813,103 @@ def fallout(Y, H, DW, CW, W, SY, FF, T, TI, TEXP):
     L = sqrt(L0**2 + 2 * sigmax**2)
     # constant for symmetry
     N = (L0**2 + sigmax**2) / (L0**2 + 0.5 * sigmax**2)
-    # downwind distance
-    d = DW / 1853
-    c = CW / 1853
     # area reduction
     alpha1 = (1 + 0.001 * h0 * W / sigma0) ** (-1)
-    alpha2 = (1 + 0.001 * h0 * W / sigma0 * (1 - phi(2 * d / W))) ** (-1)
-    # crosswind spread parameter:
+    # crosswind spread parameter
     P = SY * Ti * sigmah / L
-    Q = abs(d + 2 * sigmax) / L
-    R = min(4, 1 + 8 * Q)
-    sigmay = sqrt(sigma0**2 * R + 2 * (P * sigmax) ** 2 + (P * Q * L0) ** 2)
-    # crosswind transport function:
-    F1 = exp(-((c / (alpha2 * sigmay)) ** 2) / 2) / (sigmay * sqrt(2 * pi))
-    # downwind transport function
-    F2 = phi(L0 * d / (L * alpha1 * sigmax))
-    # deposition function
-    F3 = exp(-abs(d / L) ** N) / (L * gamma(1 + 1 / N))
-    F = F1 * F2 * F3
-    # one hour dose rate
-    DHP1 = 1510 * Y * FF * AF * F
-    # debris arrival time
-    T0 = sqrt(
-        0.25 + ((L0 * Q * Ti) ** 2 + 2 * sigmax**2) / (L0**2 + 0.5 * sigmax**2)
+
+    burstWithinLimit = (1 <= W <= 40) and (0 <= SY <= 10)
+
+    def atDWCW(DW, CW, T, TI, TEXP, grid=False):
+        DW, CW, T, TI, TEXP = (
+            np.asarray(v, dtype=float) for v in (DW, CW, T, TI, TEXP)
+        )
+
+        if np.any(DW < 0) or np.any(CW < 0):
+            raise ValueError("invalid wind ground range")
+        if np.any(T <= 0) or np.any(TI <= 0) or np.any(TEXP <= 0):
+            raise ValueError("invalid time")
+
+        if grid:
+            DW = np.reshape(DW, DW.shape + (1,) * CW.ndim)
+
+        # downwind distance
+        d = DW / 1853
+        c = CW / 1853
+
+        """terms of the downwind distance only"""
+        alpha2 = (1 + 0.001 * h0 * W / sigma0 * (1 - _phi_batch(2 * d / W))) ** (-1)
+        Q = abs(d + 2 * sigmax) / L
+        R = np.minimum(4, 1 + 8 * Q)
+        sigmay = (sigma0**2 * R + 2 * (P * sigmax) ** 2 + (P * Q * L0) ** 2) ** 0.5
+        # downwind transport function
+        F2 = _phi_batch(L0 * d / (L * alpha1 * sigmax))
+        # deposition function
+        F3 = np.exp(-abs(d / L) ** N) / (L * gamma(1 + 1 / N))
+        # debris arrival time
+        T0 = (
+            0.25 + ((L0 * Q * Ti) ** 2 + 2 * sigmax**2) / (L0**2 + 0.5 * sigmax**2)
+        ) ** 0.5
+        z0 = np.log(T0)
+
+        # one hour dose rate on the centerline, i.e. with F1 at c = 0
+        DHP1c = 1510 * Y * FF * AF / (sigmay * sqrt(2 * pi)) * F2 * F3
+
+        """crosswind transport function, relative to the centerline"""
+        F1c = np.exp(-((c / (alpha2 * sigmay)) ** 2) / 2)
+
+        # one hour dose rate
+        DHP1 = DHP1c * F1c
+        MBD = DHP1 * (2.737 - 0.7809 * z0 + 2 * z0**2 / 29 - z0**3 / 617)
+        DT = DHP1 * _rateDecay(T)
+        FD = DHP1 * _doseDecay(TI, TEXP)
+
+        withinLimit = (
+            burstWithinLimit
+            & (DW <= 1e6)
+            & (CW <= 4e4)
+            & _timeWithinLimit(T, TI, TEXP)
+        )
+
+        return tuple(
+            v[()] for v in np.broadcast_arrays(DHP1, DT, T0, MBD, FD, withinLimit)
+        )
+
+    return atDWCW
+
+
+def falloutSchedule(DHP1, T, TI, TEXP):
+    """
+    dose rate and dose for many exposure schedules at once, from a field of
+    one hour dose rates DHP1 as returned by falloutBurst, without evaluating
+    the transport functions again.
+
+    input:
+        DHP1: array of one hour dose rate, of any shape (cells)
+        T   : time for the dose rate, h
+        TI  : time of entry, h
+        TEXP: exposure duration, h
+        (arrays, or anything broadcastable into the same shape (schedules))
+
+    returns, as tables of shape cells + schedules:
+        DT: dose rate at T
+        FD: dose from TI to TI + TEXP
+        withinLimit: of shape schedules, whether the times are within the
+            limits of the model
+    """
+    DHP1 = np.asarray(DHP1, dtype=float)
+    T, TI, TEXP = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (T, TI, TEXP))
     )
-    z0 = log(T0)
-    MBD = DHP1 * (2.737 - 0.7809 * z0 + 2 * z0**2 / 29 - z0**3 / 617)
-    DT = DHP1 * T ** (-1.2)
-    FD = 5 * DHP1 * (TI**-0.2 - (TI + TEXP) ** -0.2)
-
-    withinLimit = True
-    if DW > 1e6:
-        withinLimit = False
-    if CW > 4e4:
-        withinLimit = False
-    if W < 1 or W > 40:
-        withinLimit = False
-    if SY < 0 or SY > 10:
-        withinLimit = False
-    if T < 0.1 or T > 5000:
-        withinLimit = False
-    if TI < 0.1 or TI > 5000:
-        withinLimit = False
-    if TEXP < 0 or TEXP > 5000 - TI:
-        withinLimit = False
-
-    return DHP1, DT, T0, MBD, FD, withinLimit
+
+    if np.any(T <= 0) or np.any(TI <= 0) or np.any(TEXP <= 0):
+        raise ValueError("invalid time")
+
+    DHP1 = np.reshape(DHP1, DHP1.shape + (1,) * T.ndim)
+    DT = DHP1 * _rateDecay(T)
+    FD = DHP1 * _doseDecay(TI, TEXP)
+
+    return DT[()], FD[()], _timeWithinLimit(T, TI, TEXP)[()]
 
 
 if __name__ == "__main__":
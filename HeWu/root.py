@@ -0,0 +1,58 @@
+import numpy as np
+
+
+def bisect(f, l, u, tol=1e-6, it=100):
+    """
+    Vectorized bisection, solving f(x) = 0 for a whole array of brackets at
+    once.
+
+    f: function, mapping an array of x to an array of f(x) of the same shape
+    l: lower limit(s) of the bracket
+    u: upper limit(s) of the bracket
+    tol: tolerance, see below
+    it: maximum number of halvings
+
+    The bracket [l, u] is halved every iteration, keeping the half in which f
+    changes sign. All elements are advanced together, which means f is always
+    called on the full array: this trades a few superfluous function calls for
+    having all of the work done in array operations.
+
+    Like intg, the tolerance is taken to be relative to the magnitude of the
+    solution, with the floor at tol to handle solutions very close to 0:
+
+    |u - l| < tol * (|(u + l) / 2| + tol)
+
+    the iteration stops once every element satisfies the above, or when the
+    maximum number of iterations has been reached.
+
+    returns the array of x, which is nan for elements where f(l) and f(u) are
+    of the same sign, i.e. no root has been bracketed.
+    """
+    l, u = np.broadcast_arrays(
+        np.asarray(l, dtype=float), np.asarray(u, dtype=float)
+    )
+    l, u = l.copy(), u.copy()
+
+    fl = f(l)
+    fu = f(u)
+    bracketed = np.sign(fl) * np.sign(fu) <= 0
+
+    for _ in range(it):
+        m = 0.5 * (l + u)
+        fm = f(m)
+
+        right = np.sign(fm) == np.sign(fl)  # root lies in [m, u]
+        l = np.where(right, m, l)
+        fl = np.where(right, fm, fl)
+        u = np.where(right, u, m)
+
+        if np.all(abs(u - l) < tol * (abs(0.5 * (u + l)) + tol)):
+            break
+
+    return np.where(bracketed, 0.5 * (l + u), np.nan)
+
+
+if __name__ == "__main__":
+    # cube roots of an array, and nan where the root is not bracketed
+    a = np.array((0.5, 1, 8, 27, 2e3))
+    print(bisect(lambda x: x**3 - a, 0, 10, tol=1e-12), a ** (1 / 3))
@@ -0,0 +1,131 @@
+"""
+Zhai Jinpeng, 翟锦鹏, 2023
+Contact: 914962409@qq.com
+
+exposure timeline of targets to a burst, merging the effects models into one
+time-sorted stream of events per target:
+
+    thermal fluence       : modelWE1984.therm, at detonation
+    initial radiation dose: modelWE1984.iniRad, at detonation
+    blast arrival         : modelBrode1987Airburst.airburst, time of arrival
+    blast positive phase  : end of the overpressure positive phase
+    fallout arrival       : modelWE1984.fallout, debris arrival time T0
+    fallout dose          : dose accumulated since arrival, at each of a list
+                            of times
+
+The targets are given on a map, as coordinates x (east) and y (north), and
+their range and bearing from ground zero are computed once and shared by all
+models: the ground range by the prompt effects, and its rotation into the
+wind by the fallout, see footprint.py. The slant range is not shared: the
+prompt models take ground range and height of burst, forming the slant range
+from them themselves, and Brode 1987 needs the two apart for the Mach
+reflection.
+"""
+
+import numpy as np
+
+from HeWu.modelWE1984 import thermBatch, iniRadBurst, falloutBurst, _doseDecay
+from HeWu.modelBrode1987Airburst import airburstBatch
+from HeWu.footprint import _polar, _toBurstFrame
+from HeWu.route import _localField
+
+"""names of the kinds of event, and units of the value reported with each"""
+events = (
+    "thermal fluence",
+    "initial radiation dose",
+    "blast arrival",
+    "blast positive phase end",
+    "fallout arrival",
+    "fallout dose",
+)
+units = ("cal/cm^2", "rad", "Pa", "Pa-s", "rad/h", "rad")
+
+
+def timeline(
+    x, y, Y, H, AIR, FF, WT, VIS, W, SY, direction, T=(1, 24, 168), X0=0, Y0=0
+):
+    """
+    time-sorted events at each target, see above.
+
+    input:
+        x, y: arrays of the coordinates of the targets, east and north, meter
+        Y  : yield, kT
+        H  : height of burst, m
+        AIR: air density ratio to sea level, for the initial radiation
+        FF : fission fraction
+        WT : weapon type, an integer 1-13, see modelWE1984.iniRad
+        VIS: visibility, m
+        W  : effective wind speed, knots
+        SY : crosswind shear
+        direction: direction the wind blows toward, degree clockwise from
+            north
+        T  : times at which the accumulated fallout dose is reported, h
+        X0, Y0: coordinates of ground zero, meter
+
+    returns, as arrays of shape targets + (events,), sorted by time along the
+    last axis:
+        times : time of the event, s after burst, inf for fallout that never
+            arrives and nan where the model has no answer
+        kinds : index of the kind of event into events
+        values: value of the event, see events and units:
+            thermal fluence: fluence
+            initial radiation dose: total dose
+            blast arrival: peak overpressure
+            blast positive phase end: overpressure positive phase impulse
+            fallout arrival: one hour dose rate
+            fallout dose: dose accumulated from arrival to the time of the
+                event, 0 before arrival
+    """
+    r, theta = _polar(
+        np.asarray(x, dtype=float) - X0, np.asarray(y, dtype=float) - Y0
+    )
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+
+    """prompt effects"""
+    Q = thermBatch(Y, H, r, VIS)
+    _, _, _, _, TD, _, _, _ = iniRadBurst(Y, AIR, H, FF, WT)(r)
+    TAAIR, PAAIR, DPP, IPEST, _, _, _, _ = airburstBatch(r, H, Y)
+
+    """fallout"""
+    burst = falloutBurst(Y, H, W, SY, FF)
+    DHP1, T0 = _localField(burst, *_toBurstFrame(r, theta, direction))
+
+    T0_ = T0[..., None]
+    with np.errstate(invalid="ignore"):
+        FD = np.where(T > T0_, DHP1[..., None] * _doseDecay(T0_, T - T0_), 0)
+
+    zero = np.zeros(r.shape)
+    times = np.concatenate(
+        (
+            np.stack((zero, zero, TAAIR, TAAIR + DPP, T0 * 3600), axis=-1),
+            np.broadcast_to(T * 3600, FD.shape),
+        ),
+        axis=-1,
+    )
+    values = np.concatenate(
+        (np.stack((Q, TD, PAAIR, IPEST, DHP1), axis=-1), FD), axis=-1
+    )
+    kinds = np.broadcast_to(
+        np.concatenate((np.arange(5), np.full(T.shape, 5))), times.shape
+    )
+
+    order = np.argsort(times, axis=-1, kind="stable")
+
+    return tuple(
+        np.take_along_axis(v, order, axis=-1) for v in (times, kinds, values)
+    )
+
+
+if __name__ == "__main__":
+    x = np.array((500, 1500, -1500, 3000))
+    y = np.array((0, 1500, 0, 0))
+
+    times, kinds, values = timeline(
+        x, y, 100, 10, 0.975, 0.5, 1, 20000, 15, 0.3, 90, T=(1, 24)
+    )
+    for i in range(len(x)):
+        print("target at ({}, {})".format(x[i], y[i]))
+        for t, k, v in zip(times[i], kinds[i], values[i]):
+            print(
+                "  {:>12.4g} s {:<26}{:>12.4g} {}".format(t, events[k], v, units[k])
+            )
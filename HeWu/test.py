@@ -11,6 +11,9 @@ Harold L. Brode, July 1987
 Technical Report
 CONTRACT No. DNA 001-85-C-0089  
 
+As well as runners checking the array (batch) evaluators against their
+scalar counterparts, and the solvers of inverse.py round trip, printing the
+largest relative deviation found, see runBatchTest.
 """
 
 
@@ -126,6 +129,8 @@ fatest = (
 )
 
 
+import numpy as np
+
 from HeWu.uc import _uc_ft2m, _uc_m2ft, _uc_psi2pa, _uc_pa2psi
 from random import randint
 
@@ -288,3 +293,1109 @@ def runFAtest(freeair_from_r):
                 "", "", "", "", "", "", "", ""
             )
         )
+
+
+def _deviation(ref, calc, absolute=False):
+    """
+    largest relative deviation of calc from ref, taken as absolute where ref
+    is 0, or throughout if absolute, e.g. for values that are themselves
+    relative. Points that are equal, e.g. both inf, or nan (or None) in both
+    count as agreeing, and nan in only one of the two as inf. Booleans count as
+    1 where they differ.
+    """
+    ref = np.array([np.nan if v is None else v for v in np.ravel(ref)], float)
+    calc = np.ravel(np.asarray(calc, dtype=float))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = np.where(
+            absolute | (ref == 0), abs(calc - ref), abs(calc - ref) / abs(ref)
+        )
+    delta = np.where((calc == ref) | np.isnan(ref) & np.isnan(calc), 0, delta)
+    delta = np.where(np.isnan(ref) ^ np.isnan(calc), np.inf, delta)
+    return delta.max(initial=0)
+
+
+def _printHeader(name):
+    print("{:-^40}".format(" {} ".format(name)))
+
+
+def _printDeviation(name, delta):
+    print("{:^24}:{:^15.3g}".format(name, delta))
+
+
+def runBatchTest(name, scalar, batch, points, outputs):
+    """
+    runs an array evaluator against its scalar counterpart
+
+    Arguments:
+    - name: printed as the header
+    - function scalar takes the inputs of one point and returns a tuple of
+      outputs
+    - function batch takes the inputs of all points as arrays and returns a
+      tuple of arrays of the same outputs
+    - points: tuple of arrays of the inputs, one entry per point
+    - outputs: names of the outputs, printed with their largest deviation
+    """
+    calc = batch(*points)
+    ref = list(zip(*(scalar(*point) for point in zip(*points))))
+
+    _printHeader("{} ({} points)".format(name, len(points[0])))
+    for output, r, c in zip(outputs, ref, calc):
+        _printDeviation(output, _deviation(r, c))
+
+
+def _pick(values, *i):
+    return tuple(values[j] for j in i)
+
+
+def _abPoints(W=(1, 20, 400, 8000, 25000)):
+    """
+    the test cases for airburst at each of the yields, as arrays of ground
+    range (m), height of burst (m), time after arrival (s) and yield (kT)
+    """
+    X, Y, sigma_tau, _ = (np.tile(a, len(W)) for a in np.array(abtests).T)
+    W = np.repeat(np.asarray(W, dtype=float), len(abtests))
+    m = W ** (1 / 3)
+    return _uc_ft2m(X * m), _uc_ft2m(Y * m), sigma_tau * m / 1000, W
+
+
+"""targets for the yield solvers, ground range and height of burst in meter"""
+_yieldTargets = (
+    np.array((300, 1000, 3000, 1000, 3000, 10000)),
+    np.array((0, 0, 0, 500, 500, 2000)),
+)
+
+
+def runYieldTest():
+    """
+    runs the yield solvers of inverse.py round trip: the forward model at the
+    yield found should give back the effect solved for. Only points where the
+    yield was bisected count, i.e. neither clamped to Wmin nor unsolvable.
+    """
+    from HeWu import inverse
+    from HeWu.modelBrode1987Airburst import airburstBatch
+    from HeWu.modelWE1984 import thermBatch, iniRad
+
+    GR, H = _yieldTargets
+
+    def roundTrip(name, target, W, solvable, forward):
+        """forward takes the yield found and the mask of the points counted"""
+        found = solvable & (W > inverse.Wmin)
+        _printDeviation(
+            "{} ({}/{})".format(name, np.sum(found), found.size),
+            _deviation(target[found], forward(W[found], found)),
+        )
+
+    _printHeader("inverse yield round trips")
+
+    P = _uc_psi2pa(np.array((200, 50, 10, 30, 5, 1)))
+    roundTrip(
+        "yieldForOverpressure",
+        P,
+        *inverse.yieldForOverpressure(P, GR, H),
+        lambda w, at: airburstBatch(GR[at], H[at], w)[1],
+    )
+
+    Q = np.array((50, 20, 5, 20, 5, 1))
+    roundTrip(
+        "yieldForFluence",
+        Q,
+        *inverse.yieldForFluence(Q, H, GR, 20000),
+        lambda w, at: thermBatch(w, H[at], GR[at], 20000),
+    )
+
+    D = np.array((5000, 300, 50, 500, 100, 10))
+    WT = np.array((1, 1, 1, 7, 7, 13))
+    roundTrip(
+        "yieldForDose",
+        D,
+        *inverse.yieldForDose(D, 0.975, H, GR, 0.5, WT),
+        lambda w, at: [
+            iniRad(wi, 0.975, hi, gri, 0.5, wt)[4]
+            for wi, hi, gri, wt in zip(w, H[at], GR[at], WT[at])
+        ],
+    )
+
+
+def runFrontTest():
+    """
+    runs front_range of inverse.py round trip, through the time of arrival of
+    each model: at the range found, the front should arrive at the time given.
+    Yield and burst height are also given per time, against a single burst.
+    """
+    from HeWu import inverse
+
+    _printHeader("inverse front_range round trips")
+
+    t = np.geomspace(0.05, 20, 25)
+    W = np.resize((1, 100, 10000), t.shape)
+    H = np.resize((0, 300, 2000), t.shape)
+    for model, arrival in inverse._arrivals.items():
+        for w, h in zip(W[:3], H[:3]):
+            GR, _ = inverse.front_range(t, w, h, model)
+            reached = np.isfinite(GR)
+            _printDeviation(
+                "{} {:g} kT".format(model, w),
+                _deviation(t[reached], arrival(GR[reached], h, w)),
+            )
+
+        GR, _ = inverse.front_range(t, W, H, model)
+        reached = np.isfinite(GR)
+        _printDeviation(
+            "{} per point".format(model),
+            _deviation(t[reached], arrival(GR[reached], H[reached], W[reached])),
+        )
+
+
+def runFramesTest():
+    """
+    runs airburstFrames of the Brode 1987 model against airburst(t=...), over
+    the airburst test cases at a range of yields, each at its own time.
+    """
+    from HeWu import modelBrode1987Airburst as Brode1987
+
+    GR, H, t, W = _abPoints()
+
+    def frames(gr, h, w, tpart):
+        """one frame at the time of each test case, picked at its own point"""
+        TAAIR, _, _, _, _, _, _, _ = Brode1987.airburstBatch(gr, h, w)
+        P = np.empty(gr.shape)
+        for i, frame in enumerate(Brode1987.airburstFrames(gr, h, w, TAAIR + tpart)):
+            P[i] = frame[i]
+        return (P,)
+
+    runBatchTest(
+        "Brode1987 airburstFrames",
+        lambda gr, h, w, tpart: (Brode1987.airburst(gr, h, w, tpart, False)[5],),
+        frames,
+        (GR, H, W, t),
+        ("PPART",),
+    )
+
+
+def runAWG1980Test():
+    """
+    runs the region-partitioned peak overpressure of the AWG 1980 model, and
+    the horizontal dynamic pressure from it, against the scalar versions, over
+    a grid spanning the three regions and the airburst test cases.
+    """
+    from HeWu import modelAWG1980 as AWG1980
+
+    X, Y, _, _ = np.array(abtests).T
+    x, y = np.meshgrid(np.geomspace(0.01, 10, 30), np.linspace(0, 2, 11))
+    x = np.concatenate((x.ravel(), X / 1000))  # kft/kT^(1/3)
+    y = np.concatenate((y.ravel(), Y / 1000))
+
+    runBatchTest(
+        "AWG1980 peak overpressure",
+        lambda xi, yi: (AWG1980._DeltaP_s(xi, yi), AWG1980._Q_H(xi, yi)),
+        lambda x, y: AWG1980._Q_H_batch(x, y)[::-1],
+        (x, y),
+        ("DeltaP_s", "Q_H"),
+    )
+
+
+def runBLASTQuadratureTest():
+    """
+    runs the mid-point quadrature of the BLAST 1984 model: as a plain sum
+    against a loop over the nodes and, with a tolerance, against integrals
+    known in closed form. Then the impulses of airburst() with a tolerance
+    against a tighter one, and, for reference, the original 100 node rule
+    against the latter.
+    """
+    from math import exp, pi, sin
+    from HeWu import modelBLAST1984 as BLAST1984
+
+    _printHeader("BLAST1984 mid-point rule")
+    for name, f, l, u, exact in (
+        ("exp, 0-1", np.exp, 0, 1, exp(1) - 1),
+        ("sin, 0-pi", np.sin, 0, pi, 2),
+        ("x^-1.2, 1-100", lambda x: x**-1.2, 1, 100, 5 * (1 - 100**-0.2)),
+    ):
+        h = (u - l) / 100
+        loop = h * sum(f(l + h * (i + 0.5)) for i in range(100))
+        _printDeviation(name, _deviation(loop, BLAST1984._midpoint(f, l, u)))
+        _printDeviation(
+            name + ", tol", _deviation(exact, BLAST1984._midpoint(f, l, u, tol=1e-10))
+        )
+
+    GR, H, _, W = _abPoints((1, 400, 25000))
+    far = GR > 0  # airburst() takes the burst angle from SHOB / SGR
+
+    def impulses(**kwargs):
+        return np.array(
+            [
+                _pick(BLAST1984.airburst(gr, h, w, False, **kwargs), 3, 9)
+                for gr, h, w in zip(GR[far], H[far], W[far])
+            ]
+        ).T
+
+    converged = impulses(tol=1e-10)
+    for name, kwargs in (("tol=1e-6", {"tol": 1e-6}), ("N=100", {"N": 100})):
+        calc = impulses(**kwargs)
+        for output, r, c in zip(("IPTOTAL", "IQTOTAL"), converged, calc):
+            _printDeviation("{}, {}".format(output, name), _deviation(r, c))
+
+
+def runBLAST1984Test():
+    """
+    runs the array versions of the BLAST 1984 airburst and freeair against the
+    scalar ones, over the airburst test cases at a range of yields, and for
+    the freeair at a range of altitudes too.
+    """
+    from HeWu import modelBLAST1984 as BLAST1984
+
+    GR, H, _, W = _abPoints()
+    far = GR > 0  # airburst() takes the burst angle from SHOB / SGR
+
+    runBatchTest(
+        "BLAST1984 airburst",
+        lambda gr, h, w: _pick(
+            BLAST1984.airburst(gr, h, w, False), 0, 1, 2, 4, 5, 6, 7, 8, 10, 11
+        ),
+        BLAST1984.airburstBatch,
+        (GR[far], H[far], W[far]),
+        (
+            "PAIR",
+            "QAIR",
+            "TAAIR",
+            "DPP",
+            "limit1",
+            "XM",
+            "HTP",
+            "limit2",
+            "DPQ",
+            "limit3",
+        ),
+    )
+
+    runBatchTest(
+        "BLAST1984 freeair",
+        BLAST1984.freeair,
+        BLAST1984.freeairBatch,
+        (W, np.resize((0, 3000, 10000, 20000, 30000), W.shape), (GR**2 + H**2) ** 0.5),
+        ("PFREE", "QFREE", "TAFREE", "withinLimit"),
+    )
+
+
+def runAltitudeTest():
+    """
+    runs the array versions of the Brode 1987 airburst and freeair and of the
+    AWG 1980 airburst against the scalar ones at sea level, over the airburst
+    test cases at a range of yields. Then each batch evaluator above sea level
+    against its sea level self, Sachs scaled by hand, see atmosphere.py.
+    """
+    from HeWu import modelBrode1987Airburst as Brode1987
+    from HeWu import modelBrode1987Freeair as Brode1987Freeair
+    from HeWu import modelBLAST1984 as BLAST1984
+    from HeWu import modelAWG1980 as AWG1980
+    from HeWu.atmosphere import sachs
+
+    GR, H, _, W = _abPoints()
+    R = (GR**2 + H**2) ** 0.5
+
+    runBatchTest(
+        "Brode1987 airburst",
+        lambda gr, h, w: _pick(
+            Brode1987.airburst(gr, h, w, None, False), 0, 1, 2, 4, 7, 8, 10, 13
+        ),
+        Brode1987.airburstBatch,
+        (GR, H, W),
+        ("TAAIR", "PAAIR", "DPP", "IPEST", "QAAIR", "DPQ", "IQEST", "XM"),
+    )
+
+    runBatchTest(
+        "Brode1987 freeair",
+        lambda r, w: _pick(
+            Brode1987Freeair.freeair(r, w, None, False), 0, 3, 4, 5, 6, 7, 8
+        ),
+        lambda r, w: _pick(Brode1987Freeair.freeairBatch(r, w), 0, 2, 3, 4, 5, 6, 7),
+        (R, W),
+        ("DeltaP_s", "T", "D_p_pos", "I_p_pos", "D_u_pos", "I_u_pos", "theta_m"),
+    )
+
+    # the positive phase duration in airburst() does not converge close in
+    far = _uc_m2ft(GR) / W ** (1 / 3) >= 60
+
+    runBatchTest(
+        "AWG1980 airburst",
+        lambda gr, h, w: AWG1980.airburst(gr, h, w, False)[:4],
+        AWG1980.airburstBatch,
+        (GR[far], H[far], W[far]),
+        ("PAIR", "QAIR", "TAAIR", "DPQ"),
+    )
+
+    ALT = np.resize((3000, 10000, 20000, 30000), GR.shape)
+    SP, SD, ST = sachs(ALT)
+
+    _printHeader("Sachs scaling ({} points)".format(GR.size))
+    for name, batch, scaling in (
+        (
+            "Brode1987",
+            Brode1987.airburstBatch,
+            (ST, SP, ST, SP * ST, SP, ST, SP * ST, SD),
+        ),
+        (
+            "BLAST1984",
+            BLAST1984.airburstBatch,
+            (SP, SP, ST, ST, 1, SD, SD, 1, ST, 1),
+        ),
+        ("AWG1980", AWG1980.airburstBatch, (SP, SP, ST, ST, SP)),
+    ):
+        aloft = batch(GR, H, W, ALT)
+        sea = batch(GR / SD, H / SD, W)
+        _printDeviation(
+            name,
+            max(_deviation(s * f, a) for s, a, f in zip(sea, aloft, scaling)),
+        )
+    aloft = Brode1987Freeair.freeairBatch(R, W, ALT)
+    sea = Brode1987Freeair.freeairBatch(R / SD, W)
+    scaling = (SP, SP, ST, ST, SP * ST, ST, SP * ST, 1)
+    _printDeviation(
+        "Brode1987Freeair",
+        max(_deviation(s * f, a) for s, a, f in zip(sea, aloft, scaling)),
+    )
+
+
+def runBrode1970Test():
+    """
+    runs the combined array evaluator of the Brode 1970 model against the
+    scalar fits, over the airburst test cases at a range of yields.
+    """
+    from HeWu import modelBrode1970 as Brode1970
+    from HeWu.uc import _uc_m2kft
+
+    def scalar(gr, h, w):
+        x = max(_uc_m2kft(gr), Brode1970.minimum)
+        y = max(_uc_m2kft(h), Brode1970.minimum)
+        t_a = Brode1970._t_a(x, y, w)
+        DeltaP_s = Brode1970._DeltaP_s(x, y, w, t_a)
+        return (
+            _uc_psi2pa(DeltaP_s),
+            _uc_psi2pa(Brode1970._Q_s(DeltaP_s)),
+            t_a / 1000,
+            _uc_psi2pa(Brode1970._Q_H(x, y, w, DeltaP_s=DeltaP_s)),
+        )
+
+    GR, H, _, W = _abPoints()
+    runBatchTest(
+        "Brode1970 airburst",
+        scalar,
+        Brode1970.airburstBatch,
+        (GR, H, W),
+        ("DeltaP_s", "Q_s", "t_a", "Q_H"),
+    )
+
+
+def runPTTest():
+    """
+    runs the FORTRAN listing on arrays against one gauge and time at a time:
+    over the airburst test cases at their own times, and as the waveform of
+    each test case gauge over a shared array of times. Then the time of
+    arrival of PTSETUP against the reference model.
+    """
+    from HeWu.FORTRAN import PT, PTSETUP
+    from HeWu.modelBrode1987Airburst import airburstBatch
+
+    X, Y, sigma_tau, _ = (np.array(a) for a in zip(*abtests))
+
+    runBatchTest(
+        "FORTRAN PT, batch",
+        lambda y, x, sigma: (PT(y, x, sigma),),
+        lambda y, x, sigma: (PT(y, x, sigma),),
+        (Y, X, sigma_tau),
+        ("DELTAP",),
+    )
+
+    sigma = np.geomspace(1e-3, 100, 20)
+    runBatchTest(
+        "FORTRAN PT, waveforms",
+        lambda y, x: (np.array([PT(y, x, s) for s in sigma]),),
+        lambda y, x: (PT(y[:, None], x[:, None], sigma[None, :]),),
+        (Y, X),
+        ("DELTAP",),
+    )
+
+    # the listing and the report differ on the arrival in the Mach region
+    _, TAU = PTSETUP(Y, X)
+    TAAIR, _, _, _, _, _, _, XM = airburstBatch(_uc_ft2m(X), _uc_ft2m(Y), 1)
+    mach = X >= _uc_m2ft(XM)
+    _printHeader("FORTRAN TAU vs Brode1987")
+    for name, at in (("TAU, regular", ~mach), ("TAU, Mach", mach)):
+        _printDeviation(name, _deviation(TAAIR[at] * 1000, TAU[at]))
+
+
+def runCompareTest():
+    """
+    runs compare.py on a small grid against each model evaluated point by
+    point: the grid layout, the values and deviations of each model, and the
+    statistics, recounted over the regions and validity masks.
+    """
+    from HeWu import compare as C
+
+    X = np.geomspace(20, 5000, 9)
+    Y = np.linspace(0, 1500, 7)
+    W = np.array((1, 100, 10000))
+    results = C.compare(X, Y, W, repeat=1)
+
+    Wg, Yg, Xg = (a.ravel() for a in np.meshgrid(W, Y, X, indexing="ij"))
+    m = Wg ** (1 / 3)
+    GR, H = _uc_ft2m(Xg * m), _uc_ft2m(Yg * m)
+
+    P_ref, t_ref = C.models["Brode1987"](GR, H, Wg)
+    names, masks = C._regions(Xg, Yg, P_ref)
+    _printHeader("compare ({} points)".format(Xg.size))
+    _printDeviation("points", _deviation(results["points"], np.sum(masks, axis=1)))
+
+    for name, model in C.models.items():
+        P, t = np.array([model(gr, h, w) for gr, h, w in zip(GR, H, Wg)]).T
+        validP = C._valid(name, "P", GR, H, Wg, P)
+        validt = C._valid(name, "t", GR, H, Wg, P)
+        dP, dt = P / P_ref - 1, t / t_ref - 1
+        counts, stats = [], []
+        for valid, d in ((validP, dP), (validt, dt)):
+            counted = [abs(d[inRegion & valid & np.isfinite(d)]) for inRegion in masks]
+            counts.append([c.size for c in counted])
+            stats.append([max(c, default=np.nan) for c in counted])
+            stats.append([np.median(c) if c.size else np.nan for c in counted])
+        _printDeviation(
+            name,
+            max(
+                _deviation(P, results[name + "_P"]),
+                _deviation(t, results[name + "_t"]),
+                _deviation(dP, results[name + "_dP"], absolute=True),
+                _deviation(dt, results[name + "_dt"], absolute=True),
+                _deviation(np.transpose(counts), results[name + "_counts"]),
+                _deviation(
+                    np.transpose(stats), results[name + "_stats"], absolute=True
+                ),
+            ),
+        )
+
+
+def runDispatchTest():
+    """
+    runs dispatch.py over points at two altitudes, for each accuracy class and
+    quantity, against the output of the model that answered each point, taken
+    from the model itself. Points no model answers must be nan.
+    """
+    from HeWu import dispatch as D
+    from HeWu.FORTRAN import PT
+    from HeWu.atmosphere import sachs
+    from HeWu.uc import _uc_m2ft, _uc_psi2pa
+    from HeWu.modelBrode1987Airburst import airburstBatch as Brode1987
+    from HeWu.modelBLAST1984 import airburstBatch as BLAST1984
+    from HeWu.modelAWG1980 import airburstBatch as AWG1980
+    from HeWu.modelBrode1970 import airburstBatch as Brode1970
+
+    def FORTRAN(GR, H, W, ALT):
+        SP, SD, _ = sachs(ALT)
+        m = W ** (1 / 3)
+        X, Y = _uc_m2ft(GR / SD) / m, _uc_m2ft(H / SD) / m
+        P = [PT(y, x, 0) for x, y in zip(X, Y)]
+        return (_uc_psi2pa(np.array(P)) * SP,)
+
+    """per model: evaluator and index of each quantity in its outputs"""
+    own = {
+        "Brode1987": (Brode1987, {"t": 0, "P": 1, "QH": 4, "IQ": 6}),
+        "FORTRAN": (FORTRAN, {"P": 0}),
+        "BLAST1984": (BLAST1984, {"P": 0, "Q": 1, "t": 2}),
+        "AWG1980": (AWG1980, {"P": 0, "Q": 1, "t": 2, "QH": 4}),
+        "Brode1970": (Brode1970, {"P": 0, "Q": 1, "t": 2, "QH": 3}),
+    }
+
+    GR = np.geomspace(10, 20000, 12)
+    GR, H, W, ALT = (
+        a.ravel()
+        for a in np.meshgrid(GR, (0, 200, 1000, 3000), (1, 100, 10000), (0, 3000))
+    )
+    cost = D.measureCost(n=1000, repeat=2)
+
+    _printHeader("dispatch ({} points)".format(GR.size))
+    for accuracy in D.accuracies:
+        for quantity in D.quantities:
+            value, used = D.dispatch(GR, H, W, quantity, accuracy, ALT, cost)
+            ref = np.full(GR.shape, np.nan)
+            for i, name in enumerate(D.names):
+                at = used == i
+                if np.any(at):
+                    evaluate, index = own[name]
+                    ref[at] = evaluate(GR[at], H[at], W[at], ALT[at])[index[quantity]]
+            _printDeviation(
+                "{} {}".format(accuracy, quantity),
+                max(_deviation(ref, value), _deviation(used < 0, np.isnan(value))),
+            )
+
+
+def runValidityTest():
+    """
+    runs the masks of validity.py against the limit flags the models return
+    themselves: limit1, limit2 and limit3 of BLAST 1984 over the airburst test
+    cases at three altitudes, and NSGLim, OTHLim, isWithinLimit, reliable and
+    withinLimit of WE 1984. Booleans count as 1 where they differ, see
+    _deviation.
+    """
+    from HeWu.validity import mask
+    from HeWu import modelWE1984 as WE1984
+    from HeWu.modelBLAST1984 import airburstBatch
+
+    GR, H, _, W = _abPoints((0.05, 1, 400, 25000, 30000))
+    ALT = np.repeat((0, 3000, 40000), GR.size)
+    GR, H, W = (np.tile(a, 3) for a in (GR, H, W))
+    _, _, _, _, limit1, _, _, limit2, _, limit3 = airburstBatch(GR, H, W, ALT)
+
+    _printHeader("BLAST1984 ({} points)".format(GR.size))
+    for output, limit in (("P", limit1), ("XM", limit2), ("DPQ", limit3)):
+        valid = mask("BLAST1984", output, GR=GR, H=H, W=W, ALT=ALT)
+        _printDeviation(output, _deviation(limit, valid))
+
+    """WE 1984, over a spread of yields, heights and ranges"""
+    Y = np.repeat((0.05, 0.1, 1, 20, 400, 8000, 30000), 13)
+    HOB = np.resize((0, 50, 200, 1000, 9000), Y.shape)
+    GR = np.resize((50, 100, 500, 1000, 2000, 5000, 10000, 20000), Y.shape)
+    AIR = np.resize((0.5, 0.8, 0.975), Y.shape)
+    WT = np.resize(np.arange(1, 14), Y.shape)
+
+    NSGLim, OTHLim = np.transpose(
+        [
+            WE1984.iniRad(y, air, h, gr, 0.5, wt)[2::5]
+            for y, air, h, gr, wt in zip(Y, AIR, HOB, GR, WT)
+        ]
+    )
+    _printHeader("WE1984 iniRad ({} points)".format(Y.size))
+    for output, limit in (("N", NSGLim), ("TD", OTHLim)):
+        valid = mask("WE1984iniRad", output, GR=GR, H=HOB, W=Y, AIR=AIR)
+        _printDeviation(output, _deviation(limit, valid))
+
+    """surface and buried bursts, with varying layer thicknesses"""
+    DOB = np.resize((0, -2, -10, -30), Y.shape)
+    T1 = np.resize((0, 1, 5, 20, 100, 1500), Y.shape)
+    T2 = np.resize((2, 10, 50), Y.shape)
+
+    limits, ejecta, CRs = [], [], []
+    for y, h, t1, t2, gr in zip(Y, DOB, T1, T2, GR):
+        try:
+            _, CR, _, isWithinLimit, _, reliable = WE1984.crater(
+                y, h, 2, t1, 3, t2, 5, gr
+            )
+        except ValueError:  # cratering is insignificant
+            CR, isWithinLimit, reliable = np.nan, np.nan, np.nan
+        limits.append(isWithinLimit)
+        ejecta.append(reliable)
+        CRs.append(CR)
+
+    """the scaled depth limit S2 < 40 is left to crater(), see validity.py"""
+    S2 = np.array(
+        [max(WE1984._V(y, h, m)[1] for m in (2, 3, 5)) for y, h in zip(Y, DOB)]
+    )
+    valid = mask("WE1984crater", "VA", H=DOB, W=Y, T1=T1, T2=T2) & (S2 < 40)
+    crater = np.isfinite(CRs)
+
+    _printHeader("WE1984 crater ({} points)".format(crater.sum()))
+    _printDeviation("VA", _deviation(np.array(limits)[crater], valid[crater]))
+    valid = mask("WE1984crater", "EJ", GR=GR, CR=CRs)
+    _printDeviation("EJ", _deviation(np.array(ejecta)[crater], valid[crater]))
+
+    DW = np.resize((0, 5000, 50000, 300000, 2e6), Y.shape)
+    CW = np.resize((0, 1000, 10000, 5e4), Y.shape)
+    WS = np.resize((0.5, 15, 50), Y.shape)
+    SY = np.resize((0.3, 12), Y.shape)
+    T = np.resize((0.05, 1, 24, 6000), Y.shape)
+    TEXP = np.resize((24, 168, 6000), Y.shape)
+
+    withinLimit = [
+        WE1984.fallout(y, 20, dw, cw, ws, sy, 0.5, t, t, texp)[5]
+        for y, dw, cw, ws, sy, t, texp in zip(Y, DW, CW, WS, SY, T, TEXP)
+    ]
+    valid = mask(
+        "WE1984fallout", "DT", DW=DW, CW=CW, WS=WS, SY=SY, T=T, TI=T, TEXP=TEXP
+    )
+    _printHeader("WE1984 fallout ({} points)".format(Y.size))
+    _printDeviation("DT", _deviation(withinLimit, valid))
+
+
+def runIniRadTest():
+    """
+    runs the per-burst context of the WE 1984 initial radiation over arrays of
+    ground range against iniRad at one range at a time, for a spread of
+    yields, burst heights, air densities and weapon types.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    GR = np.array((50, 100, 300, 1000, 2000, 5000, 10000, 20000), dtype=float)
+    for Y, AIR, H, WT in ((0.1, 0.975, 0, 1), (20, 0.8, 200, 7), (8000, 0.6, 3000, 13)):
+        runBatchTest(
+            "WE1984 iniRadBurst, {:g} kT".format(Y),
+            lambda gr: WE1984.iniRad(Y, AIR, H, gr, 0.5, WT),
+            lambda gr: WE1984.iniRadBurst(Y, AIR, H, 0.5, WT)(gr),
+            (GR,),
+            ("N", "SG", "NSGLim", "FFG", "TD", "DS", "NtG", "OTHLim"),
+        )
+
+
+def runWeaponTypeTest():
+    """
+    runs the WE 1984 initial radiation over the array of all weapon types
+    against iniRad for one weapon type at a time.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    WT = np.arange(1, 14)
+    GR = np.array((100, 500, 1000, 2000, 5000), dtype=float)
+    points = tuple(a.ravel() for a in np.meshgrid(WT, GR, indexing="ij"))
+
+    runBatchTest(
+        "WE1984 iniRad, all WT",
+        lambda wt, gr: WE1984.iniRad(20, 0.975, 200, gr, 0.5, int(wt)),
+        lambda wt, gr: tuple(
+            np.ravel(v) for v in WE1984.iniRadBurst(20, 0.975, 200, 0.5, WT)(GR)
+        ),
+        points,
+        ("N", "SG", "NSGLim", "FFG", "TD", "DS", "NtG", "OTHLim"),
+    )
+
+
+def runThermTest():
+    """
+    runs the array version of the WE 1984 thermal fluence, on a cube of
+    (visibility, height, range) per yield, against therm one point at a time.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    VIS = np.array((2000, 20000, 80000), dtype=float)
+    H = np.array((0, 50, 500, 3000), dtype=float)
+    GR = np.array((100, 1000, 5000, 20000), dtype=float)
+    for Y in (0.1, 20, 8000):
+        runBatchTest(
+            "WE1984 thermBatch, {:g} kT".format(Y),
+            lambda vis, h, gr: (WE1984.therm(Y, h, gr, vis),),
+            lambda vis, h, gr: (
+                WE1984.thermBatch(
+                    Y, H[None, :, None], GR[None, None, :], VIS[:, None, None]
+                ).ravel(),
+            ),
+            tuple(a.ravel() for a in np.meshgrid(VIS, H, GR, indexing="ij")),
+            ("Q",),
+        )
+
+
+def runCraterTest():
+    """
+    runs the array version of the WE 1984 crater against crater one point at a
+    time, over surface and shallow buried bursts with varying layer thickness,
+    for a few material stacks. Points where cratering is insignificant, which
+    crater() raises on, should be nan.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    Y = np.repeat((0.1, 1, 20, 400, 8000), 13)
+    H = np.resize((0, -2, -10, -30), Y.shape)
+    T1 = np.resize((0, 1, 5, 20, 100), Y.shape)
+    T2 = np.resize((2, 10, 50), Y.shape)
+
+    for M1, M2, M3, HIGHRAD in ((2, 3, 5, False), (1, 4, 1, False), (5, 2, 3, True)):
+
+        def craterScalar(y, h, t1, t2):
+            try:
+                return WE1984.crater(y, h, M1, t1, M2, t2, M3, None, HIGHRAD)[:4]
+            except ValueError:  # cratering is insignificant
+                return np.nan, np.nan, np.nan, np.nan
+
+        runBatchTest(
+            "WE1984 craterBatch, M {}/{}/{}{}".format(
+                M1, M2, M3, ", HIGHRAD" if HIGHRAD else ""
+            ),
+            craterScalar,
+            lambda y, h, t1, t2: WE1984.craterBatch(
+                y, h, M1, t1, M2, t2, M3, HIGHRAD
+            ),
+            (Y, H, T1, T2),
+            ("VA", "CR", "CD", "isWithinLimit"),
+        )
+
+
+def runEjectaTest():
+    """
+    runs the ejecta thickness of the WE 1984 crater over arrays of ground
+    range, from the volumes kept by craterBurst, against crater at one range
+    at a time.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    GR = np.array((10, 50, 100, 300, 1000, 5000, 20000), dtype=float)
+    for Y, H, T1, T2 in ((0.1, 0, 1, 10), (20, -10, 5, 2), (8000, -30, 100, 50)):
+        *_, ejecta = WE1984.craterBurst(Y, H, 2, T1, 3, T2, 5)
+        runBatchTest(
+            "WE1984 ejecta, {:g} kT".format(Y),
+            lambda gr: WE1984.crater(Y, H, 2, T1, 3, T2, 5, gr)[4:],
+            ejecta,
+            (GR,),
+            ("EJ", "reliable"),
+        )
+
+
+def runCraterRasterTest():
+    """
+    runs the WE 1984 crater over a raster of layered geology against
+    craterBatch one cell at a time: for one burst over the raster, with the
+    volumes looked up per material, and for a burst per cell.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    rng = np.random.default_rng(1984)
+    shape = (6, 8)
+    M1, M2, M3 = rng.integers(1, 6, (3,) + shape)
+    T1 = rng.choice((0, 1, 5, 20), shape)
+    T2 = rng.choice((2, 10, 50), shape)
+    Y = rng.choice((0.1, 1, 20, 400, 8000), shape)
+    H = rng.choice((0, -2, -10, -30), shape)
+
+    cells = tuple(a.ravel() for a in (Y, H, M1, T1, M2, T2, M3))
+
+    def perCell(y, h, m1, t1, m2, t2, m3):
+        return WE1984.craterBatch(y, h, int(m1), t1, int(m2), t2, int(m3))
+
+    runBatchTest(
+        "WE1984 craterRaster, 20 kT",
+        lambda *cell: perCell(20, -2, *cell[2:]),
+        lambda *_: tuple(
+            np.ravel(v) for v in WE1984.craterRaster(20, -2, M1, T1, M2, T2, M3)
+        ),
+        cells,
+        ("VA", "CR", "CD", "isWithinLimit"),
+    )
+    runBatchTest(
+        "WE1984 craterRaster, per cell",
+        perCell,
+        lambda *_: tuple(
+            np.ravel(v) for v in WE1984.craterRaster(Y, H, M1, T1, M2, T2, M3)
+        ),
+        cells,
+        ("VA", "CR", "CD", "isWithinLimit"),
+    )
+
+
+"""
+test cases for the WE 1984 fallout of a surface burst, wind speed 15, shear
+0.3 and fission fraction 0.5, entering at 1 h for 24 h, as given by the scalar
+fallout() before the per-burst context, in the format of:
+    Y: yield, kT
+    DW, CW: downwind and crosswind range, m
+    DHP1: one hour dose rate
+    T0: debris arrival time, h
+    MBD: maximum biological dose
+    FD: dose from 1 h to 25 h
+"""
+fotests = (
+    (1, 0, 0, 108.0108, 0.5004189, 357.6473, 256.3607),
+    (1, 500, 0, 0.0008872694, 0.5012413, 0.002936662, 0.002105909),
+    (20, 0, 1000, 2.04027, 0.501486, 6.751958, 4.842523),
+    (20, 500, 0, 22.64895, 0.503153, 74.88721, 53.75666),
+    (20, 500, 1000, 0.3432071, 0.503153, 1.134791, 0.8145925),
+    (400, 0, 0, 376.519, 0.5223565, 1232.591, 893.6574),
+    (400, 2000, 1000, 108.4464, 0.5474143, 350.599, 257.3945),
+    (400, 10000, 0, 1.399689e-09, 0.7144263, 4.209507e-09, 3.322124e-09),
+    (8000, 500, 1000, 1639.427, 0.6807333, 4996.341, 3891.134),
+    (8000, 10000, 0, 181.5625, 0.9458806, 504.8639, 430.9335),
+    (8000, 30000, 1000, 1.203515e-05, 1.60163, 2.869553e-05, 2.856509e-05),
+)
+
+
+def runFalloutTest():
+    """
+    runs the per-burst context of the WE 1984 fallout: against the test cases
+    above, and over arrays of locations and times against fallout one point at
+    a time.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    _printHeader("WE1984 fallout test cases ({} points)".format(len(fotests)))
+    calc = []
+    for y, dw, cw, *_ in fotests:
+        DHP1, _, T0, MBD, FD, _ = WE1984.falloutBurst(y, 0, 15, 0.3, 0.5)(
+            dw, cw, 1, 1, 24
+        )
+        calc.append((DHP1, T0, MBD, FD))
+    refs = tuple(zip(*fotests))[3:]
+    for name, ref, c in zip(("DHP1", "T0", "MBD", "FD"), refs, zip(*calc)):
+        _printDeviation(name, _deviation(ref, c))
+
+    DW = np.resize((0, 500, 2000, 5000, 20000, 100000), 36)
+    CW = np.resize((0, 300, 1000, 10000), 36)
+    T = np.resize((0.5, 1, 6, 24, 48), 36)
+
+    for Y in (1, 20, 8000):
+        runBatchTest(
+            "WE1984 falloutBurst, {:g} kT".format(Y),
+            lambda dw, cw, t: WE1984.fallout(Y, 0, dw, cw, 15, 0.3, 0.5, t, t, 24),
+            lambda dw, cw, t: WE1984.falloutBurst(Y, 0, 15, 0.3, 0.5)(
+                dw, cw, t, t, 24
+            ),
+            (DW, CW, T),
+            ("DHP1", "DT", "T0", "MBD", "FD", "withinLimit"),
+        )
+
+
+def runFalloutGridTest():
+    """
+    runs the separable evaluation of the WE 1984 fallout on a (downwind,
+    crosswind) grid against fallout one point at a time.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    DW = np.array((0, 500, 2000, 5000, 20000, 100000), dtype=float)
+    CW = np.array((0, 300, 1000, 10000, 50000), dtype=float)
+
+    for Y in (1, 20, 8000):
+        atDWCW = WE1984.falloutBurst(Y, 0, 15, 0.3, 0.5)
+        runBatchTest(
+            "WE1984 fallout grid, {:g} kT".format(Y),
+            lambda dw, cw: WE1984.fallout(Y, 0, dw, cw, 15, 0.3, 0.5, 6, 1, 24),
+            lambda dw, cw: tuple(
+                np.ravel(v) for v in atDWCW(DW, CW, 6, 1, 24, grid=True)
+            ),
+            tuple(a.ravel() for a in np.meshgrid(DW, CW, indexing="ij")),
+            ("DHP1", "DT", "T0", "MBD", "FD", "withinLimit"),
+        )
+
+
+def runFalloutScheduleTest():
+    """
+    runs the dose tables of the WE 1984 fallout over many exposure schedules,
+    from one field of one hour dose rates, against fallout one point and
+    schedule at a time. The locations are within the limits of the model, so
+    that withinLimit only depends on the schedule.
+    """
+    from HeWu import modelWE1984 as WE1984
+
+    DW = np.array((0, 500, 2000, 10000), dtype=float)
+    CW = np.array((0, 1000, 0, 300), dtype=float)
+    T = np.array((0.5, 1, 6, 24, 48, 6000), dtype=float)
+    TI = np.array((0.5, 1, 1, 12, 0.05, 24), dtype=float)
+    TEXP = np.array((1, 24, 168, 720, 24, 5000), dtype=float)
+
+    DHP1, *_ = WE1984.falloutBurst(400, 0, 15, 0.3, 0.5)(DW, CW, 1, 1, 1)
+    DT, FD, withinLimit = WE1984.falloutSchedule(DHP1, T, TI, TEXP)
+
+    cell, schedule = (a.ravel() for a in np.indices((DW.size, T.size)))
+    runBatchTest(
+        "WE1984 falloutSchedule",
+        lambda i, j: _pick(
+            WE1984.fallout(400, 0, DW[i], CW[i], 15, 0.3, 0.5, T[j], TI[j], TEXP[j]),
+            1,
+            4,
+            5,
+        ),
+        lambda i, j: (DT.ravel(), FD.ravel(), withinLimit[j]),
+        (cell, schedule),
+        ("DT", "FD", "withinLimit"),
+    )
+
+
+def runRouteTest():
+    """
+    runs the dose along routes of route.py against a brute force mid-point sum
+    of the dose rate of the WE 1984 fallout over fine steps along the same
+    paths: straight downwind, through the edge of the plume, back and forth
+    across ground zero into the upwind half plane, and one padded with nan.
+    The deviation is printed for the default and finer numbers of steps, and
+    falls off as 1 / steps, led by the route across ground zero, where the dose
+    rate drops to 0 at the upwind edge of the fit.
+    """
+    from HeWu import route
+    from HeWu import modelWE1984 as WE1984
+
+    burst = WE1984.falloutBurst(400, 0, 15, 0.3, 0.5)
+
+    t = np.array(((0.5, 1, 2, 3), (0.5, 1, 2, 3), (0.5, 1, 2, 3), (0.5, 1, 2, np.nan)))
+    DW = np.array(((0, 2e3, 5e3, 8e3), (1e3, 3e3, 3e3, 3e3), (2e3, -1e3, 1e3, -2e3)))
+    CW = np.array(((0, 0, 0, 0), (0, 1e3, 3e3, 5e3), (0, 500, -500, 0)))
+    DW = np.vstack((DW, (1e3, 2e3, 2e3, np.nan)))
+    CW = np.vstack((CW, (0, -1e3, 0, np.nan)))
+
+    n = 200000  # steps per segment
+    ref = []
+    for r in range(len(t)):
+        known = np.isfinite(t[r])
+        u = (np.arange(n) + 0.5) / n
+        ref.append(0)
+        for a, b in zip(np.flatnonzero(known)[:-1], np.flatnonzero(known)[1:]):
+            ts = t[r, a] + (t[r, b] - t[r, a]) * u
+            dw = DW[r, a] + (DW[r, b] - DW[r, a]) * u
+            cw = CW[r, a] + (CW[r, b] - CW[r, a]) * u
+            DHP1, DT, T0, *_ = WE1984.fallout(
+                400, 0, np.maximum(dw, 0), abs(cw), 15, 0.3, 0.5, ts, 1, 1
+            )
+            felt = (dw >= 0) & (ts >= T0)
+            ref[r] += np.sum(DT[felt]) * (t[r, b] - t[r, a]) / n
+
+    _printHeader("route dose ({} routes)".format(len(t)))
+    for samples in (16, 1000, 10000):
+        D, order = route.routeDose(burst, DW, CW, t, samples)
+        _printDeviation("{} steps".format(samples), _deviation(ref, D))
+    _printDeviation("order", _deviation(np.argsort(ref), order))
+
+
+def runExceedanceTest():
+    """
+    runs the probability of exceedance maps of footprint.py over a small wind
+    rose against thresholding the WE 1984 fallout evaluated directly on the
+    same grid, taken into the frame of each wind by hand: for the one hour
+    dose rate, and for the dose of an exposure.
+    """
+    from HeWu import footprint
+    from HeWu import modelWE1984 as WE1984
+
+    x, y = np.meshgrid(np.linspace(-4e3, 8e3, 25), np.linspace(-4e3, 8e3, 25))
+    # no cell lies on the crosswind axis, where rounding decides the side
+    direction = np.array((10, 10, 40, 100, 200, 310))
+    W = np.array((10, 20, 10, 15, 10, 25))
+    SY = np.array((0.3, 0.3, 0.3, 1, 0.3, 0.5))
+    weight = np.array((3, 1, 2, 1, 1, 0.5))
+    thresholds = np.array((0.1, 1, 10, 100))
+
+    _printHeader("exceedance ({} cells)".format(x.size))
+    for label, TI, TEXP, out in (("DHP1", None, None, 0), ("FD", 1, 24, 4)):
+        P = footprint.exceedance(
+            100, 0, 0.5, x, y, W, SY, direction, weight, thresholds, TI, TEXP
+        )
+
+        ref = np.zeros(P.shape)
+        for w, sy, d, p in zip(W, SY, direction, weight):
+            a = np.radians(d)
+            DW = x * np.sin(a) + y * np.cos(a)
+            CW = x * np.cos(a) - y * np.sin(a)
+            value = WE1984.falloutBurst(100, 0, w, sy, 0.5)(
+                np.maximum(DW, 0), abs(CW), 1, TI or 1, TEXP or 1
+            )[out]
+            value = np.where(DW >= 0, value, 0)
+            ref += p * (value >= thresholds[:, None, None])
+        ref /= np.sum(weight)
+
+        _printDeviation(label, _deviation(ref, P))
+
+
+def runSuperposeTest():
+    """
+    runs the superposition of footprint.py over bursts whose footprints do not
+    overlap on the map against the plain sum of the WE 1984 fallout of each
+    burst evaluated over the whole grid: without the envelope, and with the
+    default one, which may only drop less than the negligible dose rate per
+    burst. The threaded sum should be that of a single worker, bit for bit.
+    """
+    from HeWu import footprint
+    from HeWu import modelWE1984 as WE1984
+
+    x, y = np.meshgrid(np.linspace(-2e4, 2e4, 81), np.linspace(-2e4, 2e4, 81))
+    X0 = np.array((-1.5e4, 1e4, -1e4, 5e3))
+    Y0 = np.array((1.5e4, 1.5e4, -1e4, -1.5e4))
+    Y = np.array((10, 100, 1000, 1))
+    W = np.array((15, 10, 25, 15))
+    direction = np.array((80, 10, 40, 260))
+
+    each = []
+    for bx, by, b, w, d in zip(X0, Y0, Y, W, direction):
+        a = np.radians(d)
+        DW = (x - bx) * np.sin(a) + (y - by) * np.cos(a)
+        CW = (x - bx) * np.cos(a) - (y - by) * np.sin(a)
+        burst = WE1984.falloutBurst(b, 0, w, 0.3, 0.5)
+        DHP1, *_ = burst(np.maximum(DW, 0), abs(CW), 1, 1, 1)
+        each.append(np.where(DW >= 0, DHP1, 0))
+    each = np.array(each)
+
+    _printHeader("superpose ({} bursts)".format(len(X0)))
+    overlap = np.count_nonzero(each > 1e-3, axis=0) > 1
+    _printDeviation("overlapping cells", np.sum(overlap))
+
+    args = (x, y, X0, Y0, Y, 0, W, 0.3, 0.5, direction)
+    DHP1, calc = footprint.superpose(*args, negligible=0, contributions=True)
+    _printDeviation(
+        "all cells", max(_deviation(each.sum(axis=0), DHP1), _deviation(each, calc))
+    )
+
+    DHP1, _ = footprint.superpose(*args, workers=1)
+    dropped = _deviation(each.sum(axis=0), DHP1, absolute=True)
+    _printDeviation("envelope, abs", dropped)
+
+    threaded, _ = footprint.superpose(*args, workers=4)
+    _printDeviation("threaded", _deviation(DHP1, threaded))
+
+
+def runTimelineTest():
+    """
+    runs the exposure timeline of scenario.py against each model called
+    directly at each target, one target at a time: therm, iniRad, the scalar
+    Brode 1987 airburst and fallout, with the target taken into the frame of
+    the wind by hand and the dose since arrival integrated in closed form.
+    The events should also come sorted by time.
+    """
+    from HeWu import scenario
+    from HeWu import modelWE1984 as WE1984
+    from HeWu.modelBrode1987Airburst import airburst
+
+    x = np.array((500, 1500, -1500, 3000, 800, 6000))
+    y = np.array((0, 1500, 0, 0, -2500, 4000))
+    Y, H, AIR, FF, WT, VIS, W, SY, d = 100, 10, 0.975, 0.5, 1, 20000, 15, 0.3, 80
+    T = np.array((1, 24, 168))
+
+    times, kinds, values = scenario.timeline(
+        x + 1000, y - 500, Y, H, AIR, FF, WT, VIS, W, SY, d, T, X0=1000, Y0=-500
+    )
+
+    ref_t, ref_v, calc_t, calc_v = [], [], [], []
+    for i, (xi, yi) in enumerate(zip(x, y)):
+        GR = np.hypot(xi, yi)
+        TAAIR, PAAIR, DPP, IPEST = _pick(airburst(GR, H, Y, None, False), 0, 1, 2, 4)
+
+        a = np.radians(d)
+        DW, CW = xi * np.sin(a) + yi * np.cos(a), xi * np.cos(a) - yi * np.sin(a)
+        DHP1, T0 = 0, np.inf  # upwind, see footprint.py
+        if DW >= 0:
+            DHP1, _, T0, _, _, _ = WE1984.fallout(Y, H, DW, abs(CW), W, SY, FF, 1, 1, 1)
+        FD = [5 * DHP1 * (T0**-0.2 - t**-0.2) if t > T0 else 0 for t in T]
+
+        ref_t += [0, 0, TAAIR, TAAIR + DPP, T0 * 3600, *(T * 3600)]
+        ref_v += [
+            WE1984.therm(Y, H, GR, VIS),
+            WE1984.iniRad(Y, AIR, H, GR, FF, WT)[4],
+            PAAIR,
+            IPEST,
+            DHP1,
+            *FD,
+        ]
+
+        """entries in the order above, the fallout doses being sorted by T"""
+        order = np.argsort(kinds[i], kind="stable")
+        calc_t += list(times[i][order])
+        calc_v += list(values[i][order])
+
+    _printHeader("timeline ({} targets)".format(len(x)))
+    _printDeviation("times", _deviation(ref_t, calc_t))
+    _printDeviation("values", _deviation(ref_v, calc_v))
+    _printDeviation("sorted", np.sum(np.diff(times, axis=-1) < 0))
+
+if __name__ == "__main__":
+    runYieldTest()
+    runFrontTest()
+    runFramesTest()
+    runAWG1980Test()
+    runBLASTQuadratureTest()
+    runBLAST1984Test()
+    runAltitudeTest()
+    runBrode1970Test()
+    runPTTest()
+    runCompareTest()
+    runDispatchTest()
+    runValidityTest()
+    runIniRadTest()
+    runWeaponTypeTest()
+    runThermTest()
+    runCraterTest()
+    runEjectaTest()
+    runCraterRasterTest()
+    runFalloutTest()
+    runFalloutGridTest()
+    runFalloutScheduleTest()
+    runRouteTest()
+    runExceedanceTest()
+    runSuperposeTest()
+    runTimelineTest()
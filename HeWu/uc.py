@@ -93,7 +93,7 @@ def _uc_pa2psi(pres):
     Converts presure from pa to psi
     pres: pressure in pa
     """
-    conversion_const = 6894.76  # pa per psi
+    conversion_const = 1 / 6894.76  # psi per pa
     return pres * conversion_const
 
 
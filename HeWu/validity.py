@@ -0,0 +1,339 @@
+"""
+Zhai Jinpeng, 翟锦鹏, 2023
+Contact: 914962409@qq.com
+
+validity domains of the model outputs, gathered in one declarative table and
+evaluated as masks over arrays of points.
+
+The limits come from the checks in the models themselves (limit1, limit2 and
+limit3 in modelBLAST1984, NSGLim, OTHLim, isWithinLimit, reliable and
+withinLimit in modelWE1984) and from the ranges the fits are documented to
+be good for in the docstrings (e.g. 0.07 < ΔP_s < 400,000 psi for Eqn. 33 of
+Brode 1987).
+
+The AWG 1980 and Brode 1970 sources give no such ranges. Their bounds are
+instead set from compare.py, as the part of the (scaled ground range, burst
+height) plane where they stay within about a factor of 2 of Brode 1987 at
+sea level, from 0.1 kT to 25 MT:
+
+    AWG1980  : overpressure and arrival: above the knee (x < RF, region III)
+               at elevations y/x >= 2, and beyond it at x >= 1.1 RF; the
+               fits diverge at the knee and, close in, for low bursts.
+               peak dynamic pressure: as the overpressure it derives from.
+               horizontal dynamic pressure: beyond the knee at x >= 1.2 RF,
+               being far too high above it, where the flow is near vertical.
+    Brode1970: at low elevations y/x <= 0.25, and beyond 60 ft/kT^(1/3),
+               the fit being up to 7 times low above and 1000 times low
+               close in to a surface burst.
+
+Each domain is a list of bounds (variable, lower, upper), with None for an
+open end, on variables derived from the inputs (and outputs) of the model,
+see _variables. Bounds on variables that cannot be derived from the values
+supplied to mask() are skipped, so that the same table serves both to filter
+points before evaluation, by supplying only the inputs, and after, by
+supplying the outputs. The burst altitude ALT defaults to sea level.
+
+Values understood, by name:
+
+    GR  : ground range, m
+    H   : height of burst, m (negative for depth of burst)
+    R   : (slant) range in free air, m
+    W   : yield, kT
+    ALT : burst altitude, m
+    AIR : air density ratio to sea level
+    T1, T2: thickness of layer 1 and 2, m
+    DW, CW: downwind and crosswind range, m
+    WS  : wind speed, as in modelWE1984.fallout
+    SY  : crosswind shear, as in modelWE1984.fallout
+    T, TI, TEXP: time, time of entry and exposure, h
+
+    P   : peak overpressure (output), Pa
+    t   : time of arrival (output), s
+    CR  : crater radius (output), m
+
+The scaled depth limit of crater(), S2 < 40, depends on the material and the
+interpolation in yield and is left to crater() itself.
+"""
+
+import numpy as np
+
+from HeWu.uc import _uc_m2ft, _uc_psi2pa
+from HeWu.atmosphere import sachs
+from HeWu.modelAWG1980 import _RF as _RF_AWG1980
+from HeWu.modelAWG1980 import minimum as _minimum_AWG1980
+
+
+def _Y3(v):
+    """cube root scaling, Sachs scaled to the burst altitude"""
+    _, SD, _ = sachs(v.get("ALT", 0))
+    return v["W"] ** (1 / 3) * SD
+
+
+def _Brode1987_Xi(v):
+    """scaled ground range x beyond Xi, where _sI_u_pos is fitted, kft/kT^(1/3)"""
+    Y3 = _Y3(v)
+    x = _uc_m2ft(v["GR"] / Y3) / 1000
+    psi = _uc_m2ft(v["H"] / Y3) / 1000 + 0.09
+    return x - (170 * psi / (1 + 337 * psi**0.25) + 0.914 * psi**2.5)
+
+
+def _BLAST1984_xm(v):
+    """BLAST scaled Mach stem formation range, m/kT^(1/3)"""
+    SHOB = v["H"] / _Y3(v)
+    return SHOB**2.5 / 5822 + 2.09 * SHOB**0.75
+
+
+def _AWG1980_knee(v):
+    """
+    AWG scaled burst height y and ground range x, in kft/kT^(1/3) and clamped
+    as there, and x / RF, which is below 1 above the knee, see modelAWG1980
+    """
+    Y3 = _Y3(v)
+    x = np.maximum(_uc_m2ft(v["GR"] / Y3) / 1000, _minimum_AWG1980)
+    y = np.maximum(_uc_m2ft(v["H"] / Y3) / 1000, _minimum_AWG1980)
+    return x, y, x / _RF_AWG1980(y)
+
+
+def _AWG1980_above(v):
+    """y / x above the knee, inf beyond it"""
+    x, y, k = _AWG1980_knee(v)
+    return np.where(k < 1, y / x, np.inf)
+
+
+def _AWG1980_beyond(v):
+    """x / RF beyond the knee, inf above it"""
+    _, _, k = _AWG1980_knee(v)
+    return np.where(k >= 1, k, np.inf)
+
+
+def _Brode1970_elevation(v):
+    """Y / X, inf at ground zero"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(v["GR"] > 0, v["H"] / v["GR"], np.inf)
+
+
+def _iniRad_x(v, x):
+    return v["GR"] * v["AIR"] - (np.maximum(0, x**2 - v["H"] ** 2)) ** 0.5
+
+
+"""
+variables the bounds are placed on: name -> (values required, function of
+the dict of values)
+"""
+_variables = {
+    **{
+        name: ((name,), lambda v, name=name: v[name])
+        for name in (
+            "GR",
+            "H",
+            "W",
+            "ALT",
+            "AIR",
+            "T1",
+            "T2",
+            "DW",
+            "CW",
+            "WS",
+            "SY",
+            "T",
+            "TI",
+            "TEXP",
+        )
+    },
+    "P, psi": (("P",), lambda v: v["P"] / _uc_psi2pa(1)),
+    "Brode1987 x - Xi": (("GR", "H", "W"), _Brode1987_Xi),
+    "Brode1987 r": (("R", "W"), lambda v: _uc_m2ft(v["R"] / _Y3(v)) / 1000),
+    "Brode1987 tau": (
+        ("t", "W"),
+        lambda v: v["t"] * 1000 / (v["W"] ** (1 / 3) * sachs(v.get("ALT", 0))[2]),
+    ),
+    "BLAST1984 SGR": (("GR", "W"), lambda v: v["GR"] / _Y3(v)),
+    "BLAST1984 SHOB": (("H", "W"), lambda v: v["H"] / _Y3(v)),
+    "BLAST1984 SR": (("R", "W"), lambda v: v["R"] / _Y3(v)),
+    "BLAST1984 SGR - LM1": (
+        ("GR", "H", "W"),
+        lambda v: (v["GR"] - np.where(v["H"] >= 25 * _Y3(v), 0, 20 * _Y3(v)))
+        / _Y3(v),
+    ),
+    "BLAST1984 SGR - LM2": (
+        ("GR", "H", "W"),
+        lambda v: v["GR"] / _Y3(v) - np.maximum(_BLAST1984_xm(v), 20),
+    ),
+    "BLAST1984 SGR - LM3": (
+        ("GR", "H", "W"),
+        lambda v: v["GR"] / _Y3(v) - np.maximum(1.3 * _BLAST1984_xm(v), 80),
+    ),
+    "AWG1980 x / RF": (("GR", "H", "W"), lambda v: _AWG1980_knee(v)[2]),
+    "AWG1980 y / x, x < RF": (("GR", "H", "W"), _AWG1980_above),
+    "AWG1980 x / RF, x >= RF": (("GR", "H", "W"), _AWG1980_beyond),
+    "Brode1970 X": (("GR", "W"), lambda v: _uc_m2ft(v["GR"] / _Y3(v))),
+    "Brode1970 Y / X": (("GR", "H"), _Brode1970_elevation),
+    "iniRad H * AIR": (("H", "AIR"), lambda v: v["H"] * v["AIR"]),
+    "iniRad GR * AIR - x1": (("GR", "H", "AIR"), lambda v: _iniRad_x(v, 100)),
+    "iniRad GR * AIR - x2": (
+        ("GR", "H", "W", "AIR"),
+        lambda v: _iniRad_x(v, 150 * np.maximum(1, v["W"] ** (1 / 3))),
+    ),
+    "iniRad GR * AIR - y": (("GR", "H", "AIR"), lambda v: _iniRad_x(v, 1e4)),
+    "crater H / W^(1/3)": (("H", "W"), lambda v: v["H"] / v["W"] ** (1 / 3)),
+    "crater GR - 1.8 CR": (("GR", "CR"), lambda v: v["GR"] - 1.8 * v["CR"]),
+    "fallout TI + TEXP": (("TI", "TEXP"), lambda v: v["TI"] + v["TEXP"]),
+}
+
+"""bounds shared by several domains"""
+_yield = ("W", 0.1, 25000)
+_peak = ("P, psi", 0.07, 400000)  # Eqn. 33 of Brode 1987
+_impulse = ("P, psi", 2, 100000)  # Eqn. 48 of Brode 1987, see _sI_p_pos
+_hugoniot = ("P, psi", None, 300)  # gamma = 1.4, see _Q_s of AWG1980
+
+_BLAST1984_limit1 = (
+    _yield,
+    ("ALT", 0, 32000),
+    ("BLAST1984 SHOB", None, 4000),
+    ("BLAST1984 SGR - LM1", 0, None),
+    ("BLAST1984 SGR", None, 4000),
+)
+_BLAST1984_limit2 = (
+    _yield,
+    ("ALT", 0, 32000),
+    ("BLAST1984 SHOB", None, 800),
+    ("BLAST1984 SGR - LM2", 0, None),
+    ("BLAST1984 SGR", None, 4000),
+)
+_BLAST1984_limit3 = (
+    _yield,
+    ("ALT", 0, 32000),
+    ("BLAST1984 SHOB", None, 750),
+    ("BLAST1984 SGR - LM3", 0, None),
+    ("BLAST1984 SGR", None, 4000),
+)
+_BLAST1984_freeair = (
+    _yield,
+    ("ALT", 0, 32000),
+    ("BLAST1984 SR", 16, 4000),
+)
+
+_AWG1980 = (
+    _yield,
+    ("AWG1980 y / x, x < RF", 2, None),
+    ("AWG1980 x / RF, x >= RF", 1.1, None),
+)
+_Brode1970 = (_yield, ("Brode1970 X", 60, None), ("Brode1970 Y / X", None, 0.25))
+
+_iniRad = (
+    ("W", 0.01, 25000),
+    ("AIR", 0.6, 1),
+    ("iniRad H * AIR", 1.5, 10000),
+    ("iniRad GR * AIR - y", None, 0),
+)
+_iniRad_NSG = _iniRad + (("iniRad GR * AIR - x1", 0, None),)
+_iniRad_OTH = _iniRad + (("iniRad GR * AIR - x2", 0, None),)
+
+_crater = (
+    _yield,
+    ("crater H / W^(1/3)", -40, None),
+    ("T1", None, 1000),
+    ("T2", None, 1000),
+)
+
+_fallout = (
+    ("DW", None, 1e6),
+    ("CW", None, 4e4),
+    ("WS", 1, 40),
+    ("SY", 0, 10),
+    ("T", 0.1, 5000),
+    ("TI", 0.1, 5000),
+    ("TEXP", 0, None),
+    ("fallout TI + TEXP", None, 5000),
+)
+
+"""
+the table of validity domains: (model, output) -> bounds. The outputs of the
+airburst models are named as in dispatch.py.
+"""
+domains = {
+    ("Brode1987", "P"): (_yield, _peak),
+    ("Brode1987", "t"): (_yield, _peak),
+    ("Brode1987", "QH"): (_yield, _peak),
+    ("Brode1987", "IP"): (_yield, _peak, _impulse),
+    ("Brode1987", "IQ"): (_yield, _peak, _impulse, ("Brode1987 x - Xi", 0, None)),
+    ("FORTRAN", "P"): (_yield, _peak),
+    ("FORTRAN", "t"): (_yield, _peak),
+    ("BLAST1984", "P"): _BLAST1984_limit1 + (_peak,),
+    ("BLAST1984", "Q"): _BLAST1984_limit1 + (_peak,),
+    ("BLAST1984", "t"): _BLAST1984_limit1 + (_peak,),
+    ("BLAST1984", "DPP"): _BLAST1984_limit1,
+    ("BLAST1984", "XM"): _BLAST1984_limit2,
+    ("BLAST1984", "HTP"): _BLAST1984_limit2,
+    ("BLAST1984", "DPQ"): _BLAST1984_limit3,
+    ("BLAST1984", "IQ"): _BLAST1984_limit3,
+    ("AWG1980", "P"): _AWG1980 + (_peak,),
+    ("AWG1980", "t"): _AWG1980 + (_peak,),
+    ("AWG1980", "Q"): _AWG1980 + (_peak, _hugoniot),
+    ("AWG1980", "QH"): (_yield, ("AWG1980 x / RF", 1.2, None), _peak, _hugoniot),
+    ("Brode1970", "P"): _Brode1970 + (_peak,),
+    ("Brode1970", "t"): _Brode1970 + (_peak,),
+    ("Brode1970", "Q"): _Brode1970 + (_peak, _hugoniot),
+    ("Brode1970", "QH"): _Brode1970 + (_peak, _hugoniot),
+    ("Brode1987Freeair", "P"): (_peak,),
+    ("Brode1987Freeair", "Q"): (_peak, ("P, psi", None, 7e6)),
+    ("Brode1987Freeair", "t"): (("Brode1987 tau", 1e-3, 26000),),
+    ("Brode1987Freeair", "IP"): (_peak, _impulse),
+    ("Brode1987Freeair", "IQ"): (("Brode1987 r", 0.0025, 2),),
+    ("BLAST1984Freeair", "P"): _BLAST1984_freeair,
+    ("BLAST1984Freeair", "Q"): _BLAST1984_freeair,
+    ("BLAST1984Freeair", "t"): _BLAST1984_freeair,
+    **{("WE1984iniRad", o): _iniRad_NSG for o in ("N", "SG")},
+    **{("WE1984iniRad", o): _iniRad_OTH for o in ("FFG", "TD", "DS", "NtG")},
+    ("WE1984therm", "Q"): (("H", 0, None),),
+    **{("WE1984crater", o): _crater for o in ("VA", "CR", "CD")},
+    ("WE1984crater", "EJ"): (("GR", None, 10000), ("crater GR - 1.8 CR", 0, None)),
+    **{
+        ("WE1984fallout", o): _fallout
+        for o in ("DHP1", "DT", "T0", "MBD", "FD")
+    },
+}
+
+
+def mask(model, output, **values):
+    """
+    vectorized validity mask of a model output, see above.
+
+    model: name of the model, e.g. "BLAST1984"
+    output: name of the output, e.g. "P"
+    values: arrays of the values the bounds are checked against, by name,
+        broadcastable into the same shape
+
+    returns a boolean array of the broadcast shape of the values, True where
+        all bounds that could be checked are satisfied.
+    """
+    if (model, output) not in domains:
+        raise ValueError(
+            "no validity domain for output {} of model {}".format(output, model)
+        )
+
+    values = {k: np.asarray(v, dtype=float) for k, v in values.items()}
+    valid = np.full(np.broadcast_shapes(*(v.shape for v in values.values())), True)
+
+    for name, lo, hi in domains[(model, output)]:
+        required, f = _variables[name]
+        if not all(k in values for k in required):
+            continue
+
+        x = f(values)
+        if lo is not None:
+            valid &= x >= lo
+        if hi is not None:
+            valid &= x <= hi
+
+    return valid
+
+
+if __name__ == "__main__":
+    GR = np.linspace(0, 100000, 11)
+    print(mask("BLAST1984", "P", GR=GR, H=500, W=100))
+    print(mask("BLAST1984", "XM", GR=GR, H=500, W=100))
+    print(mask("WE1984iniRad", "TD", GR=GR, H=500, W=100, AIR=0.975))
+    print(mask("Brode1987", "IQ", GR=GR, H=500, W=100))
+    print(mask("AWG1980", "P", GR=GR, H=500, W=100))
+    print(mask("Brode1970", "P", GR=GR, H=500, W=100))
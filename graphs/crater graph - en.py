@@ -4,7 +4,7 @@ from math import floor, log10, sqrt, pi
 import matplotlib.patches as patches
 import numpy as np
 import numpy.ma as ma
-from HeWu.modelWE1984 import crater
+from HeWu.modelWE1984 import craterBatch
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 from matplotlib.ticker import MultipleLocator
 
@@ -43,17 +43,11 @@ CVS = []
 CRS = []
 CDS = []
 for ground in range(1, 6):
-    CV = []
-    CR = []
-    CD = []
-    for height in H:
-        try:
-            v, r, d, _, _, _ = crater(Y, height, ground, 1, ground, 1, ground, GR=None)
-        except TypeError:
-            v, r, d = 0, 0, 0
-        CV.append(v / 1e3)
-        CR.append(r)
-        CD.append(d)
+    v, r, d, _ = craterBatch(Y, H, ground, 1, ground, 1, ground)
+    # nan beyond the depth of the fit, where the crater volume turns negative
+    CV = np.nan_to_num(v) / 1e3
+    CR = np.nan_to_num(r)
+    CD = np.nan_to_num(d)
 
     CVS.append(CV)
     CRS.append(CR)
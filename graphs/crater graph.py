@@ -14,7 +14,7 @@ import matplotlib as mpt
 import matplotlib.patches as patches
 from math import floor, log10, sqrt, pi
 
-from HeWu.modelWE1984 import crater
+from HeWu.modelWE1984 import craterBatch
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 from matplotlib.ticker import MultipleLocator
 
@@ -58,17 +58,11 @@ CVS = []
 CRS = []
 CDS = []
 for ground in range(1, 6):
-    CV = []
-    CR = []
-    CD = []
-    for height in H:
-        try:
-            v, r, d, _, _, _ = crater(Y, height, ground, 1, ground, 1, ground, GR=None)
-        except TypeError:
-            v, r, d = 0, 0, 0
-        CV.append(v / 1e7)
-        CR.append(r)
-        CD.append(d)
+    v, r, d, _ = craterBatch(Y, H, ground, 1, ground, 1, ground)
+    # nan beyond the depth of the fit, where the crater volume turns negative
+    CV = np.nan_to_num(v) / 1e7
+    CR = np.nan_to_num(r)
+    CD = np.nan_to_num(d)
 
     CVS.append(CV)
     CRS.append(CR)
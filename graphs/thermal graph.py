@@ -6,7 +6,7 @@ from matplotlib.ticker import MultipleLocator
 from math import floor, log10, sqrt, pi
 import numpy as np
 import numpy.ma as ma
-from HeWu.modelWE1984 import therm, phi
+from HeWu.modelWE1984 import therm, thermBatch, phi
 
 
 def secant(f, x_0, x_1, x_min=None, x_max=None, tol=1e-6, it=1000):
@@ -81,7 +81,6 @@ rows = floor(ymax // delta) + 1
 columns = floor(xmax // delta) + 1
 x = delta * np.array(range(columns)) / 1e3
 y = delta * np.array(range(rows)) / 1e3
-F = np.zeros((rows, columns))
 
 prob1 = []
 mu1 = burns[2]
@@ -97,30 +96,25 @@ prob3 = []
 mu3 = burns[6]
 sigma3 = (mu3 - burns[5]) / 1.17741
 
-for i in range(columns):
-    groundRange = i * delta
-    for j in range(rows):
-        height = j * delta
-        if i == 0 and j == 0:
-            groundRange += 0.1
-            height += 0.1
-
-        flu = therm(Y, height, groundRange, vis)
-        F[j][i] = flu
-
-        if i == 0:
-            if flu < mu1:
-                prob1.append(phi((flu - mu1) / sigma1L) * sqrt(2 * pi))
-            else:
-                prob1.append(phi((flu - mu1) / sigma1H) * sqrt(2 * pi))
-            if flu < mu2:
-                prob2.append(phi((flu - mu2) / sigma2L) * sqrt(2 * pi))
-            else:
-                prob2.append(phi((flu - mu2) / sigma2H) * sqrt(2 * pi))
-            if flu < mu3:
-                prob3.append(phi((flu - mu3) / sigma3) * sqrt(2 * pi))
-            else:
-                prob3.append(1)
+groundRange, height = np.meshgrid(delta * np.arange(columns), delta * np.arange(rows))
+groundRange[:, 0] += 0.1
+height[0][0] += 0.1
+
+F = thermBatch(Y, height, groundRange, vis)
+
+for flu in F[:, 0]:
+    if flu < mu1:
+        prob1.append(phi((flu - mu1) / sigma1L) * sqrt(2 * pi))
+    else:
+        prob1.append(phi((flu - mu1) / sigma1H) * sqrt(2 * pi))
+    if flu < mu2:
+        prob2.append(phi((flu - mu2) / sigma2L) * sqrt(2 * pi))
+    else:
+        prob2.append(phi((flu - mu2) / sigma2H) * sqrt(2 * pi))
+    if flu < mu3:
+        prob3.append(phi((flu - mu3) / sigma3) * sqrt(2 * pi))
+    else:
+        prob3.append(1)
 
 
 fig, ax = plt.subplots(1, 1, figsize=(11.7, 8.3))
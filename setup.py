@@ -9,5 +9,6 @@ setup(
     author_email="914962409@qq.com",
     license="None",
     packages=["HeWu"],
+    install_requires=["numpy"],
     zip_safe=False,
 )